@@ -0,0 +1,56 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.urls import URLPattern
+
+ASYNC_METHODS = ('GET', 'HEAD')
+
+
+def render_read(view, request, *args, **kwargs):
+    """Выполняет представление DRF и отрисовывает ответ в том же потоке.
+
+    Поток берётся из общего пула, а не из потока Django для синхронного
+    кода, поэтому соединения с базой проверяются здесь так же, как на
+    границах обычного запроса.
+    """
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def make_async(view):
+    """Асинхронная обёртка представления DRF для работы под ASGI.
+
+    В Django 3.2 нет асинхронного ORM, а синхронные представления под
+    ASGI выполняются по очереди в одном потоке. Чтения здесь уходят в
+    пул потоков и идут параллельно, не занимая цикл событий.
+    Аутентификация, права и сериализация остаются прежними, потому что
+    выполняется то же представление. Изменяющие запросы идут
+    обычным путём.
+    """
+    read = sync_to_async(render_read, thread_sensitive=False)
+    write = sync_to_async(view, thread_sensitive=True)
+
+    @wraps(view)
+    async def async_view(request, *args, **kwargs):
+        if request.method in ASYNC_METHODS:
+            return await read(view, request, *args, **kwargs)
+        return await write(request, *args, **kwargs)
+
+    return async_view
+
+
+def asyncify_urls(urls, viewsets):
+    """Заменяет представления указанных наборов асинхронными обёртками."""
+    return [
+        URLPattern(
+            url.pattern, make_async(url.callback), url.default_args, url.name)
+        if getattr(url.callback, 'cls', None) in viewsets else url
+        for url in urls
+    ]
@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .cache import cache_is_shared
+
+USER_CACHE_KEY = 'auth-user:{user_id}:{version}'
+USER_VERSION_KEY = 'auth-user-version:{user_id}'
+CACHED_USER_FIELDS = (
+    'id',
+    'username',
+    'email',
+    'first_name',
+    'last_name',
+    'bio',
+    'role',
+    'is_staff',
+    'is_superuser',
+    'is_active',
+)
+
+
+def get_user_version(user_id):
+    return cache.get(USER_VERSION_KEY.format(user_id=user_id), 0)
+
+
+def invalidate_cached_user(user_id):
+    """Делает устаревшими все закэшированные копии пользователя."""
+    key = USER_VERSION_KEY.format(user_id=user_id)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def get_cached_field_names(user_model):
+    """Кэшируемые поля в порядке, которого ждёт Model.from_db()."""
+    return [
+        field.attname for field in user_model._meta.concrete_fields
+        if field.attname in CACHED_USER_FIELDS
+    ]
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация, которая берёт пользователя из кэша.
+
+    В кэше хранятся только поля, нужные для проверки ролей и профиля.
+    Остальные поля экземпляра отложены и при обращении загружаются из
+    базы, а save() обновляет только загруженные поля. Только с общим
+    кэшем (cache_is_shared).
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(jwt_settings.USER_ID_CLAIM)
+        if (
+            user_id is None
+            or jwt_settings.CHECK_REVOKE_TOKEN
+            or not cache_is_shared()
+        ):
+            return super().get_user(validated_token)
+        key = USER_CACHE_KEY.format(
+            user_id=user_id, version=get_user_version(user_id))
+        field_names = get_cached_field_names(self.user_model)
+        values = cache.get(key)
+        if values is not None:
+            return self.user_model.from_db(
+                router.db_for_read(self.user_model), field_names, values)
+        user = super().get_user(validated_token)
+        cache.set(
+            key,
+            [getattr(user, field) for field in field_names],
+            settings.JWT_USER_CACHE_TIMEOUT,
+        )
+        return user
@@ -0,0 +1,116 @@
+import threading
+
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from .cache import cache_is_shared, get_catalogue_state, replica_may_lag
+
+PREFIX_PARAM = 'prefix'
+LIMIT_PARAM = 'limit'
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+
+def normalize(value):
+    return value.lower()
+
+
+def get_limit(request):
+    try:
+        limit = int(request.query_params.get(LIMIT_PARAM, DEFAULT_LIMIT))
+    except ValueError:
+        return DEFAULT_LIMIT
+    return min(max(limit, 1), MAX_LIMIT)
+
+
+def get_prefix_range(prefix):
+    """Границы диапазона строк, начинающихся с prefix.
+
+    Условие prefix <= value < upper использует обычный B-tree индекс
+    на любой СУБД, в отличие от LIKE с учётом регистра и сортировки.
+    """
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class PrefixTrie:
+    """Префиксное дерево, в узлах которого хранятся первые limit записей.
+
+    Записи добавляются в порядке сортировки, поэтому поиск сводится к
+    спуску по префиксу без обхода поддерева.
+    """
+
+    def __init__(self, limit=MAX_LIMIT):
+        self.limit = limit
+        self.root = {'items': [], 'children': {}}
+
+    def insert(self, key, item):
+        node = self.root
+        self.add(node, item)
+        for char in key:
+            node = node['children'].setdefault(
+                char, {'items': [], 'children': {}})
+            self.add(node, item)
+
+    def add(self, node, item):
+        if len(node['items']) < self.limit and item not in node['items']:
+            node['items'].append(item)
+
+    def find(self, prefix, limit):
+        node = self.root
+        for char in prefix:
+            node = node['children'].get(char)
+            if node is None:
+                return []
+        return node['items'][:limit]
+
+
+_tries = {}
+_tries_lock = threading.Lock()
+
+
+def build_trie(queryset, serializer_class):
+    """Индексирует слова названия и слаг каждой записи."""
+    trie = PrefixTrie()
+    for obj in queryset.order_by('name', 'pk'):
+        item = dict(serializer_class(obj).data)
+        for key in {*normalize(obj.name).split(), normalize(obj.name),
+                    normalize(obj.slug)}:
+            trie.insert(key, item)
+    return trie
+
+
+def get_trie(queryset, serializer_class):
+    """Дерево для модели, перестроенное после изменения каталога.
+
+    Без общего кэша (cache_is_shared) и по реплике, которая может ещё
+    отставать от новой версии, дерево строится на каждый запрос.
+    """
+    if not cache_is_shared():
+        return build_trie(queryset, serializer_class)
+    state = get_catalogue_state()
+    if replica_may_lag(state):
+        return build_trie(queryset, serializer_class)
+    label = queryset.model._meta.label
+    version = state['version']
+    cached = _tries.get(label)
+    if cached is None or cached[0] != version:
+        with _tries_lock:
+            cached = _tries.get(label)
+            if cached is None or cached[0] != version:
+                cached = version, build_trie(queryset, serializer_class)
+                _tries[label] = cached
+    return cached[1]
+
+
+class TrieAutocompleteMixin:
+    """Подсказки по префиксу из дерева в памяти процесса.
+
+    Подходит для небольших таблиц: дерево строится целиком при первом
+    запросе после изменения каталога.
+    """
+
+    @action(detail=False, pagination_class=None)
+    def autocomplete(self, request):
+        prefix = normalize(request.query_params.get(PREFIX_PARAM, ''))
+        trie = get_trie(self.get_queryset(), self.get_serializer_class())
+        return Response(trie.find(prefix, get_limit(request)))
@@ -0,0 +1,463 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, connections, router, transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import MethodNotAllowed, ValidationError
+from rest_framework.relations import ManyRelatedField
+from rest_framework.response import Response
+from rest_framework.serializers import as_serializer_error
+from rest_framework.validators import UniqueValidator
+
+from .planning import plan_queryset
+from .serializers import PRELOADED_RELATIONS, PreloadedSlugRelatedField
+from reviews.signals import catalogue_changed
+
+ATOMIC_PARAM = 'atomic'
+MAX_BULK_ITEMS = 1000
+BULK_UPDATE_KEY = 'id'
+NOT_A_LIST_MESSAGE = 'Ожидается непустой список.'
+TOO_MANY_ITEMS_MESSAGE = 'За один запрос можно передать не больше {limit}.'
+NOT_FOUND_MESSAGE = 'Объект не найден.'
+DUPLICATE_MESSAGE = 'Значение повторяется в этом запросе.'
+NOT_APPLIED_MESSAGE = 'Не выполнено из-за ошибок в других объектах.'
+CONFLICT_MESSAGE = (
+    'Объект конфликтует с данными, записанными параллельным запросом.')
+# Место объекта, который не удалось записать, в результатах perform_*.
+CONFLICT = object()
+HANDLERS = {
+    'POST': 'bulk_create',
+    'PATCH': 'bulk_update',
+    'DELETE': 'bulk_destroy',
+}
+
+
+def get_items(request):
+    items = request.data
+    if not isinstance(items, list) or not items:
+        raise ValidationError({'non_field_errors': [NOT_A_LIST_MESSAGE]})
+    if len(items) > MAX_BULK_ITEMS:
+        raise ValidationError({'non_field_errors': [
+            TOO_MANY_ITEMS_MESSAGE.format(limit=MAX_BULK_ITEMS)]})
+    return items
+
+
+def success(code, data=None):
+    return {'status': code} if data is None else {
+        'status': code, 'data': data}
+
+
+def failure(code, errors):
+    return {'status': code, 'errors': errors}
+
+
+def conflict():
+    return failure(
+        status.HTTP_409_CONFLICT, {'non_field_errors': [CONFLICT_MESSAGE]})
+
+
+def get_relation_values(items, name, many):
+    for item in items:
+        if not isinstance(item, dict) or name not in item:
+            continue
+        values = item[name] if many else [item[name]]
+        if not isinstance(values, list):
+            continue
+        for value in values:
+            if isinstance(value, (str, int)) and not isinstance(value, bool):
+                yield str(value)
+
+
+def preload_relations(serializer, items):
+    """Загружает объекты всех слагов пакета, по запросу на связь."""
+    preloaded = {}
+    for name, field in serializer.fields.items():
+        many = isinstance(field, ManyRelatedField)
+        relation = field.child_relation if many else field
+        if field.read_only or not isinstance(
+                relation, PreloadedSlugRelatedField):
+            continue
+        slug_field = relation.slug_field
+        queryset = relation.get_queryset().filter(**{
+            f'{slug_field}__in': set(get_relation_values(items, name, many))})
+        preloaded.setdefault((queryset.model, slug_field), {}).update(
+            (str(getattr(obj, slug_field)), obj) for obj in queryset)
+    return preloaded
+
+
+def pop_unique_validators(serializer):
+    """Снимает с полей UniqueValidator для проверки пакета одним запросом."""
+    unique = {}
+    for name, field in serializer.fields.items():
+        for validator in field.validators:
+            if isinstance(validator, UniqueValidator) and (
+                    validator.lookup == 'exact'):
+                field.validators = [
+                    other for other in field.validators
+                    if other is not validator
+                ]
+                unique[field] = validator
+                break
+    return unique
+
+
+def check_unique(unique, valid):
+    """Ошибки уникальности по индексам объектов пакета.
+
+    Значение не должно встречаться ни в базе, ни раньше в том же пакете.
+    """
+    errors = {}
+    for field, validator in unique.items():
+        source = field.source_attrs[-1]
+        values = [data[source] for _, data in valid if source in data]
+        existing = set(validator.queryset.filter(**{
+            f'{source}__in': values}).values_list(source, flat=True))
+        seen = set()
+        for index, data in valid:
+            if source not in data:
+                continue
+            value = data[source]
+            if value in existing:
+                errors.setdefault(index, {})[field.field_name] = [
+                    str(validator.message)]
+            elif value in seen:
+                errors.setdefault(index, {})[field.field_name] = [
+                    DUPLICATE_MESSAGE]
+            seen.add(value)
+    return errors
+
+
+def clean_lookup(model, lookup, value):
+    field = model._meta.pk if lookup == 'pk' else model._meta.get_field(
+        lookup)
+    try:
+        return field.to_python(value)
+    except (DjangoValidationError, TypeError):
+        return None
+
+
+def get_unique_field(model):
+    for field in model._meta.concrete_fields:
+        if field.unique and not field.primary_key:
+            return field
+    return None
+
+
+def mark_saved(obj, pk, using):
+    obj.pk = pk
+    obj._state.adding = False
+    obj._state.db = using
+    return obj
+
+
+def insert_by_unique_field(model, objects, using, unique):
+    """Вставляет объекты, пропуская конфликты, и читает ключи по unique.
+
+    Строка с тем же значением уникального поля, записанная параллельным
+    запросом, отличается от объекта остальными полями и даёт CONFLICT.
+    Совпадающая во всём строка неотличима от своей и считается записанной.
+    """
+    queryset = model.objects.using(using)
+    queryset.bulk_create(objects, ignore_conflicts=True)
+    rows = {
+        getattr(row, unique.attname): row
+        for row in queryset.filter(**{f'{unique.attname}__in': [
+            getattr(obj, unique.attname) for obj in objects]})
+    }
+    fields = [
+        field.attname for field in model._meta.concrete_fields
+        if not field.primary_key
+    ]
+    results = []
+    for obj in objects:
+        row = rows.get(getattr(obj, unique.attname))
+        if row is None or any(
+                getattr(row, name) != getattr(obj, name) for name in fields):
+            results.append(CONFLICT)
+        else:
+            results.append(mark_saved(obj, row.pk, using))
+    return results
+
+
+def insert_reading_last_keys(model, objects, using):
+    """Вставляет объекты и берёт их ключи как последние ключи таблицы.
+
+    SQLite держит блокировку записи с первой вставки до конца
+    транзакции, а AUTOINCREMENT выдаёт ключи по возрастанию, поэтому
+    последние len(objects) ключей принадлежат этой вставке. Вызывается
+    внутри транзакции.
+    """
+    queryset = model.objects.using(using)
+    queryset.bulk_create(objects)
+    keys = list(queryset.order_by('-pk').values_list(
+        'pk', flat=True)[:len(objects)])
+    return [
+        mark_saved(obj, pk, using)
+        for obj, pk in zip(objects, reversed(keys))
+    ]
+
+
+def save_one_by_one(objects, using):
+    results = []
+    for obj in objects:
+        try:
+            with transaction.atomic(using=using):
+                obj.save(using=using, force_insert=True)
+        except IntegrityError:
+            obj.pk = None
+            results.append(CONFLICT)
+        else:
+            results.append(obj)
+    return results
+
+
+def save_new_objects(model, objects, using):
+    """Вставляет объекты и возвращает результаты и признак отправки post_save.
+
+    Результат — объект или CONFLICT на месте объекта, который нарушил
+    ограничение базы, например слаг, записанный параллельным запросом.
+    bulk_create заполняет первичные ключи только там, где СУБД
+    возвращает строки массовой вставки, в Django 3.2 это PostgreSQL.
+    Иначе ключи читаются вторым запросом: по уникальному полю, а на
+    SQLite — как последние ключи таблицы. Если массовая вставка
+    нарушила ограничение, объекты сохраняются по одному, каждый в своей
+    точке сохранения, и post_save отправляется для каждого.
+    """
+    connection = connections[using]
+    unique = get_unique_field(model)
+    if unique is not None and (
+            not connection.features.can_return_rows_from_bulk_insert):
+        return insert_by_unique_field(model, objects, using, unique), False
+    try:
+        with transaction.atomic(using=using):
+            if connection.features.can_return_rows_from_bulk_insert:
+                model.objects.using(using).bulk_create(objects)
+                return list(objects), False
+            if connection.vendor == 'sqlite':
+                return insert_reading_last_keys(model, objects, using), False
+    except IntegrityError:
+        for obj in objects:
+            obj.pk = None
+    return save_one_by_one(objects, using), True
+
+
+def get_bulk_status(results, success_status):
+    failed = sum(result['status'] >= 400 for result in results)
+    if not failed:
+        return success_status
+    if failed == len(results):
+        return status.HTTP_400_BAD_REQUEST
+    return status.HTTP_207_MULTI_STATUS
+
+
+class BulkWriteMixin:
+    """Массовые создание, изменение и удаление через `bulk/` списка.
+
+    Тело запроса — список объектов, для удаления — список значений
+    lookup_field, для изменения у каждого объекта указывается id.
+    Слаги связей разрешаются одним запросом на связь, уникальность —
+    одним запросом на поле, строки вставляются bulk_create. Ответ
+    содержит статус и данные или ошибки каждого объекта по порядку.
+    Без ?atomic=true корректные объекты записываются несмотря на ошибки
+    в остальных, с ним любая ошибка отменяет весь пакет.
+    """
+
+    bulk_methods = ('post', 'delete')
+    bulk_output_serializer_class = None
+
+    @action(
+        detail=False,
+        methods=('post', 'patch', 'delete'),
+        url_path='bulk',
+        pagination_class=None,
+    )
+    def bulk(self, request):
+        if request.method.lower() not in self.bulk_methods:
+            raise MethodNotAllowed(request.method)
+        return getattr(self, HANDLERS[request.method])(get_items(request))
+
+    def is_atomic(self):
+        return self.request.query_params.get(
+            ATOMIC_PARAM, '').lower() in ('1', 'true')
+
+    def get_bulk_serializer(self, items, **kwargs):
+        context = self.get_serializer_context()
+        serializer = self.get_serializer(context=context, **kwargs)
+        context[PRELOADED_RELATIONS] = preload_relations(serializer, items)
+        return serializer
+
+    def get_model(self):
+        return self.get_queryset().model
+
+    def get_write_db(self):
+        return router.db_for_write(self.get_model())
+
+    def find_objects(self, items, lookup):
+        model = self.get_model()
+        keys = [clean_lookup(model, lookup, item) for item in items]
+        objects = self.get_queryset().filter(**{
+            f'{lookup}__in': {key for key in keys if key is not None}})
+        found = {getattr(obj, lookup): obj for obj in objects}
+        for obj in found.values():
+            self.check_object_permissions(self.request, obj)
+        return [found.get(key) for key in keys]
+
+    def write(self, results, valid, perform, item_status,
+              success_status=None):
+        """Выполняет perform для корректных объектов и дополняет results.
+
+        perform возвращает записанные объекты или None, если данных в
+        ответе нет; на месте объекта, который не удалось записать из-за
+        конфликта в базе, стоит CONFLICT, и он получает статус 409. В
+        атомарном режиме при ошибках ничего не записывается, а
+        корректные объекты получают статус 424.
+        """
+        failed = any(result is not None for result in results)
+        if failed and self.is_atomic():
+            self.reject(results, valid)
+        elif valid:
+            using = self.get_write_db()
+            with transaction.atomic(using=using):
+                objects = perform(valid)
+                conflicts = [
+                    position for position, obj in enumerate(objects or ())
+                    if obj is CONFLICT
+                ]
+                if conflicts and self.is_atomic():
+                    transaction.set_rollback(True, using=using)
+            if conflicts and self.is_atomic():
+                self.reject(results, valid, conflicts)
+            else:
+                catalogue_changed.send(sender=self.get_model())
+                self.fill_results(results, valid, objects, item_status)
+        return Response(results, status=get_bulk_status(
+            results, success_status or item_status))
+
+    def reject(self, results, valid, conflicts=()):
+        """Отмечает объекты атомарного пакета, который не записан."""
+        for position, (index, *_) in enumerate(valid):
+            results[index] = conflict() if position in conflicts else failure(
+                status.HTTP_424_FAILED_DEPENDENCY,
+                {'non_field_errors': [NOT_APPLIED_MESSAGE]},
+            )
+
+    def fill_results(self, results, valid, objects, item_status):
+        if objects is None:
+            objects = data = [None] * len(valid)
+        else:
+            data = self.represent_bulk(
+                [obj for obj in objects if obj is not CONFLICT])
+        data = iter(data)
+        for (index, *_), obj in zip(valid, objects):
+            results[index] = conflict() if obj is CONFLICT else success(
+                item_status, next(data))
+
+    def validate_bulk(self, serializer, items, instances=None):
+        results = [None] * len(items)
+        valid = []
+        for index, item in enumerate(items):
+            if instances is not None:
+                if instances[index] is None:
+                    results[index] = failure(
+                        status.HTTP_404_NOT_FOUND,
+                        {'detail': NOT_FOUND_MESSAGE},
+                    )
+                    continue
+                serializer.instance = instances[index]
+            try:
+                data = serializer.run_validation(item)
+            except ValidationError as error:
+                results[index] = failure(
+                    status.HTTP_400_BAD_REQUEST, as_serializer_error(error))
+                continue
+            if instances is None:
+                valid.append((index, data))
+            else:
+                valid.append((index, instances[index], data))
+        return results, valid
+
+    def bulk_create(self, items):
+        serializer = self.get_bulk_serializer(items)
+        unique = pop_unique_validators(serializer)
+        results, valid = self.validate_bulk(serializer, items)
+        for index, errors in check_unique(unique, valid).items():
+            results[index] = failure(status.HTTP_400_BAD_REQUEST, errors)
+        valid = [(index, data) for index, data in valid
+                 if results[index] is None]
+        return self.write(
+            results,
+            valid,
+            lambda valid: self.perform_bulk_create(
+                [data for _, data in valid]),
+            status.HTTP_201_CREATED,
+        )
+
+    def bulk_update(self, items):
+        instances = self.find_objects(
+            [item.get(BULK_UPDATE_KEY) if isinstance(item, dict) else None
+             for item in items],
+            'pk',
+        )
+        serializer = self.get_bulk_serializer(items, partial=True)
+        results, valid = self.validate_bulk(serializer, items, instances)
+        return self.write(
+            results,
+            valid,
+            lambda valid: self.perform_bulk_update(
+                [(instance, data) for _, instance, data in valid]),
+            status.HTTP_200_OK,
+        )
+
+    def bulk_destroy(self, items):
+        instances = self.find_objects(items, self.lookup_field)
+        results = [
+            None if instance is not None else failure(
+                status.HTTP_404_NOT_FOUND, {'detail': NOT_FOUND_MESSAGE})
+            for instance in instances
+        ]
+        return self.write(
+            results,
+            [(index, instance) for index, instance in enumerate(instances)
+             if instance is not None],
+            lambda valid: self.perform_bulk_destroy(
+                [instance for _, instance in valid]),
+            status.HTTP_204_NO_CONTENT,
+            status.HTTP_200_OK,
+        )
+
+    def perform_bulk_create(self, rows):
+        model = self.get_model()
+        results, _ = save_new_objects(
+            model, [model(**data) for data in rows], self.get_write_db())
+        return results
+
+    def perform_bulk_update(self, changes):
+        fields = set()
+        for instance, data in changes:
+            for attr, value in data.items():
+                setattr(instance, attr, value)
+                fields.add(attr)
+        instances = [instance for instance, _ in changes]
+        if fields:
+            self.get_model().objects.using(self.get_write_db()).bulk_update(
+                instances, sorted(fields))
+        return instances
+
+    def perform_bulk_destroy(self, instances):
+        self.get_model().objects.using(self.get_write_db()).filter(
+            pk__in={instance.pk for instance in instances}).delete()
+
+    def represent_bulk(self, objects):
+        """Данные записанных объектов, прочитанные одним планом запросов."""
+        if not objects:
+            return []
+        serializer_class = (
+            self.bulk_output_serializer_class or self.get_serializer_class())
+        context = self.get_serializer_context()
+        queryset = plan_queryset(
+            self.get_queryset().filter(pk__in=[obj.pk for obj in objects]),
+            serializer_class(context=context),
+        )
+        by_pk = {obj.pk: obj for obj in queryset}
+        return serializer_class(
+            [by_pk[obj.pk] for obj in objects], many=True, context=context,
+        ).data
@@ -0,0 +1,109 @@
+from hashlib import md5
+import time
+from urllib.parse import urlencode
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from api_yamdb.db import reads_from_replica
+
+CATALOGUE_VERSION_KEY = 'catalogue-version'
+RESPONSE_CACHE_KEY = 'catalogue-response:{version}:{digest}'
+
+
+def cache_is_shared():
+    """Виден ли кэш всем процессам, см. CACHE_SHARED в настройках."""
+    return settings.CACHE_SHARED
+
+
+def bump_catalogue_version():
+    """Делает устаревшими все закэшированные ответы каталога.
+
+    Last-Modified растёт строго, чтобы If-Modified-Since с точностью до
+    секунды не подтвердил ответ, изменившийся в ту же секунду.
+    """
+    previous = cache.get(CATALOGUE_VERSION_KEY) or {'modified': 0}
+    now = time.time()
+    state = {
+        'version': uuid.uuid4().hex,
+        'modified': max(int(now), previous['modified'] + 1),
+        'bumped_at': now,
+    }
+    cache.set(CATALOGUE_VERSION_KEY, state, timeout=None)
+    return state
+
+
+def get_catalogue_state():
+    state = cache.get(CATALOGUE_VERSION_KEY)
+    if state is None:
+        state = bump_catalogue_version()
+    return state
+
+
+def replica_may_lag(state):
+    """Может ли реплика ещё не содержать изменение этой версии.
+
+    Отставание реплики считается не больше REPLICA_PIN_TIMEOUT — того же
+    окна, в течение которого автор изменения читает из основной базы.
+    """
+    return reads_from_replica() and (
+        time.time() - state.get('bumped_at', 0)
+        < settings.REPLICA_PIN_TIMEOUT
+    )
+
+
+def get_request_digest(request):
+    """Хэш пути и параметров запроса без учёта их порядка."""
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    return md5(f'{request.path}?{query}'.encode()).hexdigest()
+
+
+class CachedResponseMixin:
+    """Кэширует ответы list до следующего изменения каталога.
+
+    Ответ помечается ETag и Last-Modified версии каталога, поэтому на
+    условный запрос с совпадающей версией возвращается 304. Только с
+    общим кэшем (cache_is_shared).
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs)
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        if not cache_is_shared():
+            return handler(request, *args, **kwargs)
+        state = get_catalogue_state()
+        version, modified = state['version'], state['modified']
+        digest = get_request_digest(request)
+        etag = quote_etag(f'{version}-{digest}')
+        response = get_conditional_response(
+            request, etag=etag, last_modified=modified)
+        if response is None:
+            key = RESPONSE_CACHE_KEY.format(version=version, digest=digest)
+            data = cache.get(key)
+            if data is not None:
+                response = Response(data)
+            else:
+                response = handler(request, *args, **kwargs)
+                # Ответ реплики сразу после изменения может его ещё не
+                # содержать. Под новой версией он попал бы и к автору
+                # изменения, который читает из основной базы.
+                if response.status_code != 200 or replica_may_lag(state):
+                    return response
+                cache.set(key, response.data, settings.CATALOGUE_CACHE_TIMEOUT)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(modified)
+        return response
+
+
+class CachedRetrieveResponseMixin(CachedResponseMixin):
+    """Кэширует ответы list и retrieve."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs)
@@ -1,21 +1,95 @@
-from django_filters.rest_framework import CharFilter, FilterSet
+from django.db.models import Exists, F, OuterRef
+from django_filters.rest_framework import (
+    CharFilter,
+    ChoiceFilter,
+    FilterSet,
+    NumberFilter,
+)
 
-from reviews.models import Title
+from reviews.models import Genre, GenreTitle, Title
+from reviews.search import search_titles
+
+# Порядок каждого значения совпадает с индексом произведений, поэтому
+# база идёт по индексу вместо сортировки. Произведения без рейтинга
+# считаются наименьшими: первыми по возрастанию и последними по
+# убыванию, одинаково на SQLite и PostgreSQL. Одинаковые годы
+# упорядочиваются по названию по алфавиту в обоих направлениях.
+TITLE_ORDERINGS = {
+    'rating': (F('rating').asc(nulls_first=True), 'id'),
+    '-rating': (F('rating').desc(nulls_last=True), '-id'),
+    'year': ('year', 'name', 'id'),
+    '-year': ('-year', 'name', 'id'),
+    'name': ('name', 'id'),
+    '-name': ('-name', '-id'),
+    'review_count': ('review_count', 'id'),
+    '-review_count': ('-review_count', '-id'),
+}
+GENRE_ANY = 'any'
+GENRE_ALL = 'all'
+
+
+def has_genre(*slugs):
+    """Условие EXISTS: у произведения есть один из жанров slugs.
+
+    Жанры отбираются некоррелированным подзапросом, который база
+    выполняет один раз, а связи произведения ищутся по индексу title_id.
+    С соединением по слагу SQLite перебирает все связи жанра для
+    каждого произведения.
+    """
+    return Exists(GenreTitle.objects.filter(
+        title=OuterRef('pk'),
+        genre__in=Genre.objects.filter(slug__in=slugs),
+    ))
 
 
 class TitleFilter(FilterSet):
     genre = CharFilter(field_name='genre__slug', method='filter_genre')
+    genre_mode = ChoiceFilter(
+        choices=((GENRE_ANY, GENRE_ANY), (GENRE_ALL, GENRE_ALL)),
+        method='filter_genre_mode',
+    )
     category = CharFilter(
         field_name='category__slug',
         method='filter_category',
     )
+    year_min = NumberFilter(field_name='year', lookup_expr='gte')
+    year_max = NumberFilter(field_name='year', lookup_expr='lte')
+    rating_min = NumberFilter(field_name='rating', lookup_expr='gte')
+    rating_max = NumberFilter(field_name='rating', lookup_expr='lte')
+    search = CharFilter(method='filter_search')
+    ordering = ChoiceFilter(
+        choices=[(name, name) for name in TITLE_ORDERINGS],
+        method='filter_ordering',
+    )
 
     def filter_genre(self, queryset, name, value):
-        return queryset.filter(genre__slug=value)
+        """Отбирает произведения по слагам жанров через запятую.
+
+        По умолчанию подходит любой из жанров, с `genre_mode=all` — только
+        произведения со всеми жанрами. Каждое условие — подзапрос EXISTS,
+        поэтому строки произведений не размножаются соединением.
+        """
+        slugs = list(dict.fromkeys(
+            slug.strip() for slug in value.split(',') if slug.strip()))
+        if not slugs:
+            return queryset
+        if self.form.cleaned_data.get('genre_mode') == GENRE_ALL:
+            return queryset.filter(*(has_genre(slug) for slug in slugs))
+        return queryset.filter(has_genre(*slugs))
+
+    def filter_genre_mode(self, queryset, name, value):
+        # Режим учитывается в filter_genre.
+        return queryset
 
     def filter_category(self, queryset, name, value):
         return queryset.filter(category__slug=value)
 
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
+
+    def filter_ordering(self, queryset, name, value):
+        return queryset.order_by(*TITLE_ORDERINGS[value])
+
     class Meta:
         model = Title
         fields = ['name', 'year']
@@ -0,0 +1,101 @@
+import asyncio
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .authentication import CachedJWTAuthentication
+from .cache import cache_is_shared
+from api_yamdb.db import use_replica
+
+PIN_CACHE_KEY = 'replica-pin:{user_id}'
+
+
+def get_token_user_id(request):
+    """Идентификатор пользователя из JWT без обращения к базе."""
+    authentication = CachedJWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    raw_token = authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+    try:
+        token = authentication.get_validated_token(raw_token)
+    except (InvalidToken, TokenError):
+        return None
+    return token.get(jwt_settings.USER_ID_CLAIM)
+
+
+def pin_to_primary(user_id):
+    cache.set(
+        PIN_CACHE_KEY.format(user_id=user_id),
+        True,
+        timeout=settings.REPLICA_PIN_TIMEOUT,
+    )
+
+
+def is_pinned_to_primary(user_id):
+    return bool(cache.get(PIN_CACHE_KEY.format(user_id=user_id)))
+
+
+class ReplicaRoutingMiddleware:
+    """Обслуживает запросы на чтение с реплики базы данных.
+
+    После успешного изменяющего запроса пользователь на
+    REPLICA_PIN_TIMEOUT секунд читает из основной базы и видит свои
+    изменения, даже если реплика от неё отстаёт. Привязка хранится в
+    кэше, поэтому без общего кэша (cache_is_shared) пользователи с
+    токеном читают из основной базы. Работает и в синхронной, и в
+    асинхронной цепочке обработки.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Так Django распознаёт асинхронный middleware.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def reads_from_replica(self, request):
+        if request.method not in SAFE_METHODS:
+            return False
+        user_id = get_token_user_id(request)
+        if user_id is None:
+            return True
+        return cache_is_shared() and not is_pinned_to_primary(user_id)
+
+    def pin_writer(self, request, response):
+        user = getattr(request, 'user', None)
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and user is not None and user.is_authenticated
+        ):
+            pin_to_primary(getattr(user, jwt_settings.USER_ID_FIELD))
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        if not settings.REPLICA_DATABASES:
+            return self.get_response(request)
+        if self.reads_from_replica(request):
+            with use_replica():
+                return self.get_response(request)
+        response = self.get_response(request)
+        self.pin_writer(request, response)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.REPLICA_DATABASES:
+            return await self.get_response(request)
+        if self.reads_from_replica(request):
+            with use_replica():
+                return await self.get_response(request)
+        response = await self.get_response(request)
+        self.pin_writer(request, response)
+        return response
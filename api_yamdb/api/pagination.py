@@ -0,0 +1,165 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+CURSOR_MODE = 'cursor'
+PAGE_MODE = 'page'
+CURSOR_ORDERING_MESSAGE = (
+    'В курсорном режиме порядок задан курсором, `ordering` не '
+    'поддерживается.'
+)
+INVALID_CURSOR_MESSAGE = 'Некорректный курсор.'
+
+
+def get_keyset_filter(ordering, values, reverse=False):
+    """Условие «строка после values» в порядке ordering.
+
+    Колонки могут идти в разных направлениях, поэтому вместо сравнения
+    кортежей условие раскрывается в OR: первая колонка строго дальше,
+    либо она равна, а дальше следующая, и так далее. Нестрогая граница
+    по первой колонке задаёт базе начало диапазона индекса.
+    """
+    lookups = []
+    for field in ordering:
+        descending = field.startswith('-') != reverse
+        lookups.append((field.lstrip('-'), 'lt' if descending else 'gt'))
+    condition = None
+    for (name, lookup), value in reversed(list(zip(lookups, values))):
+        after = Q(**{f'{name}__{lookup}': value})
+        condition = after if condition is None else (
+            after | Q(**{name: value}) & condition)
+    name, lookup = lookups[0]
+    return Q(**{f'{name}__{lookup}e': values[0]}) & condition
+
+
+class KeysetPagination(pagination.BasePagination):
+    """Курсорная пагинация по всем колонкам порядка.
+
+    Курсор хранит значения колонок `ordering` последней строки, и
+    следующая страница отбирается условием после этой строки, без
+    OFFSET даже внутри большой группы равных значений первой колонки.
+    Колонки порядка должны быть NOT NULL и вместе уникальны.
+    """
+
+    cursor_query_param = 'cursor'
+    display_page_controls = False
+
+    def __init__(self, ordering, page_size=None):
+        self.ordering = tuple(ordering)
+        self.page_size = page_size or api_settings.PAGE_SIZE
+
+    def encode_cursor(self, obj, reverse):
+        position = [
+            getattr(obj, field.lstrip('-')) for field in self.ordering]
+        data = json.dumps(
+            {'p': position, 'r': reverse}, cls=DjangoJSONEncoder)
+        cursor = urlsafe_b64encode(data.encode()).decode()
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor is None:
+            return None, False
+        try:
+            data = json.loads(urlsafe_b64decode(cursor.encode()))
+            position, reverse = data['p'], bool(data['r'])
+        except (binascii.Error, TypeError, ValueError, KeyError):
+            raise NotFound(INVALID_CURSOR_MESSAGE)
+        if not isinstance(position, list) or (
+                len(position) != len(self.ordering)):
+            raise NotFound(INVALID_CURSOR_MESSAGE)
+        return position, reverse
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        position, reverse = self.decode_cursor(request)
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(
+                field[1:] if field.startswith('-') else f'-{field}'
+                for field in ordering
+            )
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(
+                get_keyset_filter(self.ordering, position, reverse))
+        page = list(queryset[:self.page_size + 1])
+        has_more = len(page) > self.page_size
+        page = page[:self.page_size]
+        if reverse:
+            page.reverse()
+        has_next = position is not None if reverse else has_more
+        has_previous = has_more if reverse else position is not None
+        self.next = (
+            self.encode_cursor(page[-1], False)
+            if page and has_next else None
+        )
+        self.previous = (
+            self.encode_cursor(page[0], True)
+            if page and has_previous else None
+        )
+        return page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.next,
+            'previous': self.previous,
+            'results': data,
+        })
+
+
+class SwitchablePagination(pagination.BasePagination):
+    """Постраничная пагинация с включаемым курсорным режимом.
+
+    Курсорный режим выбирается параметром `?pagination=cursor`,
+    наличием `?cursor=` в запросе или атрибутом `pagination_mode`
+    вьюсета. Он не считает COUNT(*) и не использует OFFSET, а порядок
+    берётся из `cursor_ordering` вьюсета, поэтому параметр `ordering`
+    в этом режиме отклоняется.
+    """
+
+    mode_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+
+    def get_mode(self, request, view):
+        if self.cursor_query_param in request.query_params:
+            return CURSOR_MODE
+        return request.query_params.get(
+            self.mode_query_param,
+            getattr(view, 'pagination_mode', PAGE_MODE),
+        )
+
+    def get_paginator(self, request, view):
+        if self.get_mode(request, view) != CURSOR_MODE:
+            return api_settings.DEFAULT_PAGINATION_CLASS()
+        if self.ordering_query_param in request.query_params:
+            raise ValidationError(
+                {self.ordering_query_param: [CURSOR_ORDERING_MESSAGE]})
+        paginator = KeysetPagination(view.cursor_ordering)
+        paginator.cursor_query_param = self.cursor_query_param
+        return paginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.get_paginator(request, view)
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    @property
+    def display_page_controls(self):
+        paginator = getattr(self, 'paginator', None)
+        return paginator is not None and paginator.display_page_controls
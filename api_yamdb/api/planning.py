@@ -0,0 +1,127 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import (
+    ManyRelatedField,
+    RelatedField,
+    SlugRelatedField,
+)
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+LOOKUP_SEP = '__'
+
+
+def collect_relations(serializer, prefix='', nested_in_many=False):
+    """Собирает пути связей, которые сериализатор прочитает у объектов.
+
+    Возвращает пару множеств: связи для select_related и для
+    prefetch_related. Вложенный сериализатор внутри many=True
+    подгружается через prefetch_related вместе с родителем. Поля связей
+    вроде SlugRelatedField читают связанный объект так же, как
+    вложенный сериализатор, кроме полей, которым хватает ключа.
+    """
+    select_related, prefetch_related = set(), set()
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+        path = prefix + LOOKUP_SEP.join(field.source_attrs)
+        if isinstance(field, ListSerializer):
+            prefetch_related.add(path)
+            child_select, child_prefetch = collect_relations(
+                field.child, path + LOOKUP_SEP, nested_in_many=True)
+        elif isinstance(field, BaseSerializer):
+            (prefetch_related if nested_in_many else select_related).add(path)
+            child_select, child_prefetch = collect_relations(
+                field, path + LOOKUP_SEP, nested_in_many)
+        else:
+            if isinstance(field, ManyRelatedField):
+                prefetch_related.add(path)
+            elif isinstance(field, RelatedField) and (
+                    not field.use_pk_only_optimization()):
+                (prefetch_related if nested_in_many else select_related).add(
+                    path)
+            continue
+        select_related |= child_select
+        prefetch_related |= child_prefetch
+    return select_related, prefetch_related
+
+
+def collect_field_columns(field, path):
+    """Колонки, которые поле прочитает по пути path, или None."""
+    if isinstance(field, SlugRelatedField):
+        return {path, path + LOOKUP_SEP + field.slug_field}
+    if isinstance(field, RelatedField) and (
+            not field.use_pk_only_optimization()):
+        return None
+    if isinstance(field, BaseSerializer):
+        nested = collect_columns(field, path + LOOKUP_SEP)
+        return None if nested is None else nested | {path}
+    return {path}
+
+
+def collect_columns(serializer, prefix=''):
+    """Собирает поля модели для .only(), включая поля select_related.
+
+    Связи many=True загружаются отдельным запросом и не входят в
+    список. Если сериализатор читает что-то кроме полей модели,
+    возвращается None и колонки не ограничиваются.
+    """
+    opts = serializer.Meta.model._meta
+    columns = {prefix + opts.pk.name}
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*' or len(field.source_attrs) != 1:
+            return None
+        try:
+            model_field = opts.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        if model_field.many_to_many or not model_field.concrete:
+            continue
+        field_columns = collect_field_columns(field, prefix + field.source)
+        if field_columns is None:
+            return None
+        columns |= field_columns
+    return columns
+
+
+def plan_queryset(queryset, serializer, columns=()):
+    """Добавляет к queryset подгрузку связей, нужных сериализатору.
+
+    Остальные колонки откладываются через .only(); columns добавляет
+    к ним поля, которые читает сам вьюсет, например для курсора.
+    """
+    select_related, prefetch_related = collect_relations(serializer)
+    if select_related:
+        queryset = queryset.select_related(*sorted(select_related))
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*sorted(prefetch_related))
+    serializer_columns = collect_columns(serializer)
+    if serializer_columns is not None:
+        # Менеджер связи (title.reviews) проставляет родителя каждому
+        # объекту по внешнему ключу, отложенный ключ стоил бы запроса.
+        parents = {field.name for field in queryset._known_related_objects}
+        queryset = queryset.only(
+            *sorted(serializer_columns.union(columns, parents)))
+    return queryset
+
+
+class QueryPlanningMixin:
+    """Подстраивает queryset чтения под поля выходного сериализатора.
+
+    План добавляется в filter_queryset, через который проходят и list,
+    и get_object, поэтому вьюсет может переопределять get_queryset.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+        return plan_queryset(
+            queryset,
+            self.get_serializer(),
+            columns=[
+                field.lstrip('-')
+                for field in getattr(self, 'cursor_ordering', ())
+            ],
+        )
@@ -0,0 +1,88 @@
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# За этими границами json и orjson по-разному записывают экспоненту.
+MIN_PLAIN_FLOAT = 1e-4
+MAX_PLAIN_FLOAT = 1e16
+# Типы, которые обе библиотеки записывают одинаково.
+SCALARS = {str, int, bool, type(None)}
+LINE_SEPARATORS = (
+    ('\u2028'.encode(), b'\\u2028'),
+    ('\u2029'.encode(), b'\\u2029'),
+)
+
+
+def is_exponent_float(value):
+    return isinstance(value, float) and value != 0 and not (
+        MIN_PLAIN_FLOAT <= abs(value) < MAX_PLAIN_FLOAT)
+
+
+def has_exponent_floats(data):
+    """Есть ли в данных числа, которые json запишет с экспонентой.
+
+    Сюда же попадают NaN и бесконечности: с STRICT_JSON json их не
+    принимает, а orjson записывает как null.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if not isinstance(value, (dict, list, tuple)):
+            if is_exponent_float(value):
+                return True
+            continue
+        for item in value.values() if isinstance(value, dict) else value:
+            if type(item) in SCALARS:
+                continue
+            if isinstance(item, (dict, list, tuple)):
+                stack.append(item)
+            elif is_exponent_float(item):
+                return True
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson, если он установлен.
+
+    Ответ совпадает с JSONRenderer байт в байт: компактные разделители,
+    символы вне ASCII без экранирования, U+2028 и U+2029 экранированы,
+    даты и прочие нестандартные типы проходят через encoder_class.
+    Когда совпадение не гарантировано (отступы, нестандартные настройки
+    JSON, числа с экспонентой, ошибка orjson), работает JSONRenderer.
+    """
+
+    options = 0 if orjson is None else orjson.OPT_PASSTHROUGH_DATETIME
+
+    def can_use_orjson(self, data, accepted_media_type, renderer_context):
+        return (
+            orjson is not None
+            and settings.FAST_SERIALIZATION
+            and data is not None
+            and not self.ensure_ascii
+            and self.compact
+            and self.strict
+            and self.get_indent(
+                accepted_media_type, renderer_context or {}) is None
+            and not has_exponent_floats(data)
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if self.can_use_orjson(data, accepted_media_type, renderer_context):
+            try:
+                content = orjson.dumps(
+                    data,
+                    default=self.encoder_class().default,
+                    option=self.options,
+                )
+            except TypeError:
+                pass
+            else:
+                for separator, escaped in LINE_SEPARATORS:
+                    if separator in content:
+                        content = content.replace(separator, escaped)
+                return content
+        return super().render(data, accepted_media_type, renderer_context)
@@ -0,0 +1,113 @@
+from operator import attrgetter
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import fields, relations
+from rest_framework.fields import SkipField
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+# Реализации to_representation, которые сводятся к приведению типа.
+CONVERTERS = {
+    fields.IntegerField.to_representation: int,
+    fields.CharField.to_representation: str,
+}
+# Реализации get_attribute, которые сводятся к чтению атрибута.
+PLAIN_GETTERS = {
+    fields.Field.get_attribute,
+    relations.RelatedField.get_attribute,
+}
+
+
+def get_model_field(serializer, name):
+    model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    if model is None:
+        return None
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def compile_getter(serializer, field):
+    """Чтение значения поля из объекта.
+
+    Поле модели читается напрямую через attrgetter. Остальное, включая
+    значения по умолчанию и SkipField, идёт через field.get_attribute.
+    """
+    get_attribute = type(field).get_attribute
+    if (
+        get_attribute in PLAIN_GETTERS
+        and len(field.source_attrs) == 1
+        and not getattr(field, 'use_pk_only_optimization', bool)()
+        and get_model_field(serializer, field.source) is not None
+    ):
+        return attrgetter(field.source)
+    return field.get_attribute
+
+
+def compile_converter(field):
+    """Преобразование прочитанного значения, как в field.to_representation."""
+    if isinstance(field, ListSerializer):
+        child = compile_serializer(field.child)
+
+        def convert_many(value):
+            if isinstance(value, models.Manager):
+                value = value.all()
+            return [child(item) for item in value]
+        return convert_many
+    if isinstance(field, BaseSerializer):
+        return compile_serializer(field)
+    if type(field) is relations.SlugRelatedField:
+        return attrgetter(field.slug_field.replace('__', '.'))
+    return CONVERTERS.get(
+        type(field).to_representation, field.to_representation)
+
+
+def compile_serializer(serializer):
+    """Собирает функцию, повторяющую serializer.to_representation.
+
+    Поля, их порядок и способы чтения определяются один раз, а не для
+    каждого объекта. Результат совпадает с ответом DRF, но вместо
+    OrderedDict возвращается обычный словарь.
+    """
+    steps = tuple(
+        (field.field_name, compile_getter(serializer, field),
+         compile_converter(field))
+        for field in serializer._readable_fields
+    )
+
+    def represent(instance):
+        data = {}
+        for name, get, convert in steps:
+            try:
+                attribute = get(instance)
+            except SkipField:
+                continue
+            if isinstance(attribute, relations.PKOnlyObject):
+                data[name] = None if attribute.pk is None else convert(
+                    attribute)
+            else:
+                data[name] = None if attribute is None else convert(attribute)
+        return data
+
+    return represent
+
+
+class CompiledRepresentationMixin:
+    """Быстрый to_representation для ответов модельного сериализатора.
+
+    Функция представления собирается один раз на экземпляр сериализатора,
+    поэтому для списка она переиспользуется всеми объектами страницы.
+    Отключается настройкой FAST_SERIALIZATION.
+    """
+
+    def to_representation(self, instance):
+        if not settings.FAST_SERIALIZATION:
+            return super().to_representation(instance)
+        try:
+            represent = self._compiled_representation
+        except AttributeError:
+            represent = self._compiled_representation = compile_serializer(
+                self)
+        return represent(instance)
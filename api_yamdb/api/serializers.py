@@ -1,13 +1,16 @@
 from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.shortcuts import get_object_or_404
+from django.utils.encoding import smart_str
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.relations import SlugRelatedField
 
 from reviews.models import (
     Category,
     Comment,
     Genre,
+    GenreTitle,
     Review,
     Title,
     User,
@@ -18,12 +21,18 @@ from reviews.models import (
 )
 
 from reviews.validators import validate_username, validate_year
+from .representation import CompiledRepresentationMixin
 
 EMAIL_OCCUPIED_MESSAGE = 'Пользователь с таким email уже существует'
 USERNAME_OCCUPIED_MESSAGE = 'Пользователь с таким username уже существует'
 SECOND_REVIEW_PROHIBITION_MESSAGE = {
     'review': ['Вы уже оставляли ревью для этого произведения']}
 INVALID_SCORE = 'Оценка по 10-бальной шкале!'
+UNKNOWN_FIELDS_MESSAGE = 'Неизвестные поля: {fields}.'
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+# Ключ контекста с объектами связей, загруженными для массовой записи.
+PRELOADED_RELATIONS = 'preloaded_relations'
 
 
 class UsernameValidationMixin():
@@ -31,19 +40,81 @@ class UsernameValidationMixin():
         return validate_username(username)
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """Оставляет в ответе на чтение поля из ?fields= без полей из ?omit=.
+
+    Поля удаляются из сериализатора, поэтому QueryPlanningMixin не
+    подгружает убранные связи и откладывает убранные колонки.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            return
+        errors = {}
+        names = {}
+        for param in (FIELDS_PARAM, OMIT_PARAM):
+            names[param] = {
+                name.strip()
+                for value in request.query_params.getlist(param)
+                for name in value.split(',') if name.strip()
+            }
+            unknown = names[param] - set(self.fields)
+            if unknown:
+                errors[param] = [UNKNOWN_FIELDS_MESSAGE.format(
+                    fields=', '.join(sorted(unknown)))]
+        if errors:
+            raise serializers.ValidationError(errors)
+        for name in list(self.fields):
+            if name in names[OMIT_PARAM] or (
+                    names[FIELDS_PARAM] and name not in names[FIELDS_PARAM]):
+                self.fields.pop(name)
+
+
+class PreloadedSlugRelatedField(SlugRelatedField):
+    """SlugRelatedField, который при массовой записи не ходит в базу.
+
+    Объекты всех слагов пакета загружаются заранее одним запросом
+    (api.bulk.preload_relations) и передаются в контексте.
+    """
+
+    def to_internal_value(self, data):
+        preloaded = self.context.get(PRELOADED_RELATIONS)
+        if preloaded is None:
+            return super().to_internal_value(data)
+        if not isinstance(data, (str, int)) or isinstance(data, bool):
+            self.fail('invalid')
+        try:
+            return preloaded[self.get_queryset().model, self.slug_field][
+                str(data)]
+        except KeyError:
+            self.fail(
+                'does_not_exist',
+                slug_name=self.slug_field,
+                value=smart_str(data),
+            )
+
+
+class GenreSerializer(
+        CompiledRepresentationMixin, serializers.ModelSerializer):
     class Meta:
         model = Genre
         fields = ('name', 'slug')
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(
+        CompiledRepresentationMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ('name', 'slug')
 
 
-class TitleOutputSerializer(serializers.ModelSerializer):
+class TitleOutputSerializer(
+        SparseFieldsMixin,
+        CompiledRepresentationMixin,
+        serializers.ModelSerializer,
+):
     category = CategorySerializer()
     genre = GenreSerializer(many=True)
     rating = serializers.IntegerField(read_only=True, default=None)
@@ -55,23 +126,42 @@ class TitleOutputSerializer(serializers.ModelSerializer):
 
 
 class TitleInputSerializer(TitleOutputSerializer):
-    category = SlugRelatedField(
+    category = PreloadedSlugRelatedField(
         queryset=Category.objects.all(),
         slug_field='slug'
     )
 
-    genre = SlugRelatedField(
+    genre = PreloadedSlugRelatedField(
         many=True,
         queryset=Genre.objects.all(),
         slug_field='slug',
     )
     year = serializers.IntegerField(validators=(validate_year,))
 
+    def create(self, validated_data):
+        genres = validated_data.pop('genre')
+        title = super().create(validated_data)
+        GenreTitle.objects.using(title._state.db).set_genres(
+            {title: genres}, replace=False)
+        return title
+
+    def update(self, title, validated_data):
+        genres = validated_data.pop('genre', None)
+        title = super().update(title, validated_data)
+        if genres is not None:
+            GenreTitle.objects.using(title._state.db).set_genres(
+                {title: genres})
+        return title
+
     def to_representation(self, title):
         return TitleOutputSerializer(title).data
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(
+        SparseFieldsMixin,
+        CompiledRepresentationMixin,
+        serializers.ModelSerializer,
+):
     author = SlugRelatedField(read_only=True, slug_field='username')
     score = serializers.IntegerField(validators=(
         MinValueValidator(limit_value=MIN_SCORE, message=INVALID_SCORE),
@@ -82,17 +172,29 @@ class ReviewSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'score', 'pub_date')
         model = Review
 
+    def get_title(self):
+        view = self.context.get('view')
+        if hasattr(view, 'get_title'):
+            return view.get_title()
+        return get_object_or_404(
+            Title,
+            pk=self.context['request'].parser_context['kwargs']['title_id'],
+        )
+
     def validate(self, data):
         request = self.context.get('request')
-        if request.method != 'PATCH' and get_object_or_404(
-                Title, pk=request.parser_context.get('kwargs').get('title_id'),
-        ).reviews.filter(author=request.user).exists():
+        if request.method != 'PATCH' and self.get_title().reviews.filter(
+                author=request.user).exists():
             raise serializers.ValidationError(
                 SECOND_REVIEW_PROHIBITION_MESSAGE)
         return data
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(
+        SparseFieldsMixin,
+        CompiledRepresentationMixin,
+        serializers.ModelSerializer,
+):
     author = serializers.SlugRelatedField(
         read_only=True, slug_field='username')
 
@@ -0,0 +1,27 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .authentication import invalidate_cached_user
+from .cache import bump_catalogue_version
+from reviews.models import Category, Genre, GenreTitle, Review, Title, User
+from reviews.signals import catalogue_changed
+
+CATALOGUE_MODELS = (Category, Genre, GenreTitle, Review, Title)
+
+
+@receiver((post_save, post_delete), sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    invalidate_cached_user(getattr(instance, jwt_settings.USER_ID_FIELD))
+
+
+def invalidate_catalogue(sender, **kwargs):
+    transaction.on_commit(bump_catalogue_version)
+
+
+for model in CATALOGUE_MODELS:
+    post_save.connect(invalidate_catalogue, sender=model)
+    post_delete.connect(invalidate_catalogue, sender=model)
+m2m_changed.connect(invalidate_catalogue, sender=Title.genre.through)
+catalogue_changed.connect(invalidate_catalogue)
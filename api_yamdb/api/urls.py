@@ -1,6 +1,8 @@
+from django.conf import settings
 from django.urls import include, path
 from rest_framework import routers
 
+from api.async_views import asyncify_urls
 from api.views import (
     CategotyViewSet,
     CommentViewSet,
@@ -33,7 +35,17 @@ signup_urls = [
     path('auth/token/', GetTokenView.as_view(), name='signup'),
 ]
 
-urlpatterns = [
-    path('v1/', include(router_v1.urls)),
-    path('v1/', include(signup_urls)),
-]
+ASYNC_VIEWSETS = (TitleViewSet, ReviewViewSet, CommentViewSet)
+
+
+def get_urlpatterns(async_reads=False):
+    v1_urls = router_v1.urls
+    if async_reads:
+        v1_urls = asyncify_urls(v1_urls, ASYNC_VIEWSETS)
+    return [
+        path('v1/', include(v1_urls)),
+        path('v1/', include(signup_urls)),
+    ]
+
+
+urlpatterns = get_urlpatterns(settings.ASYNC_READ_VIEWS)
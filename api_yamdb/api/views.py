@@ -1,9 +1,8 @@
+from functools import cached_property
 import random
 
 from django.conf import settings
-from django.core.mail import send_mail
 from django.db import IntegrityError
-from django.db.models import Avg
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, status, viewsets
@@ -18,13 +17,28 @@ from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.views import APIView
 
+from .autocomplete import (
+    PREFIX_PARAM,
+    TrieAutocompleteMixin,
+    get_limit,
+    get_prefix_range,
+    normalize,
+)
+from .bulk import CONFLICT, BulkWriteMixin, save_new_objects
+from .cache import CachedResponseMixin, CachedRetrieveResponseMixin
+from .facets import count_facets
 from .filters import TitleFilter
 from .permissions import (
     IsAdminOnly,
     IsAdminOrReadOnly,
     IsAuthorOrStuffOrReadOnly,
 )
-from reviews.models import Category, Genre, Review, Title, User
+from .pagination import SwitchablePagination
+from .planning import QueryPlanningMixin
+from reviews.mailing import queue_mail
+from reviews.models import Category, Genre, GenreTitle, Review, Title, User
+from reviews.search import get_search_backend
+from reviews.signals import SEARCH_FIELDS
 from .serializers import (
     CategorySerializer,
     CommentSerializer,
@@ -56,6 +70,9 @@ USERNAME_OCCUPIED_MESSAGE = 'Пользователь с таким username у
 
 
 class CategoryGenreViewSet(
+    BulkWriteMixin,
+    CachedResponseMixin,
+    TrieAutocompleteMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
     mixins.ListModelMixin,
@@ -77,28 +94,81 @@ class GenreViewSet(CategoryGenreViewSet):
     serializer_class = GenreSerializer
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all().annotate(
-        rating=Avg('reviews__score')).order_by('-year', 'name')
+class TitleViewSet(
+    BulkWriteMixin,
+    CachedRetrieveResponseMixin,
+    QueryPlanningMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = Title.objects.order_by('-year', 'name')
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
     permission_classes = (IsAdminOrReadOnly,)
+    pagination_class = SwitchablePagination
+    cursor_ordering = ('-year', 'name', 'id')
     http_method_names = ('get', 'post', 'patch', 'delete')
+    bulk_methods = ('post', 'patch', 'delete')
+    bulk_output_serializer_class = TitleOutputSerializer
 
     def get_serializer_class(self):
         if self.request.method == 'GET':
             return TitleOutputSerializer
         return TitleInputSerializer
 
-
-class ReviewViewSet(viewsets.ModelViewSet):
+    @action(detail=False, pagination_class=None)
+    def facets(self, request):
+        """Счётчики по жанрам, категориям и годам для текущих фильтров."""
+        return self.get_cached_response(self.get_facets, request)
+
+    def get_facets(self, request):
+        return Response(count_facets(
+            self.filter_queryset(self.get_queryset())))
+
+    def perform_bulk_create(self, rows):
+        genres = [row.pop('genre') for row in rows]
+        using = self.get_write_db()
+        results, signals_sent = save_new_objects(
+            Title, [Title(**row) for row in rows], using)
+        saved = {
+            title: genre for title, genre in zip(results, genres)
+            if title is not CONFLICT
+        }
+        if not signals_sent:
+            get_search_backend(using).index(list(saved))
+        GenreTitle.objects.using(using).set_genres(saved, replace=False)
+        return results
+
+    def perform_bulk_update(self, changes):
+        genres = {
+            instance: data.pop('genre')
+            for instance, data in changes if 'genre' in data
+        }
+        renamed = [
+            instance for instance, data in changes
+            if SEARCH_FIELDS & set(data)
+        ]
+        titles = super().perform_bulk_update(changes)
+        if genres:
+            GenreTitle.objects.using(self.get_write_db()).set_genres(genres)
+        if renamed:
+            get_search_backend(self.get_write_db()).index(renamed)
+        return titles
+
+
+class ReviewViewSet(QueryPlanningMixin, viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = (IsAuthenticatedOrReadOnly, IsAuthorOrStuffOrReadOnly)
+    pagination_class = SwitchablePagination
+    cursor_ordering = ('-pub_date', '-id')
     http_method_names = ('get', 'post', 'patch', 'delete')
 
-    def get_title(self):
+    @cached_property
+    def title(self):
         return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
 
+    def get_title(self):
+        return self.title
+
     def get_queryset(self):
         return self.get_title().reviews.all()
 
@@ -106,21 +176,27 @@ class ReviewViewSet(viewsets.ModelViewSet):
         serializer.save(author=self.request.user, title=self.get_title())
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(QueryPlanningMixin, viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     http_method_names = ('get', 'post', 'patch', 'delete')
     permission_classes = (IsAuthenticatedOrReadOnly, IsAuthorOrStuffOrReadOnly)
+    pagination_class = SwitchablePagination
+    cursor_ordering = ('-pub_date', '-id')
 
-    def get_title(self):
-        return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
-
-    def get_review(self):
+    @cached_property
+    def review(self):
         return get_object_or_404(
-            Review,
+            Review.objects.select_related('title'),
             pk=self.kwargs.get('review_id'),
-            title=self.get_title(),
+            title_id=self.kwargs.get('title_id'),
         )
 
+    def get_title(self):
+        return self.review.title
+
+    def get_review(self):
+        return self.review
+
     def get_queryset(self):
         return self.get_review().comments.all()
 
@@ -155,14 +231,14 @@ class SignUpView(APIView):
             settings.CONFIRMATION_CODE_SYMBOLS,
             k=settings.CONFIRMATION_CODE_LENGTH))
         user.save()
-        send_mail(subject=SUBJECT,
-                  message=MESSAGE.format(
-                      username=user.username,
-                      confirmation_code=user.confirmation_code
-                  ),
-                  from_email=settings.ADMIN_EMAIL,
-                  recipient_list=(user.email,),
-                  )
+        queue_mail(subject=SUBJECT,
+                   message=MESSAGE.format(
+                       username=user.username,
+                       confirmation_code=user.confirmation_code
+                   ),
+                   from_email=settings.ADMIN_EMAIL,
+                   recipient_list=(user.email,),
+                   )
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -210,3 +286,16 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         serializer.save(role=request.user.role)
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(detail=False, pagination_class=None)
+    def autocomplete(self, request):
+        users = User.objects.order_by('username_lower')
+        prefix = normalize(request.query_params.get(PREFIX_PARAM, ''))
+        if prefix:
+            lower, upper = get_prefix_range(prefix)
+            users = users.filter(
+                username_lower__gte=lower, username_lower__lt=upper)
+        return Response([
+            {'username': username} for username in users.values_list(
+                'username', flat=True)[:get_limit(request)]
+        ])
@@ -0,0 +1,80 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+import random
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Включается на время запросов на чтение, см. ReplicaRoutingMiddleware.
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+@contextmanager
+def use_replica():
+    """Направляет чтения внутри блока на реплики, если они настроены."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def reads_from_replica():
+    """Идут ли чтения текущего запроса на реплику."""
+    return _replica_reads.get() and bool(settings.REPLICA_DATABASES)
+
+
+class ReplicaRouter:
+    """Читает с реплики внутри use_replica, пишет всегда в default.
+
+    Реплики — физические копии основной базы, поэтому связи между
+    объектами разрешены, а миграции к ним не применяются.
+    """
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        if _replica_reads.get() and settings.REPLICA_DATABASES:
+            return random.choice(settings.REPLICA_DATABASES)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.REPLICA_DATABASES:
+            return False
+        return None
+
+
+def close_unusable_connections(**kwargs):
+    """Проверяет постоянные соединения перед обработкой запроса.
+
+    Аналог CONN_HEALTH_CHECKS из Django 4.1: соединение, оборванное
+    сервером или пулером, закрывается и открывается заново при первом
+    запросе, вместо ошибки в середине обработки.
+    """
+    for connection in connections.all():
+        if (
+            connection.connection is not None
+            and connection.settings_dict.get('CONN_HEALTH_CHECKS')
+            and not connection.in_atomic_block
+            and not connection.is_usable()
+        ):
+            connection.close()
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """Выставляет SQLITE_PRAGMAS на каждом новом соединении с SQLite.
+
+    Прагмы выполняются напрямую через драйвер, чтобы не попадать в
+    журнал запросов Django.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
@@ -1,4 +1,5 @@
 from datetime import timedelta
+import os
 from pathlib import Path
 import string
 
@@ -26,6 +27,7 @@ INSTALLED_APPS = [
     'django_filters',
     'reviews',
     'api',
+    'benchmarks',
 ]
 
 MIDDLEWARE = [
@@ -36,6 +38,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
@@ -59,15 +62,84 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
+# Асинхронные чтения произведений, отзывов и комментариев под ASGI
+# (api.async_views). Под WSGI включать не нужно.
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', 'false').lower() == 'true'
+
+# Собранные заранее представления ответов (api.representation) и
+# рендерер JSON на orjson (api.renderers). Ответ совпадает с обычным
+# ответом DRF байт в байт, настройка оставлена для сравнения и отката.
+FAST_SERIALIZATION = os.getenv(
+    'FAST_SERIALIZATION', 'true').lower() == 'true'
+
 # Database
+# По умолчанию SQLite без настройки. DB_ENGINE=django.db.backends.postgresql
+# включает PostgreSQL с параметрами подключения из окружения.
+
+SQLITE_ENGINE = 'django.db.backends.sqlite3'
+DB_ENGINE = os.getenv('DB_ENGINE', SQLITE_ENGINE)
+
+if DB_ENGINE == SQLITE_ENGINE:
+    DATABASES = {
+        'default': {
+            'ENGINE': SQLITE_ENGINE,
+            'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': DB_ENGINE,
+            'NAME': os.getenv('DB_NAME', 'api_yamdb'),
+            'USER': os.getenv('DB_USER', 'postgres'),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            # Секунды жизни соединения между запросами, 0 — закрывать
+            # после каждого запроса.
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+            # Проверка соединения перед запросом (api_yamdb.db).
+            'CONN_HEALTH_CHECKS': (
+                os.getenv('DB_CONN_HEALTH_CHECKS', 'true').lower() == 'true'),
+            # pgbouncer в режиме transaction не сохраняет серверные
+            # курсоры между транзакциями.
+            'DISABLE_SERVER_SIDE_CURSORS': (
+                os.getenv('DB_POOLER', '') == 'pgbouncer'),
+        }
+    }
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+if os.getenv('DB_REPLICA_HOST') or os.getenv('DB_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.getenv('DB_REPLICA_NAME', DATABASES['default']['NAME']),
+        'TEST': {'MIRROR': 'default'},
     }
+    if DB_ENGINE != SQLITE_ENGINE:
+        DATABASES['replica']['HOST'] = os.getenv(
+            'DB_REPLICA_HOST', DATABASES['default']['HOST'])
+        DATABASES['replica']['PORT'] = os.getenv(
+            'DB_REPLICA_PORT', DATABASES['default']['PORT'])
+
+# Выставляются на каждом новом соединении с SQLite (api_yamdb.db).
+# WAL позволяет читать во время записи, busy_timeout ждёт освобождения
+# блокировки вместо ошибки database is locked.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    # Отрицательное значение задаёт размер в КиБ.
+    'cache_size': -64 * 1024,
+    'mmap_size': 256 * 1024 * 1024,
+    'busy_timeout': 5000,
 }
 
+REPLICA_DATABASES = [alias for alias in DATABASES if alias != 'default']
+
+DATABASE_ROUTERS = ['api_yamdb.db.ReplicaRouter']
+
+# Сколько секунд после своего изменения пользователь читает из основной
+# базы, а не с реплики.
+REPLICA_PIN_TIMEOUT = int(os.getenv('DB_REPLICA_PIN_TIMEOUT', 5))
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -108,16 +180,58 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+# Кэш в памяти процесса не виден другим процессам: сброс версии после
+# изменения в одном воркере не дойдёт до остальных. Поэтому кэш
+# пользователей по токену, кэш ответов и дерево подсказок каталога, а
+# также привязка к основной базе после записи работают только с общим
+# кэшем (Redis, Memcached, база данных). Без него пользователь читается
+# из базы, ответы и дерево строятся на каждый запрос, а пользователи с
+# токеном читают из основной базы. Если приложение работает в одном
+# процессе, кэш в памяти включается явно через CACHE_SHARED=true.
+# Код проверяет настройку через api.cache.cache_is_shared().
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+CACHE_SHARED = os.getenv(
+    'CACHE_SHARED',
+    str(CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHE_BACKENDS),
+).lower() == 'true'
+
+CATALOGUE_CACHE_TIMEOUT = 60 * 15
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
+# sync, thread или outbox (отправка командой send_queued_mail)
+EMAIL_DELIVERY_MODE = os.getenv('EMAIL_DELIVERY_MODE', 'thread')
+EMAIL_QUEUE_THREADS = int(os.getenv('EMAIL_QUEUE_THREADS', 2))
+EMAIL_QUEUE_BATCH_SIZE = 100
+EMAIL_QUEUE_MAX_ATTEMPTS = 5
+EMAIL_QUEUE_RETRY_DELAY = 30
+# Через сколько секунд письмо, забранное упавшим обработчиком, снова
+# попадает в очередь.
+EMAIL_QUEUE_CLAIM_TIMEOUT = 300
+
 AUTH_USER_MODEL = 'reviews.User'
 
 SIMPLE_JWT = {
@@ -125,6 +239,8 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+JWT_USER_CACHE_TIMEOUT = 300
+
 ADMIN_EMAIL = 'admin@ya_mdb.ru'
 
 CONFIRMATION_CODE_LENGTH = 255
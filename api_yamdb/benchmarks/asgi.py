@@ -0,0 +1,68 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+import threading
+import time
+from types import ModuleType
+
+from django.test import AsyncClient, Client
+from django.urls import include, path
+
+from .base import summarize
+from .scenarios import comments_url, reviews_url, title_url, titles_url
+from api.urls import get_urlpatterns
+
+
+def get_read_paths(context):
+    return [
+        titles_url(context),
+        title_url(context),
+        reviews_url(context),
+        comments_url(context),
+    ]
+
+
+def build_urlconf(async_reads):
+    """Модуль URL проекта с асинхронными чтениями или без них."""
+    urlconf = ModuleType(f'benchmark_urls_{async_reads}')
+    urlconf.urlpatterns = [
+        path('api/', include(get_urlpatterns(async_reads))),
+    ]
+    return urlconf
+
+
+def run_wsgi_load(paths, concurrency, requests):
+    """Запросы через WSGI-обработчик из пула потоков, как у gunicorn."""
+    local = threading.local()
+
+    def fetch(path):
+        if not hasattr(local, 'client'):
+            local.client = Client()
+        started = time.perf_counter()
+        response = local.client.get(path)
+        return time.perf_counter() - started, response.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(fetch, islice(cycle(paths), requests)))
+    return summarize(results, time.perf_counter() - started, 200)
+
+
+def run_asgi_load(paths, concurrency, requests):
+    """Запросы через ASGI-обработчик, не больше concurrency одновременно."""
+    async def load():
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(path):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(path)
+                return time.perf_counter() - started, response.status_code
+
+        return await asyncio.gather(
+            *map(fetch, islice(cycle(paths), requests)))
+
+    started = time.perf_counter()
+    results = asyncio.run(load())
+    return summarize(results, time.perf_counter() - started, 200)
@@ -0,0 +1,51 @@
+from contextlib import contextmanager
+from pathlib import Path
+import tempfile
+
+from django.db import connection, connections
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+API_URL = '/api/v1/'
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[round(fraction * (len(values) - 1))]
+
+
+def summarize(results, elapsed, expected_status):
+    """Сводка по парам (длительность в секундах, код ответа)."""
+    timings = [timing * 1000 for timing, _ in results]
+    return {
+        'requests': len(results),
+        'errors': sum(status != expected_status for _, status in results),
+        'rps': round(len(results) / elapsed, 1),
+        'p50_ms': round(percentile(timings, 0.5), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+    }
+
+
+@contextmanager
+def benchmark_database(directory=None):
+    """Тестовая база на время замера, для SQLite — в файле.
+
+    На базе в памяти нет файловых блокировок и параллельные соединения
+    ведут себя иначе, чем в работающем проекте.
+    """
+    with tempfile.TemporaryDirectory(dir=directory) as path:
+        if connection.vendor == 'sqlite':
+            connection.settings_dict['TEST']['NAME'] = str(
+                Path(path) / 'benchmark.sqlite3')
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            yield
+        finally:
+            connections.close_all()
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
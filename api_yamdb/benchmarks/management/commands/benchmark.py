@@ -0,0 +1,102 @@
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from benchmarks.base import benchmark_database
+from benchmarks.scenarios import (
+    SCENARIOS,
+    BenchmarkRunner,
+    compare_with_baseline,
+    get_uncovered_routes,
+    load_baseline,
+    save_baseline,
+)
+from reviews.synthetic import DEFAULT_SIZES, generate_dataset
+
+ROW = '{name:<24} {method:<6} {p50_ms:>9} {p95_ms:>9} {queries:>7} {bytes:>9}'
+UNCOVERED_ROUTES_MESSAGE = 'Маршруты без сценариев: {routes}'
+REGRESSIONS_MESSAGE = 'Обнаружены регрессии:\n{regressions}'
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт синтетический набор данных в тестовой базе и измеряет '
+        'задержку, число запросов и размер ответа для маршрутов API.'
+    )
+
+    def add_arguments(self, parser):
+        for name, default in DEFAULT_SIZES.items():
+            parser.add_argument(
+                f'--{name.replace("_", "-")}', type=int, default=default)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument(
+            '--warm',
+            action='store_true',
+            help='Не очищать кэш между запросами.',
+        )
+        parser.add_argument(
+            '--scenario',
+            action='append',
+            help='Запустить только указанные сценарии.',
+        )
+        parser.add_argument(
+            '--baseline', help='JSON базовой линии для сравнения.')
+        parser.add_argument(
+            '--save-baseline', help='Куда сохранить результаты как JSON.')
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.2,
+            help='Допустимый рост задержки и размера ответа.',
+        )
+        parser.add_argument(
+            '--directory', help='Каталог для файла базы SQLite.')
+
+    def get_scenarios(self, names):
+        if not names:
+            return SCENARIOS
+        scenarios = [
+            scenario for scenario in SCENARIOS if scenario.name in names]
+        unknown = set(names) - {scenario.name for scenario in scenarios}
+        if unknown:
+            raise CommandError(f'Неизвестные сценарии: {", ".join(unknown)}')
+        return scenarios
+
+    def report(self, results):
+        self.stdout.write(ROW.format(
+            name='сценарий', method='метод', p50_ms='p50, мс',
+            p95_ms='p95, мс', queries='запросы', bytes='байты'))
+        for name, result in results.items():
+            self.stdout.write(ROW.format(name=name, **result))
+
+    def handle(self, *args, **options):
+        sizes = {name: options[name] for name in DEFAULT_SIZES}
+        scenarios = self.get_scenarios(options['scenario'])
+        uncovered = get_uncovered_routes()
+        if uncovered:
+            self.stderr.write(UNCOVERED_ROUTES_MESSAGE.format(
+                routes=', '.join(uncovered)))
+        # Ожидаемые ответы 4xx не должны засорять таблицу результатов.
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        # Замер идёт в одном процессе, кэш в памяти для него общий.
+        with benchmark_database(options['directory']), override_settings(
+                EMAIL_DELIVERY_MODE='outbox', CACHE_SHARED=True):
+            generate_dataset(seed=options['seed'], **sizes)
+            results = BenchmarkRunner(
+                repeat=options['repeat'],
+                warmup=options['warmup'],
+                warm=options['warm'],
+            ).run(scenarios)
+        self.report(results)
+        if options['save_baseline']:
+            save_baseline(options['save_baseline'], results, sizes)
+        if options['baseline']:
+            regressions = compare_with_baseline(
+                results, load_baseline(options['baseline']),
+                options['tolerance'])
+            if regressions:
+                raise CommandError(REGRESSIONS_MESSAGE.format(
+                    regressions='\n'.join(regressions)))
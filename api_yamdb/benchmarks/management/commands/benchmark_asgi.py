@@ -0,0 +1,66 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from benchmarks.asgi import (
+    build_urlconf,
+    get_read_paths,
+    run_asgi_load,
+    run_wsgi_load,
+)
+from benchmarks.base import benchmark_database
+from benchmarks.scenarios import BenchmarkContext
+from reviews.synthetic import generate_dataset
+
+ROW = (
+    '{name:<12} {concurrency:>10} {requests:>8} {errors:>7} {rps:>9} '
+    '{p50_ms:>9} {p95_ms:>9}'
+)
+# Кэш ответов отключён, чтобы каждый запрос доходил до базы.
+NO_CACHE = {'default': {
+    'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность чтения произведений, отзывов и '
+        'комментариев под WSGI, под ASGI с синхронными представлениями и '
+        'под ASGI с асинхронными (ASYNC_READ_VIEWS).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            nargs='+',
+            default=[1, 8, 32],
+            help='Число одновременных запросов или потоков WSGI.',
+        )
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--titles', type=int, default=200)
+        parser.add_argument(
+            '--directory', help='Каталог для файла базы SQLite.')
+
+    def handle(self, *args, **options):
+        modes = (
+            ('wsgi', build_urlconf(False), run_wsgi_load),
+            ('asgi-sync', build_urlconf(False), run_asgi_load),
+            ('asgi-async', build_urlconf(True), run_asgi_load),
+        )
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        with benchmark_database(options['directory']), override_settings(
+                CACHES=NO_CACHE):
+            generate_dataset(titles=options['titles'])
+            paths = get_read_paths(BenchmarkContext())
+            self.stdout.write(ROW.format(
+                name='режим', concurrency='параллельно', requests='запросы',
+                errors='ошибки', rps='запр./с', p50_ms='p50, мс',
+                p95_ms='p95, мс'))
+            for concurrency in options['concurrency']:
+                for name, urlconf, run in modes:
+                    with override_settings(ROOT_URLCONF=urlconf):
+                        result = run(
+                            paths, concurrency, options['requests'])
+                    self.stdout.write(ROW.format(
+                        name=name, concurrency=concurrency, **result))
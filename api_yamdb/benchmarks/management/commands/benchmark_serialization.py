@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.base import benchmark_database
+from benchmarks.serialization import benchmark_serialization
+from reviews.synthetic import generate_dataset
+
+ROW = (
+    '{name:<12} {objects:>8} {drf_ms:>10} {fast_ms:>10} {speedup:>9} '
+    '{identical:>10}'
+)
+MISMATCH_MESSAGE = 'Быстрый путь изменил ответ: {names}.'
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время построения ответа со страницей объектов обычными '
+        'сериализаторами и JSONRenderer DRF и быстрым путём '
+        '(FAST_SERIALIZATION), проверяя, что ответы совпадают байт в байт.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=200)
+        parser.add_argument('--titles', type=int, default=200)
+        parser.add_argument(
+            '--directory', help='Каталог для файла базы SQLite.')
+
+    def handle(self, *args, **options):
+        with benchmark_database(options['directory']):
+            generate_dataset(titles=options['titles'])
+            results = benchmark_serialization(
+                options['page_size'], options['repeat'])
+        self.stdout.write(ROW.format(
+            name='ответ', objects='объекты', drf_ms='DRF, мс',
+            fast_ms='быстро, мс', speedup='ускорение',
+            identical='совпадает'))
+        for result in results:
+            self.stdout.write(ROW.format(**{
+                **result, 'identical': 'да' if result['identical'] else 'нет',
+            }))
+        mismatches = [
+            result['name'] for result in results if not result['identical']]
+        if mismatches:
+            raise CommandError(
+                MISMATCH_MESSAGE.format(names=', '.join(mismatches)))
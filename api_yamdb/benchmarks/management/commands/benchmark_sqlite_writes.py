@@ -0,0 +1,68 @@
+import logging
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test.utils import override_settings
+
+from benchmarks.base import benchmark_database
+from benchmarks.sqlite_writes import (
+    SQLITE_DEFAULT_PRAGMAS,
+    get_idle_users,
+    run_concurrent_reviews,
+)
+from reviews.synthetic import generate_dataset
+
+ROW = '{name:<16} {requests:>8} {errors:>7} {rps:>9} {p50_ms:>9} {p95_ms:>9}'
+NOT_SQLITE_MESSAGE = 'Замер предназначен для SQLite, а настроена {vendor}.'
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность параллельной публикации '
+        'отзывов на файловой SQLite с настройками по умолчанию и с '
+        'SQLITE_PRAGMAS.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=25,
+            help='Количество отзывов на поток.',
+        )
+        parser.add_argument('--titles', type=int, default=50)
+        parser.add_argument(
+            '--directory',
+            help='Каталог для файла базы: результат зависит от диска.',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError(
+                NOT_SQLITE_MESSAGE.format(vendor=connection.vendor))
+        threads = options['threads']
+        count = threads * options['requests']
+        profiles = (
+            ('sqlite-default', SQLITE_DEFAULT_PRAGMAS),
+            ('tuned', settings.SQLITE_PRAGMAS),
+        )
+        logging.getLogger('django.request').setLevel(logging.CRITICAL)
+        with benchmark_database(options['directory']), override_settings(
+                EMAIL_DELIVERY_MODE='outbox'):
+            generate_dataset(
+                users=count * len(profiles),
+                titles=options['titles'],
+                reviews_per_title=0,
+                comments_per_review=0,
+            )
+            self.stdout.write(ROW.format(
+                name='профиль', requests='запросы', errors='ошибки',
+                rps='запр./с', p50_ms='p50, мс', p95_ms='p95, мс'))
+            for name, pragmas in profiles:
+                with override_settings(SQLITE_PRAGMAS=pragmas):
+                    connections.close_all()
+                    result = run_concurrent_reviews(
+                        get_idle_users(count), threads)
+                self.stdout.write(ROW.format(name=name, **result))
@@ -0,0 +1,407 @@
+from collections import namedtuple
+import json
+import time
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .base import API_URL, percentile
+from api.urls import router_v1, signup_urls
+from reviews.models import ADMIN, Category, Genre, Review, Title, User
+
+Scenario = namedtuple(
+    'Scenario', ('name', 'route', 'method', 'build', 'expected_status'))
+UNEXPECTED_STATUS_MESSAGE = (
+    'Сценарий {name}: {method} {path} вернул {status}, ожидался {expected}.'
+)
+QUERIES_REGRESSION = '{name}: запросов {value} > {baseline} в базовой линии'
+LATENCY_REGRESSION = '{name}: p95 {value:.2f} мс > {baseline:.2f} мс'
+BYTES_REGRESSION = '{name}: размер ответа {value} > {baseline} байт'
+MIN_LATENCY_REGRESSION_MS = 1
+BULK_SIZE = 20
+
+
+class BenchmarkContext:
+    """Объекты синтетического набора, на которые ссылаются сценарии."""
+
+    def __init__(self):
+        self.admin = User.objects.filter(role=ADMIN).first()
+        self.review = Review.objects.filter(
+            comments__isnull=False).select_related('title', 'author').first()
+        self.title = self.review.title
+        self.comment = self.review.comments.select_related('author').first()
+        self.category = Category.objects.first()
+        self.genre = Genre.objects.first()
+        self.title_genres = ','.join(
+            self.title.genre.order_by('slug').values_list('slug', flat=True))
+
+    def create_user(self, prefix, iteration):
+        return User.objects.create(
+            username=f'{prefix}_{iteration}_{time.monotonic_ns()}',
+            email=f'{prefix}_{iteration}_{time.monotonic_ns()}@yamdb.fake',
+        )
+
+
+def get(path, user=None):
+    def build(context, iteration):
+        return path(context), None, user(context) if user else None
+    return build
+
+
+def titles_url(context):
+    return f'{API_URL}titles/'
+
+
+def title_url(context):
+    return f'{API_URL}titles/{context.title.id}/'
+
+
+def reviews_url(context):
+    return f'{title_url(context)}reviews/'
+
+
+def review_url(context):
+    return f'{reviews_url(context)}{context.review.id}/'
+
+
+def comments_url(context):
+    return f'{review_url(context)}comments/'
+
+
+def comment_url(context):
+    return f'{comments_url(context)}{context.comment.id}/'
+
+
+def genres_url(mode):
+    def build(context):
+        return (f'{titles_url(context)}?genre={context.title_genres}'
+                f'&genre_mode={mode}')
+    return build
+
+
+def admin(context):
+    return context.admin
+
+
+def build_title_create(context, iteration):
+    return titles_url(context), {
+        'name': f'Новое произведение {iteration}',
+        'year': 2000,
+        'genre': [context.genre.slug],
+        'category': context.category.slug,
+        'description': 'Описание',
+    }, context.admin
+
+
+def build_title_update(context, iteration):
+    return title_url(context), {'description': f'Правка {iteration}'}, (
+        context.admin)
+
+
+def build_slug_create(prefix):
+    def build(context, iteration):
+        return f'{API_URL}{prefix}/', {
+            'name': f'{prefix} {iteration}',
+            'slug': f'bench-{prefix}-{iteration}-{time.monotonic_ns()}',
+        }, context.admin
+    return build
+
+
+def build_slug_delete(model, prefix):
+    def build(context, iteration):
+        slug = f'bench-delete-{iteration}-{time.monotonic_ns()}'
+        model.objects.create(name=slug, slug=slug)
+        return f'{API_URL}{prefix}/{slug}/', None, context.admin
+    return build
+
+
+def build_titles_bulk_create(context, iteration):
+    return f'{titles_url(context)}bulk/', [
+        build_title_create(context, f'{iteration}-{index}')[1]
+        for index in range(BULK_SIZE)
+    ], context.admin
+
+
+def build_titles_bulk_update(context, iteration):
+    return f'{titles_url(context)}bulk/', [
+        {'id': title_id, 'description': f'Правка {iteration}',
+         'genre': [context.genre.slug]}
+        for title_id in Title.objects.values_list(
+            'pk', flat=True)[:BULK_SIZE]
+    ], context.admin
+
+
+def build_titles_bulk_delete(context, iteration):
+    titles = [
+        Title.objects.create(name=f'bench-delete-{iteration}', year=2000)
+        for _ in range(BULK_SIZE)
+    ]
+    return f'{titles_url(context)}bulk/', [
+        title.pk for title in titles], context.admin
+
+
+def build_slug_bulk_create(prefix):
+    build = build_slug_create(prefix)
+
+    def build_bulk(context, iteration):
+        return f'{API_URL}{prefix}/bulk/', [
+            build(context, f'{iteration}-{index}')[1]
+            for index in range(BULK_SIZE)
+        ], context.admin
+    return build_bulk
+
+
+def build_slug_bulk_delete(model, prefix):
+    def build(context, iteration):
+        slugs = [
+            f'bench-delete-{iteration}-{index}-{time.monotonic_ns()}'
+            for index in range(BULK_SIZE)
+        ]
+        model.objects.bulk_create(
+            model(name=slug, slug=slug) for slug in slugs)
+        return f'{API_URL}{prefix}/bulk/', slugs, context.admin
+    return build
+
+
+def build_review_create(context, iteration):
+    return reviews_url(context), {'text': 'Отзыв', 'score': 7}, (
+        context.create_user('reviewer', iteration))
+
+
+def build_review_update(context, iteration):
+    return review_url(context), {'text': f'Правка {iteration}'}, (
+        context.review.author)
+
+
+def build_comment_create(context, iteration):
+    return comments_url(context), {'text': f'Комментарий {iteration}'}, (
+        context.comment.author)
+
+
+def build_user_create(context, iteration):
+    return f'{API_URL}users/', {
+        'username': f'bench_user_{iteration}_{time.monotonic_ns()}',
+        'email': f'bench_user_{iteration}_{time.monotonic_ns()}@yamdb.fake',
+    }, context.admin
+
+
+def build_signup(context, iteration):
+    return f'{API_URL}auth/signup/', {
+        'username': f'signup_{iteration}_{time.monotonic_ns()}',
+        'email': f'signup_{iteration}_{time.monotonic_ns()}@yamdb.fake',
+    }, None
+
+
+def build_token(context, iteration):
+    return f'{API_URL}auth/token/', {
+        'username': context.admin.username,
+        'confirmation_code': 'invalid',
+    }, None
+
+
+SCENARIOS = [
+    Scenario('api-root', 'api-root', 'get',
+             get(lambda context: API_URL, admin), 200),
+    Scenario('titles-list', 'title-list', 'get', get(titles_url), 200),
+    Scenario('titles-list-filtered', 'title-list', 'get',
+             get(lambda context: f'{titles_url(context)}'
+                 f'?genre={context.genre.slug}'),
+             200),
+    Scenario('titles-list-genres-any', 'title-list', 'get',
+             get(genres_url('any')), 200),
+    Scenario('titles-list-genres-all', 'title-list', 'get',
+             get(genres_url('all')), 200),
+    Scenario('titles-facets', 'title-facets', 'get',
+             get(lambda context: f'{titles_url(context)}facets/'), 200),
+    Scenario('titles-facets-filtered', 'title-facets', 'get',
+             get(lambda context: f'{titles_url(context)}facets/'
+                 f'?genre={context.title_genres}&year_min=1950'),
+             200),
+    Scenario('titles-detail', 'title-detail', 'get', get(title_url), 200),
+    Scenario('titles-create', 'title-list', 'post', build_title_create, 201),
+    Scenario('titles-update', 'title-detail', 'patch',
+             build_title_update, 200),
+    Scenario('titles-bulk-create', 'title-bulk', 'post',
+             build_titles_bulk_create, 201),
+    Scenario('titles-bulk-update', 'title-bulk', 'patch',
+             build_titles_bulk_update, 200),
+    Scenario('titles-bulk-delete', 'title-bulk', 'delete',
+             build_titles_bulk_delete, 200),
+    Scenario('categories-list', 'category-list', 'get',
+             get(lambda context: f'{API_URL}categories/'), 200),
+    Scenario('categories-create', 'category-list', 'post',
+             build_slug_create('categories'), 201),
+    Scenario('categories-delete', 'category-detail', 'delete',
+             build_slug_delete(Category, 'categories'), 204),
+    Scenario('categories-bulk-create', 'category-bulk', 'post',
+             build_slug_bulk_create('categories'), 201),
+    Scenario('categories-bulk-delete', 'category-bulk', 'delete',
+             build_slug_bulk_delete(Category, 'categories'), 200),
+    Scenario('categories-autocomplete', 'category-autocomplete', 'get',
+             get(lambda context: f'{API_URL}categories/autocomplete/'
+                 f'?prefix={context.category.name[:3]}'), 200),
+    Scenario('genres-list', 'genre-list', 'get',
+             get(lambda context: f'{API_URL}genres/'), 200),
+    Scenario('genres-create', 'genre-list', 'post',
+             build_slug_create('genres'), 201),
+    Scenario('genres-delete', 'genre-detail', 'delete',
+             build_slug_delete(Genre, 'genres'), 204),
+    Scenario('genres-bulk-create', 'genre-bulk', 'post',
+             build_slug_bulk_create('genres'), 201),
+    Scenario('genres-bulk-delete', 'genre-bulk', 'delete',
+             build_slug_bulk_delete(Genre, 'genres'), 200),
+    Scenario('genres-autocomplete', 'genre-autocomplete', 'get',
+             get(lambda context: f'{API_URL}genres/autocomplete/'
+                 f'?prefix={context.genre.name[:3]}'), 200),
+    Scenario('reviews-list', 'review-list', 'get', get(reviews_url), 200),
+    Scenario('reviews-detail', 'review-detail', 'get', get(review_url), 200),
+    Scenario('reviews-create', 'review-list', 'post',
+             build_review_create, 201),
+    Scenario('reviews-update', 'review-detail', 'patch',
+             build_review_update, 200),
+    Scenario('comments-list', 'comment-list', 'get', get(comments_url), 200),
+    Scenario('comments-detail', 'comment-detail', 'get',
+             get(comment_url), 200),
+    Scenario('comments-create', 'comment-list', 'post',
+             build_comment_create, 201),
+    Scenario('users-list', 'users-list', 'get',
+             get(lambda context: f'{API_URL}users/', admin), 200),
+    Scenario('users-detail', 'users-detail', 'get',
+             get(lambda context: f'{API_URL}users/{context.admin.username}/',
+                 admin), 200),
+    Scenario('users-create', 'users-list', 'post', build_user_create, 201),
+    Scenario('users-me', 'users-get-current-user', 'get',
+             get(lambda context: f'{API_URL}users/me/', admin), 200),
+    Scenario('users-autocomplete', 'users-autocomplete', 'get',
+             get(lambda context: f'{API_URL}users/autocomplete/'
+                 f'?prefix={context.admin.username[:3]}', admin), 200),
+    Scenario('auth-signup', 'get_token', 'post', build_signup, 200),
+    Scenario('auth-token', 'signup', 'post', build_token, 400),
+]
+
+
+def get_route_names():
+    return {
+        url.name for url in router_v1.urls + signup_urls if url.name
+    }
+
+
+def get_uncovered_routes(scenarios=SCENARIOS):
+    return sorted(
+        get_route_names() - {scenario.route for scenario in scenarios})
+
+
+class BenchmarkRunner:
+    """Прогоняет сценарии через тестовый клиент и собирает метрики.
+
+    Без warm кэш очищается перед каждым запросом, чтобы измерялась
+    работа с базой, а не попадания в кэш ответов.
+    """
+
+    def __init__(self, repeat=20, warmup=2, warm=False):
+        self.repeat = repeat
+        self.warmup = warmup
+        self.warm = warm
+        self.clients = {}
+
+    def get_client(self, user):
+        key = user.pk if user else None
+        if key not in self.clients:
+            client = APIClient()
+            if user:
+                client.credentials(
+                    HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+            self.clients[key] = client
+        return self.clients[key]
+
+    def request(self, scenario, context, iteration):
+        path, data, user = scenario.build(context, iteration)
+        client = self.get_client(user)
+        if not self.warm:
+            cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = getattr(client, scenario.method)(
+                path, data, format='json')
+            elapsed = time.perf_counter() - started
+        if response.status_code != scenario.expected_status:
+            raise AssertionError(UNEXPECTED_STATUS_MESSAGE.format(
+                name=scenario.name,
+                method=scenario.method.upper(),
+                path=path,
+                status=response.status_code,
+                expected=scenario.expected_status,
+            ))
+        return elapsed * 1000, len(queries), len(response.content)
+
+    def run_scenario(self, scenario, context):
+        timings, queries, sizes = [], [], []
+        for iteration in range(self.warmup + self.repeat):
+            elapsed, query_count, size = self.request(
+                scenario, context, iteration)
+            if iteration < self.warmup:
+                continue
+            timings.append(elapsed)
+            queries.append(query_count)
+            sizes.append(size)
+        return {
+            'route': scenario.route,
+            'method': scenario.method.upper(),
+            'p50_ms': round(percentile(timings, 0.5), 3),
+            'p95_ms': round(percentile(timings, 0.95), 3),
+            'queries': max(queries),
+            'bytes': max(sizes),
+        }
+
+    def run(self, scenarios=SCENARIOS):
+        context = BenchmarkContext()
+        return {
+            scenario.name: self.run_scenario(scenario, context)
+            for scenario in scenarios
+        }
+
+
+def compare_with_baseline(results, baseline, tolerance=0.2):
+    """Возвращает список регрессий относительно базовой линии.
+
+    Число запросов не должно расти вовсе, задержка p95 и размер ответа
+    сравниваются с допуском tolerance.
+    """
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result['queries'] > expected['queries']:
+            regressions.append(QUERIES_REGRESSION.format(
+                name=name, value=result['queries'],
+                baseline=expected['queries']))
+        limit = expected['p95_ms'] * (1 + tolerance)
+        if (result['p95_ms'] > limit and result['p95_ms']
+                - expected['p95_ms'] > MIN_LATENCY_REGRESSION_MS):
+            regressions.append(LATENCY_REGRESSION.format(
+                name=name, value=result['p95_ms'],
+                baseline=expected['p95_ms']))
+        if result['bytes'] > expected['bytes'] * (1 + tolerance):
+            regressions.append(BYTES_REGRESSION.format(
+                name=name, value=result['bytes'], baseline=expected['bytes']))
+    return regressions
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)['scenarios']
+
+
+def save_baseline(path, results, sizes):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(
+            {'dataset': sizes, 'scenarios': results},
+            file,
+            ensure_ascii=False,
+            indent=2,
+            sort_keys=True,
+        )
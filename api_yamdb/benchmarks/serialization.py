@@ -0,0 +1,56 @@
+import time
+
+from django.test.utils import override_settings
+
+from api.planning import plan_queryset
+from api.renderers import FastJSONRenderer
+from api.serializers import (
+    CategorySerializer,
+    CommentSerializer,
+    GenreSerializer,
+    ReviewSerializer,
+    TitleOutputSerializer,
+)
+from reviews.models import Category, Comment, Genre, Review, Title
+
+SERIALIZATION_CASES = (
+    ('titles', TitleOutputSerializer, Title),
+    ('reviews', ReviewSerializer, Review),
+    ('comments', CommentSerializer, Comment),
+    ('genres', GenreSerializer, Genre),
+    ('categories', CategorySerializer, Category),
+)
+
+
+def render_page(serializer_class, objects):
+    return FastJSONRenderer().render(serializer_class(objects, many=True).data)
+
+
+def benchmark_serialization(page_size, repeat):
+    """Сериализация и отрисовка страницы обычным путём DRF и быстрым.
+
+    Объекты загружаются заранее вместе со связями, поэтому замер
+    включает только построение ответа и его запись в JSON.
+    """
+    results = []
+    for name, serializer_class, model in SERIALIZATION_CASES:
+        objects = list(plan_queryset(
+            model.objects.all(), serializer_class())[:page_size])
+        timings, contents = {}, {}
+        for fast in (False, True):
+            with override_settings(FAST_SERIALIZATION=fast):
+                render_page(serializer_class, objects)
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    contents[fast] = render_page(serializer_class, objects)
+                timings[fast] = (
+                    (time.perf_counter() - started) / repeat * 1000)
+        results.append({
+            'name': name,
+            'objects': len(objects),
+            'drf_ms': round(timings[False], 3),
+            'fast_ms': round(timings[True], 3),
+            'speedup': round(timings[False] / timings[True], 2),
+            'identical': contents[False] == contents[True],
+        })
+    return results
@@ -0,0 +1,69 @@
+import random
+import threading
+import time
+
+from django.db import connection
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .base import API_URL, summarize
+from reviews.models import MAX_SCORE, MIN_SCORE, Title, User
+
+# Значения SQLite по умолчанию: журнал отката и полная синхронизация.
+# Режим журнала хранится в файле базы, поэтому его нужно вернуть явно.
+SQLITE_DEFAULT_PRAGMAS = {
+    'journal_mode': 'delete',
+    'synchronous': 'full',
+    'cache_size': -2000,
+    'mmap_size': 0,
+}
+
+
+def post_reviews(jobs, barrier, results):
+    barrier.wait()
+    client = APIClient()
+    try:
+        for user, title_id in jobs:
+            client.credentials(
+                HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+            started = time.perf_counter()
+            response = client.post(
+                f'{API_URL}titles/{title_id}/reviews/',
+                {'text': 'Отзыв', 'score': random.randint(
+                    MIN_SCORE, MAX_SCORE)},
+                format='json',
+            )
+            results.append((
+                time.perf_counter() - started, response.status_code))
+    finally:
+        connection.close()
+
+
+def run_concurrent_reviews(users, threads):
+    """Публикует по отзыву от каждого пользователя из нескольких потоков.
+
+    Каждый поток получает своё соединение с базой. Возвращает пропускную
+    способность, задержки и число неуспешных ответов.
+    """
+    title_ids = list(Title.objects.values_list('pk', flat=True))
+    jobs = [(user, random.choice(title_ids)) for user in users]
+    barrier = threading.Barrier(threads + 1)
+    results = []
+    workers = [
+        threading.Thread(
+            target=post_reviews,
+            args=(jobs[number::threads], barrier, results),
+        )
+        for number in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return summarize(results, time.perf_counter() - started, 201)
+
+
+def get_idle_users(count):
+    return list(User.objects.filter(reviews__isnull=True)[:count])
@@ -1,11 +1,14 @@
 from django.contrib import admin
 
-from .models import Category, Comment, Genre, GenreTitle, Review, Title, User
+from .models import (
+    Category, Comment, Genre, GenreTitle, OutgoingEmail, Review, Title, User,
+)
 
 admin.site.register(Category)
 admin.site.register(Comment)
 admin.site.register(Genre)
 admin.site.register(GenreTitle)
+admin.site.register(OutgoingEmail)
 admin.site.register(Review)
 admin.site.register(Title)
 admin.site.register(User)
@@ -0,0 +1,36 @@
+from django.db import models
+from django.db.models.expressions import OrderBy
+
+
+def drop_natural_nulls(expression, connection):
+    """Убирает NULLS FIRST/LAST, если СУБД и так хранит NULL там же.
+
+    По возрастанию NULL идёт первым там, где он меньше любых значений,
+    и последним там, где больше (PostgreSQL), по убыванию — наоборот.
+    """
+    if not isinstance(expression, OrderBy):
+        return expression
+    nulls_first = expression.descending == (
+        connection.features.nulls_order_largest)
+    if (expression.nulls_first and nulls_first
+            or expression.nulls_last and not nulls_first):
+        return OrderBy(expression.expression, descending=expression.descending)
+    return expression
+
+
+class NullsOrderIndex(models.Index):
+    """Индекс с явным положением NULL в колонках-выражениях.
+
+    Индекс подходит для ORDER BY только с тем же положением NULL.
+    SQLite не принимает NULLS FIRST/LAST в индексе, но там, где
+    положение совпадает с естественным, модификатор не нужен.
+    """
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        index = self.clone()
+        index.expressions = tuple(
+            drop_natural_nulls(expression, schema_editor.connection)
+            for expression in self.expressions
+        )
+        return super(NullsOrderIndex, index).create_sql(
+            model, schema_editor, using=using, **kwargs)
@@ -0,0 +1,314 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+import csv
+from itertools import islice
+from pathlib import Path
+import time
+
+import django
+from django.apps import apps
+from django.core.management.color import no_style
+from django.db import connections, router, transaction
+
+from .models import Comment, GenreTitle, Review, Title, User
+from .search import get_search_backend
+from .signals import catalogue_changed
+
+DATA = {
+    'category.csv': 'reviews_category',
+    'comments.csv': 'reviews_comment',
+    'genre.csv': 'reviews_genre',
+    'genre_title.csv': 'reviews_genretitle',
+    'review.csv': 'reviews_review',
+    'titles.csv': 'reviews_title',
+    'users.csv': 'reviews_user',
+}
+DEFAULT_CHUNK_SIZE = 1000
+UNKNOWN_COLUMN_MESSAGE = 'В файле {file} неизвестная колонка {column}.'
+DEPENDENCY_CYCLE_MESSAGE = 'Циклическая зависимость между таблицами: {tables}.'
+QUOTE_CHARACTERS = '"`'
+
+
+def get_model(table_name):
+    for model in apps.get_models():
+        if model._meta.db_table == table_name:
+            return model
+    raise LookupError(table_name)
+
+
+def get_dependencies(model, models):
+    return {
+        field.related_model for field in model._meta.concrete_fields
+        if field.is_relation and field.related_model in models
+        and field.related_model is not model
+    }
+
+
+def get_load_levels(models):
+    """Раскладывает модели по уровням зависимостей внешних ключей.
+
+    Модели одного уровня не ссылаются друг на друга, а все их
+    зависимости лежат на предыдущих уровнях.
+    """
+    pending = {model: get_dependencies(model, models) for model in models}
+    levels, loaded = [], set()
+    while pending:
+        level = sorted(
+            (model for model, deps in pending.items() if deps <= loaded),
+            key=lambda model: model._meta.db_table,
+        )
+        if not level:
+            raise ValueError(DEPENDENCY_CYCLE_MESSAGE.format(
+                tables=', '.join(m._meta.db_table for m in pending)))
+        levels.append(level)
+        loaded.update(level)
+        for model in level:
+            del pending[model]
+    return levels
+
+
+def get_load_order(models):
+    return [model for level in get_load_levels(models) for model in level]
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+@contextmanager
+def preserve_auto_now(model):
+    """Не даёт auto_now/auto_now_add затереть даты из файла."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False)
+        or getattr(field, 'auto_now_add', False)
+    ]
+    flags = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, flags):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class CSVTableLoader:
+    """Потоково загружает один CSV-файл в таблицу модели пачками."""
+
+    def __init__(self, model, path, chunk_size=DEFAULT_CHUNK_SIZE,
+                 using=None):
+        self.model = model
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self.using = using or router.db_for_write(model)
+
+    def get_fields(self, header):
+        fields = []
+        for column in header:
+            try:
+                fields.append(self.model._meta.get_field(column))
+            except LookupError:
+                raise ValueError(UNKNOWN_COLUMN_MESSAGE.format(
+                    file=self.path.name, column=column))
+        return fields
+
+    def build_objects(self, fields, rows):
+        objects = []
+        for row in rows:
+            values = {}
+            for field, value in zip(fields, row):
+                if value == '' and field.null:
+                    value = None
+                values[field.attname] = field.to_python(value)
+            objects.append(self.model(**values))
+        return self.complete_objects(objects)
+
+    def complete_objects(self, objects):
+        """Заполняет поля, которых нет в файле, но которые можно вывести."""
+        if self.model is Comment:
+            titles = dict(Review.objects.using(self.using).filter(
+                pk__in={comment.review_id for comment in objects},
+            ).values_list('pk', 'title_id'))
+            for comment in objects:
+                comment.title_id = titles.get(comment.review_id)
+        elif self.model is User:
+            for user in objects:
+                user.username_lower = user.username.lower()
+        return objects
+
+    def load(self, progress=None):
+        """Загружает файл и возвращает количество строк."""
+        loaded = 0
+        started = time.monotonic()
+        with open(self.path, encoding='utf-8', newline='') as csvfile:
+            reader = csv.reader(csvfile)
+            fields = self.get_fields(next(reader))
+            with preserve_auto_now(self.model):
+                for rows in chunked(reader, self.chunk_size):
+                    with transaction.atomic(using=self.using):
+                        self.model.objects.using(self.using).bulk_create(
+                            self.build_objects(fields, rows),
+                            batch_size=self.chunk_size,
+                            # Повторы связей жанров пропускаются
+                            # уникальным ограничением.
+                            ignore_conflicts=self.model is GenreTitle,
+                        )
+                    loaded += len(rows)
+                    if progress:
+                        progress(self.model, loaded,
+                                 time.monotonic() - started)
+        return loaded
+
+
+def reset_sequences(models, using):
+    connection = connections[using]
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+
+def get_tables(directory):
+    directory = Path(directory)
+    return {
+        get_model(table_name): directory / file_name
+        for file_name, table_name in DATA.items()
+        if (directory / file_name).exists()
+    }
+
+
+def get_rebuildable_indexes(model, connection):
+    """Неуникальные индексы модели, которые можно пересоздать по модели.
+
+    Возвращает словарь имя индекса -> SQL его создания.
+    """
+    with connection.schema_editor(atomic=False) as schema_editor:
+        statements = {
+            str(statement.parts['name']).strip(QUOTE_CHARACTERS): statement
+            for statement in schema_editor._model_indexes_sql(model)
+        }
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, model._meta.db_table)
+    return {
+        name: str(statements[name]) for name, info in constraints.items()
+        if info['index'] and not info['unique'] and not info['primary_key']
+        and name in statements
+    }
+
+
+@contextmanager
+def deferred_indexes(models, using):
+    """Удаляет неуникальные индексы на время загрузки и строит их заново.
+
+    Индексы пересоздаются и при ошибке загрузки, чтобы схема не
+    осталась без них.
+    """
+    connection = connections[using]
+    dropped = []
+    for model in models:
+        for name, create_sql in get_rebuildable_indexes(
+                model, connection).items():
+            with connection.schema_editor() as schema_editor:
+                schema_editor.execute(
+                    schema_editor._delete_index_sql(model, name))
+            dropped.append(create_sql)
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as schema_editor:
+            for create_sql in dropped:
+                schema_editor.execute(create_sql)
+
+
+def check_integrity(models, using):
+    """Проверяет внешние ключи загруженных таблиц."""
+    connections[using].check_constraints(
+        table_names=[model._meta.db_table for model in models])
+
+
+def finish_load(models, using):
+    """Приводит вспомогательные данные в соответствие с загруженными."""
+    reset_sequences(models, using)
+    if Review in models:
+        Title.objects.using(using).recalculate_ratings()
+    if Title in models:
+        get_search_backend(using).rebuild(Title)
+
+
+def load_table_in_worker(label, path, chunk_size, using):
+    model = apps.get_model(label)
+    started = time.monotonic()
+    rows = CSVTableLoader(model, path, chunk_size, using).load()
+    connections.close_all()
+    return label, rows, time.monotonic() - started
+
+
+def supports_parallel_load(using):
+    connection = connections[using]
+    return not (
+        connection.vendor == 'sqlite' and connection.is_in_memory_db())
+
+
+def load_level_in_pool(pool, level, tables, chunk_size, using, progress):
+    totals = {}
+    futures = [
+        pool.submit(
+            load_table_in_worker,
+            model._meta.label,
+            str(tables[model]),
+            chunk_size,
+            using,
+        )
+        for model in level
+    ]
+    for future in as_completed(futures):
+        label, rows, elapsed = future.result()
+        model = apps.get_model(label)
+        totals[model] = rows
+        if progress:
+            progress(model, rows, elapsed)
+    return totals
+
+
+def load_directory(directory, chunk_size=DEFAULT_CHUNK_SIZE, using=None,
+                   progress=None, workers=1, defer_indexes=False):
+    """Загружает CSV-файлы каталога в порядке зависимостей таблиц.
+
+    Таблицы одного уровня зависимостей при workers > 1 загружаются
+    параллельно в отдельных процессах. С defer_indexes неуникальные
+    индексы строятся один раз после загрузки, а не на каждую вставку.
+    """
+    tables = get_tables(directory)
+    using = using or router.db_for_write(Title)
+    if not supports_parallel_load(using):
+        workers = 1
+    totals = {}
+    with deferred_indexes(tables, using) if defer_indexes else nullcontext():
+        if workers > 1:
+            connections.close_all()
+            pool = ProcessPoolExecutor(
+                max_workers=workers, initializer=django.setup)
+        else:
+            pool = nullcontext()
+        with pool:
+            for level in get_load_levels(tables):
+                if workers > 1 and len(level) > 1:
+                    totals.update(load_level_in_pool(
+                        pool, level, tables, chunk_size, using, progress))
+                    continue
+                for model in level:
+                    totals[model] = CSVTableLoader(
+                        model, tables[model], chunk_size, using,
+                    ).load(progress)
+    check_integrity(list(tables), using)
+    finish_load(list(tables), using)
+    catalogue_changed.send(sender=Title)
+    return totals
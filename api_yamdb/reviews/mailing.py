@@ -0,0 +1,198 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import threading
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from .models import EMAIL_FAILED, EMAIL_PENDING, EMAIL_SENT, OutgoingEmail
+
+SYNC_MODE = 'sync'
+THREAD_MODE = 'thread'
+OUTBOX_MODE = 'outbox'
+DELIVERY_MODES = (SYNC_MODE, THREAD_MODE, OUTBOX_MODE)
+UNKNOWN_MODE_MESSAGE = (
+    'Неизвестный режим доставки писем EMAIL_DELIVERY_MODE={mode}. '
+    'Допустимые значения: {modes}.'
+)
+
+_executor = None
+_executor_lock = threading.Lock()
+_retry_timer = None
+_retry_at = None
+
+
+def get_retry_delay(attempts):
+    """Задержка перед следующей попыткой растёт вдвое с каждой неудачей."""
+    return timedelta(
+        seconds=settings.EMAIL_QUEUE_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.EMAIL_QUEUE_THREADS,
+                thread_name_prefix='email-queue',
+            )
+    return _executor
+
+
+def claim(emails, now):
+    """Забирает письма себе и возвращает те, что удалось забрать.
+
+    Каждое письмо помечается условным UPDATE: следующая попытка
+    переносится на EMAIL_QUEUE_CLAIM_TIMEOUT вперёд, только если её
+    время не изменилось с момента выборки. Из параллельных обработчиков
+    строку обновит только один, остальные получат 0 изменённых строк и
+    письмо пропустят. Если обработчик упадёт, не отправив письмо, оно
+    снова станет доступным после таймаута.
+    """
+    lease_until = now + timedelta(seconds=settings.EMAIL_QUEUE_CLAIM_TIMEOUT)
+    claimed = []
+    for email in emails:
+        if OutgoingEmail.objects.filter(
+            pk=email.pk,
+            status=EMAIL_PENDING,
+            next_attempt_at=email.next_attempt_at,
+        ).update(next_attempt_at=lease_until):
+            email.next_attempt_at = lease_until
+            claimed.append(email)
+    return claimed
+
+
+def claim_due_emails(batch_size, now):
+    """Выбирает и забирает письма, время отправки которых подошло."""
+    return claim(
+        OutgoingEmail.objects.filter(
+            status=EMAIL_PENDING, next_attempt_at__lte=now)[:batch_size],
+        now,
+    )
+
+
+def postpone(email, error, now):
+    email.last_error = repr(error)
+    if email.attempts >= settings.EMAIL_QUEUE_MAX_ATTEMPTS:
+        email.status = EMAIL_FAILED
+    else:
+        email.next_attempt_at = now + get_retry_delay(email.attempts)
+
+
+def send_emails(emails, now=None):
+    """Отправляет письма через одно соединение с почтовым сервером.
+
+    Возвращает количество отправленных и отложенных писем.
+    """
+    now = now or timezone.now()
+    sent, postponed = [], []
+    mail_connection = get_connection()
+    try:
+        mail_connection.open()
+    except Exception as error:
+        for email in emails:
+            email.attempts += 1
+            postpone(email, error, now)
+        postponed = emails
+    else:
+        for email in emails:
+            email.attempts += 1
+            try:
+                EmailMessage(
+                    subject=email.subject,
+                    body=email.message,
+                    from_email=email.from_email,
+                    to=email.recipients,
+                    connection=mail_connection,
+                ).send()
+            except Exception as error:
+                postpone(email, error, now)
+                postponed.append(email)
+            else:
+                email.status = EMAIL_SENT
+                email.sent_at = now
+                email.last_error = ''
+                sent.append(email)
+        mail_connection.close()
+    OutgoingEmail.objects.bulk_update(
+        emails,
+        ('status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'),
+    )
+    return len(sent), len(postponed)
+
+
+def deliver_pending(batch_size=None):
+    """Отправляет одну пачку писем из очереди.
+
+    Письма забираются отдельными короткими запросами, а отправка идёт
+    вне транзакции и не держит блокировок во время работы с SMTP.
+    """
+    now = timezone.now()
+    emails = claim_due_emails(
+        batch_size or settings.EMAIL_QUEUE_BATCH_SIZE, now)
+    if not emails:
+        return 0, 0
+    return send_emails(emails, now)
+
+
+def schedule_retry():
+    """Запускает доставку ко времени ближайшей отложенной попытки.
+
+    В режиме thread повторы не ждут следующей регистрации: таймер
+    процесса будит пул к сроку самого раннего письма в очереди.
+    """
+    global _retry_timer, _retry_at
+    due = OutgoingEmail.objects.filter(status=EMAIL_PENDING).aggregate(
+        due=Min('next_attempt_at'))['due']
+    if due is None:
+        return
+    with _executor_lock:
+        if (
+            _retry_timer is not None and _retry_timer.is_alive()
+            and _retry_at <= due
+        ):
+            return
+        if _retry_timer is not None:
+            _retry_timer.cancel()
+        delay = max((due - timezone.now()).total_seconds(), 0)
+        _retry_timer = threading.Timer(
+            delay, lambda: get_executor().submit(_deliver_in_thread))
+        _retry_timer.daemon = True
+        _retry_at = due
+        _retry_timer.start()
+
+
+def _deliver_in_thread():
+    try:
+        while any(deliver_pending()):
+            pass
+        schedule_retry()
+    finally:
+        connection.close()
+
+
+def queue_mail(subject, message, from_email, recipient_list):
+    """Сохраняет письмо в очередь и запускает доставку по настройкам.
+
+    sync — отправка в текущем запросе, thread — в пуле потоков после
+    фиксации транзакции, outbox — командой send_queued_mail.
+    """
+    mode = settings.EMAIL_DELIVERY_MODE
+    if mode not in DELIVERY_MODES:
+        raise ValueError(UNKNOWN_MODE_MESSAGE.format(
+            mode=mode, modes=', '.join(DELIVERY_MODES)))
+    email = OutgoingEmail.objects.create(
+        subject=subject,
+        message=message,
+        from_email=from_email,
+        recipients=list(recipient_list),
+    )
+    if mode == SYNC_MODE:
+        send_emails(claim([email], timezone.now()))
+    elif mode == THREAD_MODE:
+        transaction.on_commit(
+            lambda: get_executor().submit(_deliver_in_thread))
+    return email
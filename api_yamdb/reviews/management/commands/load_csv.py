@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from reviews.loader import DEFAULT_CHUNK_SIZE, load_directory
+
+PROGRESS = '{table}: {rows} строк, {speed:.0f} строк/с'
+
+
+class Command(BaseCommand):
+    help = 'Загружает CSV-файлы каталога в базу данных пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=settings.BASE_DIR / 'static' / 'data',
+            help='Каталог с CSV-файлами.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Сколько строк вставлять в одной транзакции.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Сколько таблиц одного уровня загружать параллельно.',
+        )
+        parser.add_argument(
+            '--defer-indexes',
+            action='store_true',
+            help='Строить неуникальные индексы после загрузки.',
+        )
+        parser.add_argument(
+            '--database',
+            default=None,
+            help='Псевдоним базы данных, по умолчанию по роутеру.',
+        )
+
+    def progress(self, model, rows, elapsed):
+        self.stdout.write(PROGRESS.format(
+            table=model._meta.db_table,
+            rows=rows,
+            speed=rows / elapsed if elapsed else 0,
+        ))
+
+    def handle(self, *args, **options):
+        totals = load_directory(
+            options['path'],
+            chunk_size=options['chunk_size'],
+            using=options['database'],
+            progress=self.progress,
+            workers=options['workers'],
+            defer_indexes=options['defer_indexes'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено строк: {sum(totals.values())}'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from reviews.models import Title
+from reviews.signals import catalogue_changed
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сумму, количество и среднее оценок произведений.'
+
+    def handle(self, *args, **options):
+        updated = Title.objects.recalculate_ratings()
+        catalogue_changed.send(sender=Title)
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинг пересчитан для произведений: {updated}'))
@@ -0,0 +1,47 @@
+from django.db import migrations
+
+# DDL и заполнение индекса скопированы из reviews.search на момент этой
+# миграции, чтобы последующие изменения модуля её не меняли.
+SQLITE_FORWARD = (
+    'CREATE VIRTUAL TABLE reviews_title_search USING fts5('
+    "name, description, tokenize='unicode61 remove_diacritics 2')",
+    'INSERT INTO reviews_title_search (rowid, name, description) '
+    'SELECT id, name, description FROM reviews_title',
+)
+POSTGRESQL_FORWARD = (
+    'CREATE TABLE reviews_title_search ('
+    'title_id integer PRIMARY KEY, document tsvector NOT NULL)',
+    'CREATE INDEX reviews_title_search_document_idx '
+    'ON reviews_title_search USING GIN (document)',
+    'INSERT INTO reviews_title_search (title_id, document) '
+    "SELECT id, setweight(to_tsvector('simple', name), 'A') || "
+    "setweight(to_tsvector('simple', description), 'B') "
+    'FROM reviews_title',
+)
+FORWARD = {
+    'sqlite': SQLITE_FORWARD,
+    'postgresql': POSTGRESQL_FORWARD,
+}
+BACKWARD = ('DROP TABLE IF EXISTS reviews_title_search',)
+
+
+def run(statements):
+    def execute(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        for statement in statements.get(vendor, ()):
+            schema_editor.execute(statement)
+    return execute
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_query_shape_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run(FORWARD),
+            run({vendor: BACKWARD for vendor in FORWARD}),
+        ),
+    ]
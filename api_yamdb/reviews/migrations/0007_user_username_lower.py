@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def fill_username_lower(apps, schema_editor):
+    User = apps.get_model('reviews', 'User')
+    users = User.objects.using(schema_editor.connection.alias)
+    changed = []
+    for user in users.only('username').iterator(chunk_size=BATCH_SIZE):
+        user.username_lower = user.username.lower()
+        changed.append(user)
+    users.bulk_update(changed, ('username_lower',), batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='username_lower',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=150, verbose_name='Имя пользователя в нижнем регистре'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_username_lower, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 3.2 on 2026-10-17 06:48
+
+from django.db import migrations, models
+import django.db.models.expressions
+import reviews.indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_genretitle_unique'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='title',
+            name='title_rating_idx',
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year', 'name', 'id'], name='title_year_asc_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=reviews.indexes.NullsOrderIndex(django.db.models.expressions.OrderBy(django.db.models.expressions.F('rating'), nulls_first=True), django.db.models.expressions.OrderBy(django.db.models.expressions.F('id')), name='title_rating_idx'),
+        ),
+    ]
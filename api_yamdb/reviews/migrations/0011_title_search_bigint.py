@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+def widen_title_id(apps, schema_editor):
+    # Title.id — BigAutoField, на SQLite rowid и так 64-битный.
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'ALTER TABLE reviews_title_search '
+            'ALTER COLUMN title_id TYPE bigint')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_title_ordering_nulls'),
+    ]
+
+    operations = [
+        migrations.RunPython(widen_title_id, migrations.RunPython.noop),
+    ]
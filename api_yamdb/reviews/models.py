@@ -1,8 +1,14 @@
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models import (
+    Avg, Case, Count, F, FloatField, OuterRef, Subquery, Sum, When,
+)
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
 
+from .indexes import NullsOrderIndex
 from .validators import validate_year
 
 ADMIN = 'admin'
@@ -32,6 +38,9 @@ REVIEW = ('{content_str}'
           'Оценка: {score:.15}')
 GENRETITLE = ('Жанр: {genre:.15}. '
               'Произведение: {title:.15}. ')
+OUTGOING_EMAIL = ('Письмо: {subject:.30}. '
+                  'Получатели: {recipients:.30}. '
+                  'Статус: {status}')
 MIN_SCORE = 1
 MAX_SCORE = 10
 LENGTH_LIMITS_USER_FIELDS = 150
@@ -46,7 +55,16 @@ MODELS_LOCALISATIONS = {
     'title': ('Произведение', 'Произведения'),
     'review': ('Обзор', 'Обзоры'),
     'comment': ('Комментарий', 'Комментарии'),
+    'outgoing_email': ('Исходящее письмо', 'Исходящие письма'),
 }
+EMAIL_PENDING = 'pending'
+EMAIL_SENT = 'sent'
+EMAIL_FAILED = 'failed'
+EMAIL_STATUS_CHOICE = (
+    (EMAIL_PENDING, 'Ожидает отправки'),
+    (EMAIL_SENT, 'Отправлено'),
+    (EMAIL_FAILED, 'Не доставлено'),
+)
 
 
 class User(AbstractUser):
@@ -57,6 +75,12 @@ class User(AbstractUser):
         max_length=LENGTH_LIMITS_USER_FIELDS,
         unique=True,
     )
+    username_lower = models.CharField(
+        'Имя пользователя в нижнем регистре',
+        max_length=LENGTH_LIMITS_USER_FIELDS,
+        db_index=True,
+        editable=False,
+    )
     email = models.EmailField(
         db_index=True,
         max_length=LENGTH_LIMITS_USER_EMAIL,
@@ -94,6 +118,15 @@ class User(AbstractUser):
     def is_user(self):
         return self.role == USER
 
+    def save(self, *args, **kwargs):
+        # Колонка для поиска по префиксу без учёта регистра:
+        # условие по диапазону использует обычный индекс.
+        self.username_lower = self.username.lower()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'username' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'username_lower'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.username
 
@@ -119,6 +152,9 @@ class GenreCategoryAbstractModel(models.Model):
     class Meta:
         abstract = True
         ordering = ('name',)
+        indexes = (
+            models.Index(fields=('name',), name='%(class)s_name_idx'),
+        )
 
 
 class Genre(GenreCategoryAbstractModel):
@@ -137,6 +173,48 @@ class Category(GenreCategoryAbstractModel):
         verbose_name_plural = MODELS_LOCALISATIONS['category'][1]
 
 
+class TitleQuerySet(models.QuerySet):
+    """Операции над хранимыми агрегатами оценок произведений."""
+
+    def apply_review_delta(self, score_delta, count_delta):
+        """Сдвигает сумму и число оценок одним UPDATE.
+
+        Выражения в SET ссылаются на значения строки до обновления,
+        поэтому средняя оценка пересчитывается в том же запросе.
+        """
+        review_count = F('review_count') + count_delta
+        return self.update(
+            score_sum=F('score_sum') + score_delta,
+            review_count=review_count,
+            rating=Case(
+                When(
+                    review_count__gt=-count_delta,
+                    then=(Cast(F('score_sum') + score_delta, FloatField())
+                          / review_count),
+                ),
+                default=None,
+                output_field=FloatField(),
+            ),
+        )
+
+    def recalculate_ratings(self):
+        """Полностью пересчитывает агрегаты оценок по таблице отзывов."""
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')).order_by().values('title')
+        return self.update(
+            score_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0,
+            ),
+            review_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('pk')).values('total')),
+                0,
+            ),
+            rating=Subquery(
+                reviews.annotate(average=Avg('score')).values('average')),
+        )
+
+
 class Title(models.Model):
     """Модель произведений."""
 
@@ -152,6 +230,14 @@ class Title(models.Model):
         blank=True,
         related_name='titles',
     )
+    score_sum = models.PositiveIntegerField(
+        'Сумма оценок', default=0, editable=False)
+    review_count = models.PositiveIntegerField(
+        'Количество отзывов', default=0, editable=False)
+    rating = models.FloatField(
+        'Рейтинг', null=True, blank=True, editable=False)
+
+    objects = TitleQuerySet.as_manager()
 
     def __str__(self):
         return TITLE.format(
@@ -166,6 +252,27 @@ class Title(models.Model):
         ordering = ('-year', 'name')
         verbose_name = MODELS_LOCALISATIONS['title'][0]
         verbose_name_plural = MODELS_LOCALISATIONS['title'][1]
+        indexes = (
+            models.Index(
+                fields=('-year', 'name', 'id'), name='title_year_name_idx'),
+            models.Index(
+                fields=('category', '-year', 'name'),
+                name='title_category_year_name_idx',
+            ),
+            models.Index(fields=('name', 'id'), name='title_name_idx'),
+            models.Index(
+                fields=('year', 'name', 'id'),
+                name='title_year_asc_name_idx',
+            ),
+            NullsOrderIndex(
+                F('rating').asc(nulls_first=True), F('id').asc(),
+                name='title_rating_idx',
+            ),
+            models.Index(
+                fields=('review_count', 'id'),
+                name='title_review_count_idx',
+            ),
+        )
 
 
 class ContentAbstractModel(models.Model):
@@ -205,6 +312,12 @@ class Review(ContentAbstractModel):
     class Meta(ContentAbstractModel.Meta):
         verbose_name = MODELS_LOCALISATIONS['review'][0]
         verbose_name_plural = MODELS_LOCALISATIONS['review'][1]
+        indexes = (
+            models.Index(
+                fields=('title', '-pub_date', '-id'),
+                name='review_title_pub_date_idx',
+            ),
+        )
         constraints = (
             models.UniqueConstraint(
                 fields=('title', 'author',),
@@ -212,6 +325,28 @@ class Review(ContentAbstractModel):
             ),
         )
 
+    _loaded_score = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        review = super().from_db(db, field_names, values)
+        review._loaded_score = dict(zip(field_names, values)).get('score')
+        return review
+
+    def save(self, *args, **kwargs):
+        # Агрегаты произведения обновляются в post_save,
+        # поэтому запись отзыва и пересчёт идут одной транзакцией.
+        using = kwargs.get('using') or router.db_for_write(
+            type(self), instance=self)
+        with transaction.atomic(using=using):
+            if not self._state.adding:
+                # Прежняя оценка читается под блокировкой строки: значение
+                # из get_object могло устареть из-за параллельного изменения.
+                self._loaded_score = type(self).objects.using(
+                    using).select_for_update().filter(
+                    pk=self.pk).values_list('score', flat=True).first()
+            super().save(*args, **kwargs)
+
     def __str__(self):
         return REVIEW.format(
             content_str=super().__str__(),
@@ -228,6 +363,12 @@ class Comment(ContentAbstractModel):
     class Meta(ContentAbstractModel.Meta):
         verbose_name = MODELS_LOCALISATIONS['comment'][0]
         verbose_name_plural = MODELS_LOCALISATIONS['comment'][1]
+        indexes = (
+            models.Index(
+                fields=('review', '-pub_date', '-id'),
+                name='comment_review_pub_date_idx',
+            ),
+        )
 
     def __str__(self):
         return COMMENT.format(
@@ -235,12 +376,106 @@ class Comment(ContentAbstractModel):
             comment=self.text[:30])
 
 
+class GenreTitleQuerySet(models.QuerySet):
+    """Запись связей произведений с жанрами."""
+
+    def set_genres(self, genres, replace=True):
+        """Приводит жанры произведений к заданным в словаре.
+
+        genres сопоставляет произведению его жанры. С replace текущие
+        связи этих произведений читаются одним запросом, лишние удаляются
+        одним DELETE, недостающие вставляются одним bulk_create; без
+        replace, для новых произведений, только вставляются. Совпавшие
+        связи не трогаются, повторы пропускаются уникальным ограничением.
+        """
+        wanted = dict.fromkeys(
+            (title.pk, genre.pk)
+            for title, title_genres in genres.items()
+            for genre in title_genres
+        )
+        existing = {}
+        if replace:
+            existing = {
+                (title_id, genre_id): pk
+                for pk, title_id, genre_id in self.filter(
+                    title__in=list(genres),
+                ).values_list('pk', 'title_id', 'genre_id')
+            }
+            removed = [
+                pk for pair, pk in existing.items() if pair not in wanted]
+            if removed:
+                self.filter(pk__in=removed).delete()
+        return self.bulk_create(
+            [
+                self.model(title_id=title_id, genre_id=genre_id)
+                for title_id, genre_id in wanted if (
+                    title_id, genre_id) not in existing
+            ],
+            ignore_conflicts=True,
+        )
+
+
 class GenreTitle(models.Model):
-    genre = models.ForeignKey(Genre, on_delete=models.CASCADE)
-    title = models.ForeignKey(Title, on_delete=models.CASCADE)
+    # Одиночные индексы внешних ключей покрываются составными ниже.
+    genre = models.ForeignKey(
+        Genre, on_delete=models.CASCADE, db_index=False)
+    title = models.ForeignKey(
+        Title, on_delete=models.CASCADE, db_index=False)
+
+    objects = GenreTitleQuerySet.as_manager()
+
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=('genre', 'title'), name='genretitle_genre_title_idx'),
+        )
+        constraints = (
+            models.UniqueConstraint(
+                fields=('title', 'genre'), name='unique_title_genre'),
+        )
 
     def __str__(self):
         return GENRETITLE.format(
             genre=self.genre,
             title=self.title
         )
+
+
+class OutgoingEmail(models.Model):
+    """Очередь исходящих писем."""
+
+    subject = models.CharField('Тема', max_length=LENGTH_LIMITS_OBJECT_NAME)
+    message = models.TextField('Текст')
+    from_email = models.EmailField(
+        'Отправитель', max_length=LENGTH_LIMITS_USER_EMAIL)
+    recipients = models.JSONField('Получатели')
+    status = models.CharField(
+        'Статус',
+        max_length=max(len(status) for status, _ in EMAIL_STATUS_CHOICE),
+        choices=EMAIL_STATUS_CHOICE,
+        default=EMAIL_PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    next_attempt_at = models.DateTimeField(
+        'Следующая попытка', default=timezone.now)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created_at = models.DateTimeField('Создано', auto_now_add=True)
+    sent_at = models.DateTimeField('Отправлено', null=True, blank=True)
+
+    class Meta:
+        ordering = ('next_attempt_at', 'id')
+        verbose_name = MODELS_LOCALISATIONS['outgoing_email'][0]
+        verbose_name_plural = MODELS_LOCALISATIONS['outgoing_email'][1]
+        indexes = (
+            models.Index(
+                fields=('status', 'next_attempt_at'),
+                name='outgoing_email_due_idx',
+            ),
+        )
+
+    def __str__(self):
+        return OUTGOING_EMAIL.format(
+            subject=self.subject,
+            recipients=', '.join(self.recipients),
+            status=self.status,
+        )
@@ -0,0 +1,202 @@
+import re
+
+from django.db import connections
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+SEARCH_TABLE = 'reviews_title_search'
+TOKEN = re.compile(r'\w+')
+# Совпадение в названии весит больше совпадения в описании.
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+POSTGRESQL_CONFIG = 'simple'
+# Веса ts_rank для меток D, C, B, A: описание (B) и название (A).
+POSTGRESQL_WEIGHTS = f'{{0, 0, {DESCRIPTION_WEIGHT / NAME_WEIGHT}, 1}}'
+
+
+def get_tokens(query):
+    return TOKEN.findall(query.lower())
+
+
+class SearchBackend:
+    """Поиск без инвертированного индекса для прочих СУБД.
+
+    Каждое слово запроса ищется через LIKE в названии или описании,
+    результаты не ранжируются.
+    """
+
+    create_statements = ()
+    drop_statements = ()
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, statements):
+        with self.connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+    def create(self):
+        self.execute(self.create_statements)
+
+    def drop(self):
+        self.execute(self.drop_statements)
+
+    def index(self, titles):
+        """Добавляет или обновляет произведения в индексе."""
+
+    def remove(self, title_ids):
+        """Удаляет произведения из индекса."""
+
+    def rebuild(self, model):
+        """Строит индекс заново по таблице произведений."""
+
+    def search(self, queryset, tokens):
+        condition = Q()
+        for token in tokens:
+            condition &= (
+                Q(name__icontains=token) | Q(description__icontains=token))
+        return queryset.filter(condition).annotate(
+            search_rank=Value(0.0, output_field=FloatField()))
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """Полнотекстовый индекс FTS5, ранжирование по BM25."""
+
+    create_statements = (
+        f'CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5('
+        f"name, description, tokenize='unicode61 remove_diacritics 2')",
+    )
+    drop_statements = (f'DROP TABLE IF EXISTS {SEARCH_TABLE}',)
+
+    def remove(self, title_ids):
+        title_ids = list(title_ids)
+        if not title_ids:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {SEARCH_TABLE} WHERE rowid IN '
+                f'({", ".join(["%s"] * len(title_ids))})',
+                title_ids,
+            )
+
+    def index(self, titles):
+        self.remove(title.pk for title in titles)
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {SEARCH_TABLE} (rowid, name, description) '
+                'VALUES (%s, %s, %s)',
+                [(title.pk, title.name, title.description)
+                 for title in titles],
+            )
+
+    def rebuild(self, model):
+        self.execute((
+            f'DELETE FROM {SEARCH_TABLE}',
+            f'INSERT INTO {SEARCH_TABLE} (rowid, name, description) '
+            f'SELECT id, name, description FROM {model._meta.db_table}',
+        ))
+
+    def search(self, queryset, tokens):
+        # Слова в кавычках не разбираются как синтаксис FTS5,
+        # звёздочка включает поиск по префиксу.
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        table = queryset.model._meta.db_table
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {SEARCH_TABLE} '
+            f'WHERE {SEARCH_TABLE} MATCH %s',
+            (match,),
+        )).annotate(search_rank=RawSQL(
+            f'SELECT -bm25({SEARCH_TABLE}, {NAME_WEIGHT}, '
+            f'{DESCRIPTION_WEIGHT}) FROM {SEARCH_TABLE} '
+            f'WHERE {SEARCH_TABLE} MATCH %s AND rowid = "{table}"."id"',
+            (match,),
+            output_field=FloatField(),
+        ))
+
+
+class PostgreSQLSearchBackend(SearchBackend):
+    """Индекс tsvector с GIN, ранжирование через ts_rank."""
+
+    document = (
+        f"setweight(to_tsvector('{POSTGRESQL_CONFIG}', {{name}}), 'A') || "
+        f"setweight(to_tsvector('{POSTGRESQL_CONFIG}', {{description}}), 'B')"
+    )
+    create_statements = (
+        f'CREATE TABLE {SEARCH_TABLE} ('
+        'title_id bigint PRIMARY KEY, document tsvector NOT NULL)',
+        f'CREATE INDEX {SEARCH_TABLE}_document_idx '
+        f'ON {SEARCH_TABLE} USING GIN (document)',
+    )
+    drop_statements = (f'DROP TABLE IF EXISTS {SEARCH_TABLE}',)
+
+    def remove(self, title_ids):
+        title_ids = list(title_ids)
+        if not title_ids:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {SEARCH_TABLE} WHERE title_id = ANY(%s)',
+                (title_ids,),
+            )
+
+    def index(self, titles):
+        document = self.document.format(name='%s', description='%s')
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {SEARCH_TABLE} (title_id, document) '
+                f'VALUES (%s, {document}) '
+                'ON CONFLICT (title_id) DO UPDATE '
+                'SET document = EXCLUDED.document',
+                [(title.pk, title.name, title.description)
+                 for title in titles],
+            )
+
+    def rebuild(self, model):
+        document = self.document.format(
+            name='name', description='description')
+        self.execute((
+            f'DELETE FROM {SEARCH_TABLE}',
+            f'INSERT INTO {SEARCH_TABLE} (title_id, document) '
+            f'SELECT id, {document} FROM {model._meta.db_table}',
+        ))
+
+    def search(self, queryset, tokens):
+        query = ' & '.join(f'{token}:*' for token in tokens)
+        table = queryset.model._meta.db_table
+        ts_query = f"to_tsquery('{POSTGRESQL_CONFIG}', %s)"
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT title_id FROM {SEARCH_TABLE} '
+            f'WHERE document @@ {ts_query}',
+            (query,),
+        )).annotate(search_rank=RawSQL(
+            f"SELECT ts_rank('{POSTGRESQL_WEIGHTS}', document, {ts_query}) "
+            f'FROM {SEARCH_TABLE} WHERE title_id = "{table}"."id"',
+            (query,),
+            output_field=FloatField(),
+        ))
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgreSQLSearchBackend,
+}
+
+
+def get_search_backend(using):
+    connection = connections[using]
+    return BACKENDS.get(connection.vendor, SearchBackend)(connection)
+
+
+def search_titles(queryset, query):
+    """Отбирает произведения по словам запроса, лучшие совпадения первыми.
+
+    Слова ищутся по префиксу в названии и описании; при равном ранге
+    сохраняется исходный порядок выборки.
+    """
+    tokens = get_tokens(query)
+    if not tokens:
+        return queryset
+    ordering = queryset.query.order_by or queryset.model._meta.ordering
+    return get_search_backend(queryset.db).search(
+        queryset, tokens).order_by('-search_rank', *ordering)
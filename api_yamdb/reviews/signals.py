@@ -0,0 +1,44 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .models import Review, Title
+from .search import get_search_backend
+
+SEARCH_FIELDS = {'name', 'description'}
+
+# Отправляется после массовых изменений каталога в обход сигналов моделей.
+catalogue_changed = Signal()
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_review_save(sender, instance, created,
+                                 update_fields, **kwargs):
+    titles = Title.objects.filter(pk=instance.title_id)
+    if update_fields is not None and 'score' not in update_fields:
+        return
+    if created:
+        titles.apply_review_delta(instance.score, 1)
+    elif instance._loaded_score is None:
+        titles.recalculate_ratings()
+    elif instance.score != instance._loaded_score:
+        titles.apply_review_delta(
+            instance.score - instance._loaded_score, 0)
+    instance._loaded_score = instance.score
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_review_delete(sender, instance, **kwargs):
+    Title.objects.filter(pk=instance.title_id).apply_review_delta(
+        -instance.score, -1)
+
+
+@receiver(post_save, sender=Title)
+def update_search_index_on_title_save(sender, instance, update_fields,
+                                      using, **kwargs):
+    if update_fields is None or SEARCH_FIELDS & set(update_fields):
+        get_search_backend(using).index([instance])
+
+
+@receiver(post_delete, sender=Title)
+def update_search_index_on_title_delete(sender, instance, using, **kwargs):
+    get_search_backend(using).remove([instance.pk])
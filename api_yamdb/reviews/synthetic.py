@@ -0,0 +1,163 @@
+from datetime import timedelta
+import random
+
+from django.db import router, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .loader import finish_load, preserve_auto_now
+from .models import (
+    ADMIN,
+    MAX_SCORE,
+    MIN_SCORE,
+    USER,
+    Category,
+    Comment,
+    Genre,
+    GenreTitle,
+    Review,
+    Title,
+    User,
+)
+from .signals import catalogue_changed
+
+DEFAULT_SIZES = {
+    'users': 50,
+    'categories': 5,
+    'genres': 20,
+    'titles': 200,
+    'genres_per_title': 2,
+    'reviews_per_title': 5,
+    'comments_per_review': 2,
+}
+BATCH_SIZE = 1000
+TOO_MANY_REVIEWS_MESSAGE = (
+    'Отзывов на произведение ({reviews}) не может быть больше, чем '
+    'пользователей ({users}): один автор пишет один отзыв.'
+)
+WORDS = (
+    'драма', 'сюжет', 'герой', 'финал', 'музыка', 'роман', 'история',
+    'автор', 'сцена', 'жанр', 'образ', 'эпоха', 'мир', 'судьба', 'время',
+)
+
+
+class IdSequence:
+    """Выдаёт первичные ключи до вставки, не полагаясь на RETURNING."""
+
+    def __init__(self, model, using):
+        self.next_id = (model.objects.using(using).aggregate(
+            last=Max('pk'))['last'] or 0) + 1
+
+    def __call__(self):
+        self.next_id += 1
+        return self.next_id - 1
+
+
+def make_text(generator, words):
+    return ' '.join(generator.choice(WORDS) for _ in range(words))
+
+
+def generate_dataset(seed=0, using=None, **sizes):
+    """Создаёт синтетический каталог заданного размера.
+
+    Размеры передаются именованными аргументами, незаданные берутся из
+    DEFAULT_SIZES. Возвращает словарь созданных первичных ключей по
+    сущностям.
+    """
+    sizes = {**DEFAULT_SIZES, **sizes}
+    if sizes['reviews_per_title'] > sizes['users']:
+        raise ValueError(TOO_MANY_REVIEWS_MESSAGE.format(
+            reviews=sizes['reviews_per_title'], users=sizes['users']))
+    using = using or router.db_for_write(Title)
+    generator = random.Random(seed)
+    now = timezone.now()
+    created = {}
+
+    def bulk_create(model, objects):
+        model.objects.using(using).bulk_create(
+            objects, batch_size=BATCH_SIZE)
+        created[model._meta.model_name] = [obj.pk for obj in objects]
+        return objects
+
+    with transaction.atomic(using=using):
+        next_id = IdSequence(User, using)
+        users = bulk_create(User, [
+            User(
+                id=next_id(),
+                username=f'user{number}_{seed}',
+                username_lower=f'user{number}_{seed}',
+                email=f'user{number}_{seed}@yamdb.fake',
+                role=ADMIN if number == 0 else USER,
+                bio=make_text(generator, 5),
+            )
+            for number in range(sizes['users'])
+        ])
+        next_id = IdSequence(Category, using)
+        categories = bulk_create(Category, [
+            Category(
+                id=next_id(),
+                name=f'Категория {number}',
+                slug=f'category-{number}-{seed}',
+            )
+            for number in range(sizes['categories'])
+        ])
+        next_id = IdSequence(Genre, using)
+        genres = bulk_create(Genre, [
+            Genre(
+                id=next_id(),
+                name=f'Жанр {number}',
+                slug=f'genre-{number}-{seed}',
+            )
+            for number in range(sizes['genres'])
+        ])
+        next_id = IdSequence(Title, using)
+        titles = bulk_create(Title, [
+            Title(
+                id=next_id(),
+                name=f'Произведение {number} {make_text(generator, 2)}',
+                year=generator.randint(1900, now.year),
+                description=make_text(generator, 20),
+                category=(
+                    generator.choice(categories) if categories else None),
+            )
+            for number in range(sizes['titles'])
+        ])
+        genres_per_title = min(sizes['genres_per_title'], len(genres))
+        next_id = IdSequence(GenreTitle, using)
+        bulk_create(GenreTitle, [
+            GenreTitle(id=next_id(), title=title, genre=genre)
+            for title in titles
+            for genre in generator.sample(genres, genres_per_title)
+        ])
+        next_id = IdSequence(Review, using)
+        with preserve_auto_now(Review):
+            reviews = bulk_create(Review, [
+                Review(
+                    id=next_id(),
+                    title=title,
+                    author=author,
+                    text=make_text(generator, 30),
+                    score=generator.randint(MIN_SCORE, MAX_SCORE),
+                    pub_date=now - timedelta(
+                        minutes=generator.randint(0, 10 ** 5)),
+                )
+                for title in titles
+                for author in generator.sample(
+                    users, sizes['reviews_per_title'])
+            ])
+        next_id = IdSequence(Comment, using)
+        bulk_create(Comment, [
+            Comment(
+                id=next_id(),
+                title_id=review.title_id,
+                review=review,
+                author=generator.choice(users),
+                text=make_text(generator, 10),
+            )
+            for review in reviews
+            for _ in range(sizes['comments_per_review'])
+        ])
+        finish_load(
+            [User, Category, Genre, Title, GenreTitle, Review, Comment], using)
+    catalogue_changed.send(sender=Title)
+    return created
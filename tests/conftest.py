@@ -1,6 +1,8 @@
 import os
 import sys
 
+import pytest
+from django.core.cache import cache
 from django.utils.version import get_version
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -33,3 +35,21 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 pytest_plugins = [
     'tests.fixtures.fixture_user',
 ]
+
+
+@pytest.fixture(autouse=True)
+def email_delivery_mode(settings):
+    settings.EMAIL_DELIVERY_MODE = 'sync'
+
+
+@pytest.fixture(autouse=True)
+def shared_cache(settings):
+    # Тесты идут в одном процессе, кэш в памяти для них общий.
+    settings.CACHE_SHARED = True
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
@@ -0,0 +1,93 @@
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        return client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        ).json()['rating']
+
+    def test_01_rating_follows_review_writes(self, admin_client, user_client,
+                                             moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+
+        create_single_review(admin_client, title_id, 'Неплохо', 4)
+        review = create_single_review(
+            user_client, title_id, 'Отлично', 10).json()
+        assert self.get_rating(admin_client, title_id) == 7, (
+            'Проверьте, что после создания отзывов рейтинг произведения '
+            'равен средней оценке.'
+        )
+
+        user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review['id']),
+            data={'score': 8}
+        )
+        assert self.get_rating(admin_client, title_id) == 6, (
+            'Проверьте, что изменение оценки пересчитывает рейтинг '
+            'произведения.'
+        )
+
+        moderator_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review['id'])
+        )
+        title = Title.objects.get(pk=title_id)
+        assert (title.review_count, title.score_sum) == (1, 4), (
+            'Проверьте, что удаление отзыва уменьшает количество и сумму '
+            'оценок произведения.'
+        )
+        assert self.get_rating(admin_client, title_id) == 4, (
+            'Проверьте, что удаление отзыва пересчитывает рейтинг '
+            'произведения.'
+        )
+
+    def test_02_recalculate_ratings_command(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Хорошо', 6)
+        Title.objects.update(score_sum=0, review_count=0, rating=None)
+
+        call_command('recalculate_ratings')
+
+        title = Title.objects.get(pk=title_id)
+        assert (title.review_count, title.score_sum, title.rating) == (
+            1, 6, 6
+        ), (
+            'Проверьте, что команда `recalculate_ratings` восстанавливает '
+            'агрегаты оценок по таблице отзывов.'
+        )
+        assert Title.objects.get(pk=titles[1]['id']).rating is None, (
+            'Проверьте, что рейтинг произведения без отзывов равен `None`.'
+        )
+
+    def test_03_concurrent_updates_do_not_drift(self, admin_client,
+                                                user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review_id = create_single_review(
+            user_client, title_id, 'Неплохо', 5).json()['id']
+        first = Review.objects.get(pk=review_id)
+        second = Review.objects.get(pk=review_id)
+        first.score = 7
+        first.save()
+        second.score = 9
+        second.save()
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_sum, title.rating) == (9, 9), (
+            'Проверьте, что изменение оценки считается от значения в базе, '
+            'а не от прочитанного раньше параллельным запросом.'
+        )
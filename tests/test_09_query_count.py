@@ -0,0 +1,114 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review, Title, User
+from tests.utils import (
+    count_queries, count_selects_from, create_catalogue,
+    create_single_comment, create_single_review, create_titles
+)
+
+TITLES_QUERY_LIMIT = 4
+# Родитель, COUNT(*) для пагинации и страница вместе с авторами.
+CONTENT_QUERY_LIMIT = 3
+
+
+def create_discussion(size):
+    """Произведение с size отзывами и комментариями разных авторов."""
+    create_catalogue(1)
+    title = Title.objects.get()
+    authors = [
+        User.objects.create(username=f'author{idx}',
+                            email=f'author{idx}@yamdb.fake')
+        for idx in range(size)
+    ]
+    reviews = [
+        Review.objects.create(
+            title=title, author=author, text='Отзыв', score=5)
+        for author in authors
+    ]
+    for author in authors:
+        Comment.objects.create(
+            title=title, review=reviews[0], author=author, text='Да')
+    return title, reviews[0]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryCount:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.mark.parametrize('size', (1, 5, 20))
+    def test_01_titles_list_query_count(self, client, size):
+        create_catalogue(size)
+        queries = count_queries(client, self.TITLES_URL)
+        assert queries <= TITLES_QUERY_LIMIT, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` выполняет не '
+            f'больше {TITLES_QUERY_LIMIT} запросов к базе данных независимо '
+            f'от количества произведений. Сейчас запросов: {queries}.'
+        )
+
+    def test_02_title_detail_query_count(self, client):
+        create_catalogue(1)
+        title = Title.objects.get()
+        queries = count_queries(client, f'{self.TITLES_URL}{title.id}/')
+        assert queries <= TITLES_QUERY_LIMIT - 1, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/{title_id}/` '
+            'загружает категорию и жанры без отдельных запросов.'
+        )
+
+    def test_03_nested_parents_resolved_once(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        with CaptureQueriesContext(connection) as context:
+            review = create_single_review(
+                user_client, title_id, 'Текст', 5).json()
+        title_selects = count_selects_from(context, 'reviews_title')
+        assert title_selects == 1, (
+            'Проверьте, что POST-запрос к '
+            '`/api/v1/titles/{title_id}/reviews/` загружает произведение '
+            f'один раз. Сейчас запросов: {title_selects}.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            create_single_comment(user_client, title_id, review['id'], 'Да')
+        review_selects = count_selects_from(context, 'reviews_review')
+        assert review_selects == 1, (
+            'Проверьте, что POST-запрос к `/api/v1/titles/{title_id}/'
+            'reviews/{review_id}/comments/` загружает отзыв и произведение '
+            f'одним запросом. Сейчас запросов: {review_selects}.'
+        )
+
+    @pytest.mark.parametrize('size', (1, 5, 12))
+    @pytest.mark.parametrize('pagination', ('page', 'cursor'))
+    def test_04_reviews_and_comments_load_authors(
+            self, client, size, pagination):
+        title, review = create_discussion(size)
+        reviews_url = f'{self.TITLES_URL}{title.id}/reviews/'
+        comments_url = f'{reviews_url}{review.id}/comments/'
+        for url in (reviews_url, comments_url):
+            queries = count_queries(client, f'{url}?pagination={pagination}')
+            assert queries <= CONTENT_QUERY_LIMIT, (
+                f'Проверьте, что GET-запрос к `{url}` загружает авторов '
+                'вместе со страницей, а не отдельным запросом на каждый '
+                f'объект. Сейчас запросов: {queries}.'
+            )
+
+    def test_05_author_row_deferred(self, client):
+        title, review = create_discussion(2)
+        urls = (
+            f'{self.TITLES_URL}{title.id}/reviews/',
+            f'{self.TITLES_URL}{title.id}/reviews/{review.id}/',
+            f'{self.TITLES_URL}{title.id}/reviews/{review.id}/comments/',
+        )
+        for url in urls:
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            assert response.status_code == 200
+            assert not any(
+                '"reviews_user"."email"' in query['sql']
+                for query in context.captured_queries
+            ), (
+                f'Проверьте, что GET-запрос к `{url}` читает у автора только '
+                'имя пользователя.'
+            )
@@ -0,0 +1,99 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+from tests.utils import create_catalogue, create_reviews
+
+
+def collect_pages(client, url):
+    results, pages = [], 0
+    while url:
+        data = client.get(url).json()
+        assert 'count' not in data, (
+            'Проверьте, что в курсорном режиме пагинации ответ не содержит '
+            'ключ `count`.'
+        )
+        results.extend(data['results'])
+        url = data['next']
+        pages += 1
+    return results, pages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_titles_cursor_mode(self, client):
+        create_catalogue(12)
+        page_results = []
+        url = self.TITLES_URL
+        while url:
+            data = client.get(url).json()
+            page_results.extend(data['results'])
+            url = data['next']
+
+        cursor_results, pages = collect_pages(
+            client, f'{self.TITLES_URL}?pagination=cursor')
+        assert pages == 3
+        assert [title['id'] for title in cursor_results] == [
+            title['id'] for title in page_results
+        ], (
+            'Проверьте, что курсорный режим пагинации для '
+            f'`{self.TITLES_URL}` отдаёт произведения в том же порядке, что '
+            'и постраничный.'
+        )
+
+    def test_02_reviews_cursor_mode(self, admin_client, admin, user_client,
+                                    user, moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client,
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        results, _ = collect_pages(
+            admin_client,
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+            + '?pagination=cursor'
+        )
+        assert [review['id'] for review in results] == sorted(
+            review['id'] for review in reviews
+        )[::-1], (
+            'Проверьте, что курсорный режим пагинации отдаёт отзывы от '
+            'новых к старым.'
+        )
+
+    def test_03_titles_keyset_inside_tie_group(self, client):
+        create_catalogue(40)
+        Title.objects.update(year=2000)
+        expected = list(Title.objects.order_by(
+            '-year', 'name', 'id').values_list('id', flat=True))
+        url, results, offsets = f'{self.TITLES_URL}?pagination=cursor', [], []
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                data = client.get(url).json()
+            offsets += [
+                query['sql'] for query in context.captured_queries
+                if 'OFFSET' in query['sql']
+            ]
+            results.append([title['id'] for title in data['results']])
+            previous, url = data['previous'], data['next']
+        assert [pk for page in results for pk in page] == expected
+        assert not offsets, (
+            'Проверьте, что курсор хранит все колонки порядка и страницы '
+            'внутри группы с одинаковым годом отбираются без OFFSET.'
+        )
+        data = client.get(previous).json()
+        assert [title['id'] for title in data['results']] == results[-2], (
+            'Проверьте, что ссылка `previous` возвращает предыдущую '
+            'страницу.'
+        )
+
+    def test_04_invalid_cursor(self, client):
+        response = client.get(f'{self.TITLES_URL}?cursor=не-курсор')
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,130 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews import mailing
+from reviews.mailing import claim, claim_due_emails, send_emails
+from reviews.models import (
+    EMAIL_FAILED, EMAIL_PENDING, EMAIL_SENT, OutgoingEmail
+)
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+
+
+class FailingBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11EmailQueue:
+
+    def signup(self, client):
+        response = client.post(SIGNUP_URL, data={
+            'email': 'queued@yamdb.fake',
+            'username': 'queued_user',
+        })
+        assert response.status_code == 200
+        return OutgoingEmail.objects.get()
+
+    def test_01_outbox_mode_defers_sending(self, client, settings):
+        settings.EMAIL_DELIVERY_MODE = 'outbox'
+        outbox_before_count = len(mail.outbox)
+
+        email = self.signup(client)
+        assert email.status == EMAIL_PENDING
+        assert len(mail.outbox) == outbox_before_count, (
+            'Проверьте, что в режиме `outbox` письмо с кодом подтверждения '
+            'не отправляется во время запроса к `/api/v1/auth/signup/`.'
+        )
+
+        call_command('send_queued_mail')
+        email.refresh_from_db()
+        assert email.status == EMAIL_SENT
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что команда `send_queued_mail` отправляет письма '
+            'из очереди.'
+        )
+        assert mail.outbox[-1].to == ['queued@yamdb.fake']
+
+    def test_02_failed_delivery_is_retried_with_backoff(self, client,
+                                                        settings):
+        settings.EMAIL_DELIVERY_MODE = 'outbox'
+        settings.EMAIL_QUEUE_MAX_ATTEMPTS = 2
+        settings.EMAIL_BACKEND = 'tests.test_11_email_queue.FailingBackend'
+        email = self.signup(client)
+
+        call_command('send_queued_mail')
+        email.refresh_from_db()
+        assert (email.status, email.attempts) == (EMAIL_PENDING, 1)
+        assert email.next_attempt_at > email.created_at, (
+            'Проверьте, что неудачная отправка откладывает следующую '
+            'попытку.'
+        )
+        assert 'SMTP' in email.last_error
+
+        OutgoingEmail.objects.update(next_attempt_at=email.created_at)
+        call_command('send_queued_mail')
+        email.refresh_from_db()
+        assert (email.status, email.attempts) == (EMAIL_FAILED, 2), (
+            'Проверьте, что после `EMAIL_QUEUE_MAX_ATTEMPTS` неудачных '
+            'попыток письмо помечается как недоставленное.'
+        )
+
+    def test_03_email_claimed_once(self, client, settings):
+        settings.EMAIL_DELIVERY_MODE = 'outbox'
+        email = self.signup(client)
+        now = timezone.now()
+        first = claim_due_emails(10, now)
+        second = claim_due_emails(10, now)
+        assert [claimed.pk for claimed in first] == [email.pk]
+        assert second == [], (
+            'Проверьте, что письмо, забранное одним обработчиком, не '
+            'достаётся другому.'
+        )
+        stale = OutgoingEmail.objects.get()
+        stale.next_attempt_at = email.next_attempt_at
+        assert claim([stale], now) == [], (
+            'Проверьте, что письмо забирается условным UPDATE, а не по '
+            'ранее прочитанному состоянию.'
+        )
+        call_command('send_queued_mail')
+        email.refresh_from_db()
+        assert email.status == EMAIL_PENDING, (
+            'Проверьте, что забранное письмо не отправляется повторно до '
+            'истечения EMAIL_QUEUE_CLAIM_TIMEOUT.'
+        )
+        send_emails(first, now)
+        email.refresh_from_db()
+        assert email.status == EMAIL_SENT
+
+    def test_04_thread_mode_schedules_retry(self, client, settings,
+                                            monkeypatch):
+        settings.EMAIL_DELIVERY_MODE = 'outbox'
+        timers = []
+
+        class Timer:
+            def __init__(self, delay, function):
+                timers.append(delay)
+
+            def is_alive(self):
+                return True
+
+            def start(self):
+                pass
+
+        monkeypatch.setattr(mailing.threading, 'Timer', Timer)
+        monkeypatch.setattr(mailing, '_retry_timer', None)
+        self.signup(client)
+        OutgoingEmail.objects.update(
+            next_attempt_at=timezone.now() + timedelta(seconds=60))
+        mailing.schedule_retry()
+        assert len(timers) == 1 and 0 < timers[0] <= 60, (
+            'Проверьте, что отложенная попытка запускается таймером, а не '
+            'следующей регистрацией.'
+        )
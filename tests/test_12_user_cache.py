@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import count_selects_from
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12CachedAuthentication:
+
+    ME_URL = '/api/v1/users/me/'
+    USER_DETAIL_URL_TEMPLATE = '/api/v1/users/{username}/'
+
+    def test_01_user_loaded_once(self, user_client):
+        user_client.get(self.ME_URL)
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert count_selects_from(context, 'reviews_user') == 0, (
+            'Проверьте, что повторный запрос с тем же токеном не загружает '
+            'пользователя из базы данных.'
+        )
+
+    def test_02_role_change_invalidates_cache(self, admin_client, user,
+                                              user_client):
+        assert user_client.get('/api/v1/users/').status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        admin_client.patch(
+            self.USER_DETAIL_URL_TEMPLATE.format(username=user.username),
+            data={'role': 'admin'}
+        )
+        assert user_client.get('/api/v1/users/').status_code == (
+            HTTPStatus.OK
+        ), (
+            'Проверьте, что изменение роли пользователя сразу учитывается '
+            'при аутентификации по токену.'
+        )
+
+        admin_client.delete(
+            self.USER_DETAIL_URL_TEMPLATE.format(username=user.username))
+        assert user_client.get(self.ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что токен удалённого пользователя перестаёт '
+            'действовать.'
+        )
+
+    def test_03_profile_patch_keeps_other_fields(self, user, user_client):
+        user_client.get(self.ME_URL)
+        response = user_client.patch(self.ME_URL, data={'bio': 'новое'})
+        assert response.status_code == HTTPStatus.OK
+        user.refresh_from_db()
+        assert user.bio == 'новое'
+        assert user.check_password('1234567'), (
+            'Проверьте, что изменение профиля пользователем, загруженным из '
+            'кэша, не затирает остальные поля.'
+        )
+
+    def test_04_process_local_cache_not_used(self, settings, user_client):
+        settings.CACHE_SHARED = False
+        user_client.get(self.ME_URL)
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert count_selects_from(context, 'reviews_user') == 1, (
+            'Проверьте, что без общего кэша пользователь загружается из '
+            'базы: кэш в памяти процесса не видит сброса в других '
+            'процессах.'
+        )
@@ -0,0 +1,77 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_catalogue, create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    GENRES_URL = '/api/v1/genres/'
+
+    def test_01_repeated_list_served_from_cache(self, client):
+        create_catalogue(3)
+        first = client.get(self.TITLES_URL, {'year': 2001})
+        with CaptureQueriesContext(connection) as context:
+            second = client.get(self.TITLES_URL, {'year': 2001})
+        assert second.json() == first.json()
+        assert len(context.captured_queries) == 0, (
+            f'Проверьте, что повторный GET-запрос к `{self.TITLES_URL}` с '
+            'теми же параметрами отдаётся из кэша без запросов к базе.'
+        )
+        assert client.get(self.TITLES_URL).json()['count'] == 3, (
+            'Проверьте, что ключ кэша учитывает параметры запроса.'
+        )
+
+    def test_02_conditional_requests(self, client):
+        create_catalogue(1)
+        response = client.get(self.GENRES_URL)
+        assert response.has_header('ETag')
+        assert response.has_header('Last-Modified')
+
+        response = client.get(
+            self.GENRES_URL, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{self.GENRES_URL}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+
+    def test_03_writes_invalidate_cache(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        detail_url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        etag = admin_client.get(detail_url)['ETag']
+        assert admin_client.get(detail_url).json()['rating'] is None
+
+        create_single_review(user_client, titles[0]['id'], 'Класс', 9)
+        response = admin_client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['rating'] == 9, (
+            'Проверьте, что новый отзыв сбрасывает кэш ответов '
+            f'`{detail_url}`.'
+        )
+
+        genres_count = admin_client.get(self.GENRES_URL).json()['count']
+        admin_client.post(
+            self.GENRES_URL, data={'name': 'Мюзикл', 'slug': 'musical'})
+        assert admin_client.get(self.GENRES_URL).json()['count'] == (
+            genres_count + 1
+        ), (
+            'Проверьте, что создание жанра сбрасывает кэш ответов '
+            f'`{self.GENRES_URL}`.'
+        )
+
+    def test_04_process_local_cache_not_used(self, client, settings):
+        settings.CACHE_SHARED = False
+        create_catalogue(1)
+        client.get(self.TITLES_URL)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.TITLES_URL)
+        assert len(context.captured_queries) > 0, (
+            'Проверьте, что без общего кэша ответы каталога не кэшируются: '
+            'другие процессы не увидят сброса версии.'
+        )
+        assert not response.has_header('ETag')
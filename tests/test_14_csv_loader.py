@@ -0,0 +1,88 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from reviews.models import Comment, Review, Title
+
+CSV_FILES = {
+    'comments.csv': (
+        'id,review_id,text,author,pub_date\n'
+        '1,2,"Согласен, ""отлично""",1,2020-01-13T23:20:02.422Z\n'
+    ),
+    'review.csv': (
+        'id,title_id,text,author,score,pub_date\n'
+        '1,1,Неплохо,1,6,2019-09-24T21:08:21.567Z\n'
+        '2,1,Шедевр,2,9,2019-09-25T21:08:21.567Z\n'
+        '3,2,Скучно,1,2,2019-09-26T21:08:21.567Z\n'
+    ),
+    'titles.csv': (
+        'id,name,year,category\n'
+        '1,Побег из Шоушенка,1994,1\n'
+        '2,Крестный отец,1972,1\n'
+        '3,Без категории,1980,\n'
+    ),
+    'genre_title.csv': 'id,title_id,genre_id\n1,1,1\n2,2,1\n3,2,2\n',
+    'genre.csv': 'id,name,slug\n1,Драма,drama\n2,Комедия,comedy\n',
+    'category.csv': 'id,name,slug\n1,Фильм,movie\n',
+    'users.csv': (
+        'id,username,email,role,bio,first_name,last_name\n'
+        '1,bingobongo,bingobongo@yamdb.fake,user,,,\n'
+        '2,capt_obvious,capt_obvious@yamdb.fake,admin,,,\n'
+    ),
+}
+
+
+def write_csv_files(directory):
+    for name, content in CSV_FILES.items():
+        (directory / name).write_text(content, encoding='utf-8')
+
+
+def get_index_names(model):
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, model._meta.db_table)
+    return {name for name, info in constraints.items() if info['index']}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14CSVLoader:
+
+    def test_01_load_csv(self, tmp_path):
+        write_csv_files(tmp_path)
+
+        call_command('load_csv', path=tmp_path, chunk_size=2)
+
+        assert Title.objects.count() == 3
+        assert Title.objects.get(pk=3).category is None
+        assert set(
+            Title.objects.get(pk=2).genre.values_list('slug', flat=True)
+        ) == {'comedy', 'drama'}
+        assert Review.objects.get(pk=1).pub_date.year == 2019, (
+            'Проверьте, что загрузчик сохраняет дату публикации из файла.'
+        )
+        comment = Comment.objects.get()
+        assert comment.title_id == 1, (
+            'Проверьте, что загрузчик заполняет произведение комментария по '
+            'его отзыву.'
+        )
+        assert comment.text == 'Согласен, "отлично"'
+        title = Title.objects.get(pk=1)
+        assert (title.review_count, title.rating) == (2, 7.5), (
+            'Проверьте, что после загрузки отзывов пересчитывается рейтинг.'
+        )
+
+    def test_02_deferred_indexes_are_rebuilt(self, tmp_path):
+        write_csv_files(tmp_path)
+        indexes = {
+            model: get_index_names(model) for model in (Comment, Review, Title)
+        }
+
+        call_command(
+            'load_csv', path=tmp_path, defer_indexes=True, workers=2)
+
+        assert Review.objects.count() == 3
+        for model, names in indexes.items():
+            assert get_index_names(model) == names, (
+                'Проверьте, что после загрузки с `--defer-indexes` '
+                f'индексы таблицы `{model._meta.db_table}` восстановлены.'
+            )
@@ -0,0 +1,62 @@
+import pytest
+
+from benchmarks.scenarios import (
+    SCENARIOS,
+    BenchmarkRunner,
+    compare_with_baseline,
+    get_uncovered_routes,
+)
+from reviews.models import Review, Title
+from reviews.synthetic import generate_dataset
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15Benchmark:
+
+    SIZES = {
+        'users': 6,
+        'categories': 2,
+        'genres': 3,
+        'titles': 4,
+        'reviews_per_title': 3,
+        'comments_per_review': 1,
+    }
+
+    def test_01_synthetic_dataset(self):
+        created = generate_dataset(seed=1, **self.SIZES)
+        assert len(created['title']) == 4
+        assert Review.objects.count() == 12
+        for title in Title.objects.all():
+            assert title.review_count == 3, (
+                'Проверьте, что после генерации набора данных рейтинги '
+                'произведений пересчитаны.'
+            )
+
+    def test_02_every_route_has_scenario(self):
+        assert get_uncovered_routes() == [], (
+            'Проверьте, что для каждого маршрута API есть сценарий замера.'
+        )
+
+    def test_03_runner_collects_metrics(self, settings):
+        settings.EMAIL_DELIVERY_MODE = 'outbox'
+        generate_dataset(**self.SIZES)
+        results = BenchmarkRunner(repeat=1, warmup=0).run(SCENARIOS)
+        assert set(results) == {scenario.name for scenario in SCENARIOS}
+        for result in results.values():
+            assert result['queries'] >= 0
+            assert result['p95_ms'] >= result['p50_ms']
+
+    def test_04_compare_with_baseline(self):
+        baseline = {'titles-list': {'p95_ms': 10, 'queries': 3, 'bytes': 100}}
+        assert compare_with_baseline(
+            {'titles-list': {'p95_ms': 11, 'queries': 3, 'bytes': 110}},
+            baseline,
+        ) == []
+        regressions = compare_with_baseline(
+            {'titles-list': {'p95_ms': 20, 'queries': 4, 'bytes': 200}},
+            baseline,
+        )
+        assert len(regressions) == 3, (
+            'Проверьте, что рост числа запросов, задержки и размера ответа '
+            'считается регрессией.'
+        )
@@ -0,0 +1,121 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from benchmarks.scenarios import SCENARIOS, BenchmarkContext, BenchmarkRunner
+from reviews.synthetic import generate_dataset
+
+SQLITE_FULL_SCAN = re.compile(r'^SCAN (TABLE )?(?P<table>\w+)$')
+POSTGRESQL_FULL_SCAN = re.compile(r'Seq Scan on (?P<table>\w+)')
+EXTRA_URLS = (
+    '/api/v1/titles/?category={context.category.slug}',
+    '/api/v1/titles/?year={context.title.year}',
+    '/api/v1/titles/?name={context.title.name}',
+    '/api/v1/titles/?search={context.title.name}',
+    '/api/v1/titles/?year_min=1990&year_max={context.title.year}',
+    '/api/v1/titles/?rating_min=3&rating_max=8',
+    '/api/v1/titles/?genre={context.title_genres}&ordering=-rating',
+)
+ORDERING_URLS = tuple(
+    f'/api/v1/titles/?ordering={prefix}{field}'
+    for field in ('rating', 'year', 'name', 'review_count')
+    for prefix in ('', '-')
+) + (
+    '/api/v1/titles/?ordering=-rating&rating_min=5',
+    '/api/v1/titles/?ordering=year&year_min=1990',
+)
+SQLITE_SORT = re.compile(r'^USE TEMP B-TREE FOR .*ORDER BY')
+POSTGRESQL_SORT = re.compile(r'^\W*Sort\b')
+
+
+def get_plan(sql):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+        # На маленьком наборе планировщик предпочтёт Seq Scan,
+        # даже если подходящий индекс есть.
+        cursor.execute('SET enable_seqscan = off')
+        cursor.execute(f'EXPLAIN {sql}')
+        return [row[0] for row in cursor.fetchall()]
+
+
+def get_full_scans(sql):
+    """Таблицы, которые план запроса читает целиком, без индекса."""
+    pattern = (
+        SQLITE_FULL_SCAN if connection.vendor == 'sqlite'
+        else POSTGRESQL_FULL_SCAN
+    )
+    return [
+        match.group('table')
+        for match in map(pattern.search, get_plan(sql)) if match
+    ]
+
+
+def has_sort(sql):
+    """Сортирует ли план выборку вместо обхода индекса в нужном порядке."""
+    pattern = (
+        SQLITE_SORT if connection.vendor == 'sqlite' else POSTGRESQL_SORT
+    )
+    return any(pattern.search(line) for line in get_plan(sql))
+
+
+def capture_get_queries(runner, context):
+    paths = [
+        (scenario.name, *scenario.build(context, 0)[::2])
+        for scenario in SCENARIOS if scenario.method == 'get'
+    ]
+    paths += [
+        (url, url.format(context=context), context.admin)
+        for url in EXTRA_URLS + ORDERING_URLS
+    ]
+    for name, path, user in paths:
+        with CaptureQueriesContext(connection) as queries:
+            runner.get_client(user).get(path)
+        for query in queries.captured_queries:
+            yield name, query['sql']
+
+
+@pytest.mark.skipif(
+    connection.vendor not in ('sqlite', 'postgresql'),
+    reason='Разбор планов запросов реализован для SQLite и PostgreSQL.',
+)
+@pytest.mark.django_db(transaction=True)
+class Test16QueryPlans:
+
+    def test_01_no_full_table_scans(self):
+        generate_dataset(titles=50)
+        runner = BenchmarkRunner(repeat=1, warmup=0)
+        context = BenchmarkContext()
+        full_scans = [
+            f'{name}: {table}: {sql}'
+            for name, sql in capture_get_queries(runner, context)
+            if sql.lstrip().upper().startswith('SELECT')
+            for table in get_full_scans(sql)
+        ]
+        assert not full_scans, (
+            'Проверьте, что запросы представлений API используют индексы, '
+            'а не читают таблицы целиком:\n' + '\n'.join(full_scans)
+        )
+
+    def test_02_orderings_walk_index(self):
+        generate_dataset(titles=50)
+        client = BenchmarkRunner(repeat=1, warmup=0).get_client(None)
+        sorted_pages = []
+        for url in ORDERING_URLS:
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url)
+            assert response.status_code == 200, url
+            sorted_pages += [
+                f'{url}: {query["sql"]}'
+                for query in queries.captured_queries
+                if query['sql'].startswith('SELECT')
+                and 'FROM "reviews_title"' in query['sql']
+                and 'ORDER BY' in query['sql'] and has_sort(query['sql'])
+            ]
+        assert not sorted_pages, (
+            'Проверьте, что сортировки списка произведений идут по индексу, '
+            'без сортировки выборки:\n' + '\n'.join(sorted_pages)
+        )
@@ -0,0 +1,94 @@
+import pytest
+
+from reviews.models import Category, Title
+from reviews.search import search_titles
+from reviews.synthetic import generate_dataset
+from tests.test_28_genre_links import migrate
+
+BEFORE_SEARCH = ('reviews', '0005_query_shape_indexes')
+LATEST = ('reviews', '0011_title_search_bigint')
+
+
+def search(client, query):
+    response = client.get('/api/v1/titles/', {'search': query})
+    assert response.status_code == 200
+    return [title['name'] for title in response.json()['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17Search:
+
+    def create_titles(self):
+        category = Category.objects.create(name='Фильм', slug='films')
+        return {
+            name: Title.objects.create(
+                name=name, year=year, description=description,
+                category=category,
+            )
+            for name, year, description in (
+                ('Побег из Шоушенка', 1994, 'Тюремная драма'),
+                ('Крестный отец', 1972, 'Драма о мафии и побеге'),
+                ('Зелёная миля', 1999, 'Фантастика'),
+            )
+        }
+
+    def test_01_search_ranks_name_above_description(self, client):
+        self.create_titles()
+        assert search(client, 'побег') == [
+            'Побег из Шоушенка', 'Крестный отец',
+        ], (
+            'Проверьте, что параметр `search` ищет по названию и описанию '
+            'и ставит совпадения в названии выше.'
+        )
+        assert search(client, 'драма отец') == ['Крестный отец'], (
+            'Проверьте, что найденные произведения содержат все слова '
+            'запроса.'
+        )
+        assert search(client, 'шоуш') == ['Побег из Шоушенка'], (
+            'Проверьте, что слова запроса ищутся по префиксу.'
+        )
+
+    def test_02_index_follows_title_changes(self, client):
+        titles = self.create_titles()
+        title = titles['Зелёная миля']
+        title.name = 'Зелёная дорога'
+        title.save()
+        assert search(client, 'миля') == []
+        assert search(client, 'дорога') == ['Зелёная дорога']
+        title.delete()
+        assert search(client, 'дорога') == [], (
+            'Проверьте, что индекс поиска обновляется при изменении и '
+            'удалении произведения.'
+        )
+
+    def test_03_rating_updates_keep_index(self, client):
+        title = self.create_titles()['Зелёная миля']
+        title.rating = 10
+        title.save(update_fields=('rating',))
+        assert search(client, 'фантастика') == ['Зелёная миля']
+
+    def test_04_query_syntax_is_escaped(self, client):
+        self.create_titles()
+        for query in ('"', 'NEAR(', 'побег*', 'OR', '-драма', "'"):
+            search(client, query)
+        assert len(search(client, '!!!')) == 3
+
+    def test_05_bulk_loaded_titles_are_indexed(self):
+        generate_dataset(titles=10)
+        title = Title.objects.first()
+        found = search_titles(Title.objects.all(), title.name)
+        assert title in found, (
+            'Проверьте, что после массовой загрузки индекс поиска '
+            'перестраивается.'
+        )
+
+    def test_06_migration_builds_index(self, client):
+        self.create_titles()
+        migrate(BEFORE_SEARCH)
+        migrate(LATEST)
+        assert search(client, 'побег') == [
+            'Побег из Шоушенка', 'Крестный отец',
+        ], (
+            'Проверьте, что миграция индекса поиска создаёт и заполняет '
+            'его по существующим произведениям.'
+        )
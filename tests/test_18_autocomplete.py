@@ -0,0 +1,98 @@
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.autocomplete import build_trie
+from api.serializers import GenreSerializer
+from reviews.models import Genre, User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Autocomplete:
+
+    GENRES_URL = '/api/v1/genres/autocomplete/'
+    USERS_URL = '/api/v1/users/autocomplete/'
+
+    def create_genres(self):
+        for name, slug in (
+            ('Научная фантастика', 'sci-fi'),
+            ('Фэнтези', 'fantasy'),
+            ('Драма', 'drama'),
+            ('Фарс', 'farce'),
+        ):
+            Genre.objects.create(name=name, slug=slug)
+
+    def test_01_genres_by_word_prefix(self, client):
+        self.create_genres()
+        response = client.get(self.GENRES_URL, {'prefix': 'Фа'})
+        assert response.status_code == 200
+        assert response.json() == [
+            {'name': 'Научная фантастика', 'slug': 'sci-fi'},
+            {'name': 'Фарс', 'slug': 'farce'},
+        ], (
+            'Проверьте, что подсказки ищут по началу любого слова '
+            'названия без учёта регистра и сортируются по названию.'
+        )
+        response = client.get(self.GENRES_URL, {'prefix': 'fan'})
+        assert [genre['slug'] for genre in response.json()] == ['fantasy']
+        response = client.get(self.GENRES_URL, {'prefix': 'ф', 'limit': 1})
+        assert len(response.json()) == 1
+
+    def test_02_trie_is_rebuilt_on_change(self, client, admin_client):
+        self.create_genres()
+        client.get(self.GENRES_URL, {'prefix': 'др'})
+        with CaptureQueriesContext(connection) as context:
+            client.get(self.GENRES_URL, {'prefix': 'др'})
+        assert len(context.captured_queries) == 0, (
+            'Проверьте, что подсказки по жанрам отдаются из памяти без '
+            'запросов к базе.'
+        )
+        admin_client.post(
+            '/api/v1/genres/', {'name': 'Детектив', 'slug': 'detective'})
+        response = client.get(self.GENRES_URL, {'prefix': 'д'})
+        assert [genre['slug'] for genre in response.json()] == [
+            'detective', 'drama',
+        ], 'Проверьте, что подсказки учитывают новые жанры.'
+
+    def test_03_trie_lookup_is_fast(self):
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр {idx}', slug=f'genre-{idx}')
+            for idx in range(500)
+        )
+        trie = build_trie(Genre.objects.all(), GenreSerializer)
+        started = time.perf_counter()
+        for _ in range(1000):
+            trie.find('жанр 4', 10)
+        assert (time.perf_counter() - started) / 1000 < 0.001
+
+    def test_04_users_by_prefix(self, admin_client, admin, client):
+        for username in ('Alice', 'alina', 'bob', 'Alex_Z'):
+            User.objects.create(
+                username=username, email=f'{username}@yamdb.fake')
+        response = admin_client.get(self.USERS_URL, {'prefix': 'ALI'})
+        assert response.status_code == 200
+        assert response.json() == [
+            {'username': 'Alice'}, {'username': 'alina'},
+        ], (
+            'Проверьте, что подсказки пользователей ищут по началу имени '
+            'без учёта регистра.'
+        )
+        assert client.get(self.USERS_URL).status_code == 401
+
+    def test_05_username_lower_follows_rename(self, admin_client):
+        user = User.objects.create(username='Mixed', email='m@yamdb.fake')
+        user.username = 'Renamed'
+        user.save(update_fields=('username',))
+        user.refresh_from_db()
+        assert user.username_lower == 'renamed'
+
+    @pytest.mark.parametrize('prefix', ('sci', 'SciF', 'scifi'))
+    def test_06_mixed_case_slug(self, client, prefix):
+        Genre.objects.create(name='Фантастика', slug='SciFi')
+        response = client.get(self.GENRES_URL, {'prefix': prefix})
+        assert response.json() == [
+            {'name': 'Фантастика', 'slug': 'SciFi'}], (
+            'Проверьте, что слаг в подсказках ищется без учёта регистра.'
+        )
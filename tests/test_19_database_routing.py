@@ -0,0 +1,75 @@
+from unittest import mock
+
+import pytest
+from django.db import connection
+
+from api_yamdb.db import (
+    ReplicaRouter,
+    close_unusable_connections,
+    use_replica,
+)
+from reviews.models import Title
+from tests.utils import create_catalogue
+
+
+class Test19DatabaseRouting:
+
+    def test_01_router_reads_from_replica(self, settings):
+        router = ReplicaRouter()
+        settings.REPLICA_DATABASES = ['replica']
+        assert router.db_for_read(Title) is None
+        with use_replica():
+            assert router.db_for_read(Title) == 'replica'
+            instance = Title()
+            instance._state.db = 'default'
+            assert router.db_for_read(Title, instance=instance) == 'default'
+        assert router.db_for_write(Title) == 'default'
+        assert router.allow_migrate('replica', 'reviews') is False
+        assert router.allow_migrate('default', 'reviews') is None
+        settings.REPLICA_DATABASES = []
+        with use_replica():
+            assert router.db_for_read(Title) is None, (
+                'Проверьте, что без настроенных реплик чтение идёт в '
+                'основную базу.'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_viewsets_read_from_replica(self, settings, admin_client):
+        # Основная база играет роль реплики, чтобы увидеть решение
+        # маршрутизатора на каждом запросе.
+        settings.REPLICA_DATABASES = ['default']
+        create_catalogue(2)
+        router = ReplicaRouter()
+        decisions = set()
+
+        def record(execute, sql, params, many, context):
+            decisions.add(router.db_for_read(Title))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            admin_client.get('/api/v1/titles/')
+        assert decisions == {'default'}, (
+            'Проверьте, что запросы на чтение каталога выполняются с '
+            'реплики.'
+        )
+        decisions.clear()
+        with connection.execute_wrapper(record):
+            admin_client.post(
+                '/api/v1/genres/', {'name': 'Драма', 'slug': 'drama'})
+        assert decisions == {None}, (
+            'Проверьте, что изменяющие запросы читают из основной базы.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_health_check_closes_broken_connection(self):
+        connection.ensure_connection()
+        broken = mock.patch.object(
+            connection, 'is_usable', return_value=False)
+        checked = mock.patch.object(connection, 'settings_dict', {
+            **connection.settings_dict, 'CONN_HEALTH_CHECKS': True})
+        with broken, checked, mock.patch.object(connection, 'close') as close:
+            close_unusable_connections()
+        close.assert_called_once_with()
+        with broken, mock.patch.object(connection, 'close') as close:
+            close_unusable_connections()
+        close.assert_not_called()
@@ -0,0 +1,44 @@
+import pytest
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+
+def read_pragma(wrapper, name):
+    return wrapper.connection.execute(f'PRAGMA {name}').fetchone()[0]
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='Прагмы относятся только к SQLite.')
+@pytest.mark.django_db
+class Test20SQLitePragmas:
+
+    def open_database(self, path):
+        wrapper = DatabaseWrapper(
+            {**connection.settings_dict, 'NAME': str(path)}, alias='pragmas')
+        wrapper.ensure_connection()
+        return wrapper
+
+    def test_01_pragmas_applied_on_connect(self, settings, tmp_path):
+        wrapper = self.open_database(tmp_path / 'db.sqlite3')
+        try:
+            assert read_pragma(wrapper, 'journal_mode') == 'wal', (
+                'Проверьте, что соединение с SQLite переводится в режим WAL.'
+            )
+            assert read_pragma(wrapper, 'synchronous') == 1
+            for name in ('cache_size', 'busy_timeout', 'mmap_size'):
+                assert read_pragma(
+                    wrapper, name) == settings.SQLITE_PRAGMAS[name], (
+                    f'Проверьте, что прагма {name} берётся из настроек '
+                    '`SQLITE_PRAGMAS`.'
+                )
+        finally:
+            wrapper.close()
+
+    def test_02_pragmas_configurable(self, settings, tmp_path):
+        settings.SQLITE_PRAGMAS = {'busy_timeout': 1234}
+        wrapper = self.open_database(tmp_path / 'db.sqlite3')
+        try:
+            assert read_pragma(wrapper, 'busy_timeout') == 1234
+            assert read_pragma(wrapper, 'journal_mode') == 'delete'
+        finally:
+            wrapper.close()
@@ -0,0 +1,112 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+
+from api.cache import CATALOGUE_VERSION_KEY
+from reviews.models import Title
+from tests.utils import create_catalogue
+
+
+@pytest.fixture
+def replica(settings, tmp_path):
+    """Вторая файловая база SQLite в роли реплики основной.
+
+    Реплика обновляется только вызовом возвращаемой функции, поэтому в
+    промежутках от основной базы отстаёт.
+    """
+    connections.settings['replica'] = {
+        **connection.settings_dict,
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+    }
+    settings.REPLICA_DATABASES = ['replica']
+
+    def replicate():
+        connections['replica'].ensure_connection()
+        connection.ensure_connection()
+        connection.connection.backup(connections['replica'].connection)
+
+    yield replicate
+    connections['replica'].close()
+    del connections['replica']
+    del connections.settings['replica']
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='Реплика эмулируется файлом SQLite.')
+@pytest.mark.django_db(transaction=True)
+class Test21ReplicaReads:
+
+    def test_01_reads_served_by_replica(self, client, replica):
+        create_catalogue(1)
+        replica()
+        Title.objects.update(name='Только в основной базе')
+        cache.clear()
+        response = client.get('/api/v1/titles/')
+        assert response.json()['results'][0]['name'] == 'Произведение 0', (
+            'Проверьте, что запросы на чтение выполняются на реплике.'
+        )
+
+    def test_02_writer_reads_own_writes(self, replica, user_client,
+                                        moderator_client):
+        create_catalogue(1)
+        title = Title.objects.get()
+        replica()
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = user_client.post(url, {'text': 'Отзыв', 'score': 5})
+        assert response.status_code == 201
+        assert user_client.get(url).json()['count'] == 1, (
+            'Проверьте, что после изменения пользователь читает из '
+            'основной базы и видит свои изменения.'
+        )
+        assert moderator_client.get(url).json()['count'] == 0, (
+            'Проверьте, что остальные пользователи продолжают читать '
+            'с реплики.'
+        )
+        cache.clear()
+        assert user_client.get(url).json()['count'] == 0, (
+            'Проверьте, что после окончания окна привязки пользователь '
+            'снова читает с реплики.'
+        )
+
+    def test_03_cached_list_read_after_write(self, replica, admin_client,
+                                             client):
+        create_catalogue(1)
+        replica()
+        assert client.get('/api/v1/titles/').json()['count'] == 1
+        response = admin_client.post('/api/v1/titles/', {
+            'name': 'Новое', 'year': 2000, 'genre': ['genre-0'],
+            'category': 'films'})
+        assert response.status_code == 201
+        assert client.get('/api/v1/titles/').json()['count'] == 1, (
+            'Проверьте, что анонимные чтения идут на отстающую реплику.'
+        )
+        assert admin_client.get('/api/v1/titles/').json()['count'] == 2, (
+            'Проверьте, что ответ отстающей реплики не кэшируется под '
+            'новой версией каталога и автор изменения видит его в '
+            'закэшированном списке.'
+        )
+        replica()
+        state = cache.get(CATALOGUE_VERSION_KEY)
+        cache.set(CATALOGUE_VERSION_KEY, {**state, 'bumped_at': 0})
+        assert client.get('/api/v1/titles/').json()['count'] == 2
+        with CaptureQueriesContext(connections['replica']) as context:
+            client.get('/api/v1/titles/')
+        assert not context.captured_queries, (
+            'Проверьте, что после окна отставания ответы реплики снова '
+            'кэшируются.'
+        )
+
+    def test_04_process_local_cache_reads_primary(self, replica, settings,
+                                                  user_client, client):
+        settings.CACHE_SHARED = False
+        create_catalogue(1)
+        replica()
+        Title.objects.update(name='Только в основной базе')
+        assert user_client.get('/api/v1/titles/').json()['results'][0][
+            'name'] == 'Только в основной базе', (
+            'Проверьте, что без общего кэша пользователи с токеном читают '
+            'из основной базы: привязку из другого процесса не видно.'
+        )
+        assert client.get('/api/v1/titles/').json()['results'][0][
+            'name'] == 'Произведение 0'
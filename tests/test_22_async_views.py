@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import resolve
+from rest_framework_simplejwt.tokens import AccessToken
+
+from benchmarks.asgi import build_urlconf, get_read_paths, run_asgi_load
+from benchmarks.scenarios import BenchmarkContext
+from reviews.synthetic import generate_dataset
+
+
+def async_request(method, path, data=None, **extra):
+    async def send():
+        return await getattr(AsyncClient(), method)(path, data, **extra)
+    return async_to_sync(send)()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22AsyncViews:
+
+    def test_01_reads_match_sync_views(self, client, settings):
+        generate_dataset(titles=5, users=6)
+        paths = get_read_paths(BenchmarkContext())
+        expected = [client.get(path).json() for path in paths]
+        settings.ROOT_URLCONF = build_urlconf(True)
+        for path in paths:
+            assert asyncio.iscoroutinefunction(resolve(path).func), (
+                'Проверьте, что при ASYNC_READ_VIEWS чтения обслуживают '
+                'асинхронные представления.'
+            )
+        assert [async_request('get', path).json() for path in paths] == expected, (
+            'Проверьте, что асинхронные представления отдают те же ответы, '
+            'что и синхронные.'
+        )
+
+    def test_02_writes_keep_permissions(self, settings, user):
+        generate_dataset(titles=1, users=6)
+        context = BenchmarkContext()
+        settings.ROOT_URLCONF = build_urlconf(True)
+        url = f'/api/v1/titles/{context.title.id}/reviews/'
+        data = {'text': 'Отзыв', 'score': 5}
+        # AsyncClient в Django 3.2 неверно передаёт multipart-тело.
+        response = async_request(
+            'post', url, data, content_type='application/json')
+        assert response.status_code == 401
+        response = async_request(
+            'post', url, data, content_type='application/json',
+            authorization=f'Bearer {AccessToken.for_user(user)}',
+        )
+        assert response.status_code == 201, (
+            'Проверьте, что изменяющие запросы через асинхронные маршруты '
+            'проходят аутентификацию и создают объекты.'
+        )
+
+    def test_03_load_runs_concurrently(self, settings):
+        generate_dataset(titles=3, users=6)
+        paths = get_read_paths(BenchmarkContext())
+        settings.ROOT_URLCONF = build_urlconf(True)
+        result = run_asgi_load(paths, concurrency=4, requests=8)
+        assert result['requests'] == 8
+        assert result['errors'] == 0
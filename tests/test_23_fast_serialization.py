@@ -0,0 +1,98 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+import uuid
+
+import pytest
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONRenderer
+from api.serializers import TitleOutputSerializer
+from benchmarks.scenarios import BenchmarkContext
+from benchmarks.serialization import benchmark_serialization
+from reviews.models import Title
+from reviews.synthetic import generate_dataset
+
+
+def get_paths(context):
+    title_url = f'/api/v1/titles/{context.title.id}/'
+    reviews_url = f'{title_url}reviews/'
+    comments_url = f'{reviews_url}{context.review.id}/comments/'
+    return [
+        '/api/v1/titles/',
+        '/api/v1/titles/?pagination=cursor',
+        title_url,
+        reviews_url,
+        f'{reviews_url}{context.review.id}/',
+        comments_url,
+        f'{comments_url}{context.comment.id}/',
+        '/api/v1/genres/',
+        '/api/v1/categories/',
+        '/api/v1/genres/autocomplete/?prefix=а',
+    ]
+
+
+def get_contents(client, paths):
+    cache.clear()
+    return [client.get(path).content for path in paths]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23FastSerialization:
+
+    def test_01_responses_match_drf(self, admin_client, settings):
+        generate_dataset(titles=10, users=6)
+        Title.objects.filter(pk=Title.objects.first().pk).update(
+            category=None,
+            rating=None,
+            description='Строка\u2028абзац\u2029«кавычки» 😀 "\\" </script>',
+        )
+        paths = get_paths(BenchmarkContext())
+        fast = get_contents(admin_client, paths)
+        settings.FAST_SERIALIZATION = False
+        assert get_contents(admin_client, paths) == fast, (
+            'Проверьте, что быстрые сериализаторы и FastJSONRenderer отдают '
+            'те же байты, что и DRF.'
+        )
+
+    def test_02_renderer_matches_json_renderer(self):
+        data = {
+            'text': 'Текст\u2028',
+            'date': datetime(2023, 1, 2, 3, 4, 5, 678901, timezone.utc),
+            'decimal': Decimal('1.50'),
+            'uuid': uuid.UUID(int=1),
+            'floats': [0.1, 7.25, 1e-7, 1e16, -2.5e20, 0.0],
+            'nested': ({'value': None}, True),
+        }
+        for value in (data, {'floats': [1.5, 100.25]}, [1, 'а']):
+            assert FastJSONRenderer().render(value) == (
+                JSONRenderer().render(value)), (
+                'Проверьте, что FastJSONRenderer пишет JSON так же, как '
+                'JSONRenderer.'
+            )
+        assert FastJSONRenderer().render({1: 'а'}) == (
+            JSONRenderer().render({1: 'а'}))
+        assert FastJSONRenderer().render(
+            data, renderer_context={'indent': 4}) == JSONRenderer().render(
+                data, renderer_context={'indent': 4})
+        assert FastJSONRenderer().render(None) == b''
+
+    def test_03_nan_still_rejected(self):
+        with pytest.raises(ValueError):
+            FastJSONRenderer().render({'rating': float('nan')})
+
+    def test_04_nested_serializers_are_compiled_once(self):
+        generate_dataset(titles=3, users=6)
+        serializer = TitleOutputSerializer(Title.objects.all(), many=True)
+        serializer.data
+        assert hasattr(serializer.child, '_compiled_representation')
+
+    def test_05_benchmark_reports_identical_output(self):
+        generate_dataset(titles=5, users=6)
+        results = benchmark_serialization(page_size=5, repeat=2)
+        assert {result['name'] for result in results} == {
+            'titles', 'reviews', 'comments', 'genres', 'categories'}
+        for result in results:
+            assert result['identical'], (
+                f'{result["name"]}: быстрый путь изменил ответ.')
+            assert result['drf_ms'] > 0 and result['fast_ms'] > 0
@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from benchmarks.scenarios import BenchmarkContext
+from reviews.models import Title
+from reviews.synthetic import generate_dataset
+from tests.utils import count_queries, create_catalogue
+
+
+def get_with_queries(client, url, data):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, data)
+    assert response.status_code == HTTPStatus.OK
+    return response.json(), [query['sql'] for query in context.captured_queries]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24SparseFields:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_titles_fields(self, client):
+        create_catalogue(3)
+        data, queries = get_with_queries(
+            client, self.TITLES_URL, {'fields': 'id,name,rating'})
+        assert [set(title) for title in data['results']] == [
+            {'id', 'name', 'rating'}] * 3, (
+            'Проверьте, что `?fields=` оставляет в ответе только '
+            'перечисленные поля.'
+        )
+        assert not any('reviews_genre' in sql for sql in queries), (
+            'Проверьте, что жанры не подгружаются, если их нет в ответе.'
+        )
+        assert not any(
+            '"description"' in sql or 'reviews_category' in sql
+            for sql in queries
+        ), (
+            'Проверьте, что убранные колонки и связи не загружаются.'
+        )
+
+    def test_02_titles_omit(self, client):
+        create_catalogue(2)
+        title = Title.objects.first()
+        data, queries = get_with_queries(
+            client, f'{self.TITLES_URL}{title.id}/',
+            {'omit': 'description,genre'})
+        assert set(data) == {'id', 'name', 'year', 'rating', 'category'}
+        assert data['category'] == {'name': 'Фильм', 'slug': 'films'}
+        assert not any('"description"' in sql for sql in queries)
+        assert count_queries(
+            client, f'{self.TITLES_URL}{title.id}/?omit=genre') == 1, (
+            'Проверьте, что без жанров произведение с категорией '
+            'загружается одним запросом.'
+        )
+
+    def test_03_unknown_fields_rejected(self, client):
+        create_catalogue(1)
+        response = client.get(self.TITLES_URL, {'fields': 'name,secret'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'fields' in response.json()
+
+    def test_04_reviews_and_comments(self, client):
+        generate_dataset(titles=2, users=6)
+        context = BenchmarkContext()
+        reviews_url = f'{self.TITLES_URL}{context.title.id}/reviews/'
+        data, queries = get_with_queries(
+            client, reviews_url, {'fields': 'id,score'})
+        assert {tuple(review) for review in data['results']} == {
+            ('id', 'score')}
+        assert not any('"text"' in sql for sql in queries if (
+            'FROM "reviews_review"' in sql and 'COUNT' not in sql))
+        comments_url = f'{reviews_url}{context.review.id}/comments/'
+        data, _ = get_with_queries(client, comments_url, {'omit': 'text'})
+        assert {tuple(comment) for comment in data['results']} == {
+            ('id', 'author', 'pub_date')}
+
+    def test_05_cursor_with_sparse_fields(self, client):
+        create_catalogue(8)
+        data, queries = get_with_queries(
+            client, self.TITLES_URL,
+            {'pagination': 'cursor', 'fields': 'name'})
+        assert data['next']
+        assert len(queries) == 1, (
+            'Проверьте, что поля курсора загружаются вместе со страницей.'
+        )
+
+    def test_06_writes_ignore_fields(self, admin_client):
+        create_catalogue(1)
+        response = admin_client.post(
+            f'{self.TITLES_URL}?fields=name',
+            data={'name': 'Новое', 'year': 2000, 'genre': ['genre-0'],
+                  'category': 'films'},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert set(response.json()) == {
+            'id', 'name', 'year', 'rating', 'description', 'genre',
+            'category'}
@@ -0,0 +1,239 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.bulk import CONFLICT_MESSAGE
+from api.views import GenreViewSet
+from reviews.models import Category, Genre, GenreTitle, Title
+from tests.utils import count_selects_from, create_catalogue
+
+TITLES_BULK_URL = '/api/v1/titles/bulk/'
+GENRES_BULK_URL = '/api/v1/genres/bulk/'
+
+
+def build_titles(size, genres=('genre-0', 'genre-1')):
+    return [
+        {'name': f'Пакет {index}', 'year': 2001, 'genre': list(genres),
+         'category': 'films', 'description': f'Описание {index}'}
+        for index in range(size)
+    ]
+
+
+def post(client, url, data, **params):
+    if params:
+        url = f'{url}?' + '&'.join(f'{k}={v}' for k, v in params.items())
+    return client.post(url, data, format='json')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25BulkWrites:
+
+    @pytest.mark.parametrize('size', (2, 10))
+    def test_01_titles_created_with_one_query_per_relation(
+            self, admin_client, size):
+        create_catalogue(0)
+        with CaptureQueriesContext(connection) as context:
+            response = post(admin_client, TITLES_BULK_URL, build_titles(size))
+        assert response.status_code == HTTPStatus.CREATED
+        results = response.json()
+        assert [result['status'] for result in results] == [201] * size
+        assert results[0]['data']['genre'] == [
+            {'name': 'Жанр 0', 'slug': 'genre-0'},
+            {'name': 'Жанр 1', 'slug': 'genre-1'},
+        ]
+        assert results[0]['data']['category']['slug'] == 'films'
+        # Слаги пакета и вывод созданных произведений.
+        assert count_selects_from(context, 'reviews_genre') == 2, (
+            'Проверьте, что жанры всех произведений пакета разрешаются '
+            'одним запросом.'
+        )
+        assert count_selects_from(context, 'reviews_category') == 1
+        assert GenreTitle.objects.count() == 2 * size
+        genretitle_inserts = sum(
+            query['sql'].startswith('INSERT')
+            and 'INTO "reviews_genretitle"' in query['sql']
+            for query in context.captured_queries
+        )
+        assert genretitle_inserts == 1, (
+            'Проверьте, что связи с жанрами вставляются через bulk_create.'
+        )
+
+    def test_02_per_item_errors(self, admin_client):
+        create_catalogue(0)
+        items = build_titles(3)
+        items[1]['genre'] = ['missing']
+        items.append('не объект')
+        response = post(admin_client, TITLES_BULK_URL, items)
+        assert response.status_code == HTTPStatus.MULTI_STATUS
+        results = response.json()
+        assert [result['status'] for result in results] == [
+            201, 400, 201, 400]
+        assert 'genre' in results[1]['errors']
+        assert Title.objects.count() == 2
+
+    def test_03_atomic_batch(self, admin_client):
+        create_catalogue(0)
+        items = build_titles(2)
+        items[0]['year'] = 'никогда'
+        response = post(admin_client, TITLES_BULK_URL, items, atomic='true')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert [result['status'] for result in response.json()] == [
+            400, 424]
+        assert not Title.objects.exists(), (
+            'Проверьте, что с `atomic=true` ошибка в одном объекте '
+            'отменяет весь пакет.'
+        )
+
+    def test_04_cache_and_search_updated(self, admin_client):
+        create_catalogue(1)
+        assert admin_client.get('/api/v1/titles/').json()['count'] == 1
+        post(admin_client, TITLES_BULK_URL, build_titles(2))
+        assert admin_client.get('/api/v1/titles/').json()['count'] == 3, (
+            'Проверьте, что массовая запись сбрасывает кэш каталога.'
+        )
+        response = admin_client.get(
+            '/api/v1/titles/', {'search': 'пакет'})
+        assert response.json()['count'] == 2, (
+            'Проверьте, что созданные произведения попадают в индекс поиска.'
+        )
+
+    def test_05_titles_update(self, admin_client):
+        create_catalogue(2)
+        first, second = Title.objects.order_by('pk')
+        response = admin_client.patch(
+            TITLES_BULK_URL,
+            [
+                {'id': first.pk, 'name': 'Переименовано',
+                 'genre': ['genre-2']},
+                {'id': second.pk, 'description': 'Новое описание'},
+                {'id': 999999, 'name': 'Нет такого'},
+            ],
+            format='json',
+        )
+        assert response.status_code == HTTPStatus.MULTI_STATUS
+        results = response.json()
+        assert [result['status'] for result in results] == [200, 200, 404]
+        assert results[0]['data']['genre'] == [
+            {'name': 'Жанр 2', 'slug': 'genre-2'}]
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert first.name == 'Переименовано'
+        assert second.name == 'Произведение 1'
+        assert second.description == 'Новое описание'
+        assert list(second.genre.values_list('slug', flat=True)) == [
+            'genre-0', 'genre-1', 'genre-2']
+        response = admin_client.get('/api/v1/titles/', {'search': 'переим'})
+        assert response.json()['count'] == 1
+
+    def test_06_titles_delete(self, admin_client):
+        create_catalogue(3)
+        ids = list(Title.objects.values_list('pk', flat=True))
+        response = admin_client.delete(
+            TITLES_BULK_URL, [ids[0], ids[1], 999999], format='json')
+        assert response.status_code == HTTPStatus.MULTI_STATUS
+        assert [result['status'] for result in response.json()] == [
+            204, 204, 404]
+        assert list(Title.objects.values_list('pk', flat=True)) == [ids[2]]
+
+    def test_07_genres_unique_slugs(self, admin_client):
+        create_catalogue(0)
+        response = post(admin_client, GENRES_BULK_URL, [
+            {'name': 'Новый', 'slug': 'new'},
+            {'name': 'Существующий', 'slug': 'genre-0'},
+            {'name': 'Повтор', 'slug': 'new'},
+        ])
+        assert response.status_code == HTTPStatus.MULTI_STATUS
+        results = response.json()
+        assert [result['status'] for result in results] == [201, 400, 400]
+        assert results[0]['data'] == {'name': 'Новый', 'slug': 'new'}
+        assert 'slug' in results[1]['errors']
+        assert 'slug' in results[2]['errors']
+        assert Genre.objects.filter(slug='new').count() == 1
+
+        response = admin_client.delete(
+            GENRES_BULK_URL, ['new', 'genre-0'], format='json')
+        assert response.status_code == HTTPStatus.OK
+        assert not Genre.objects.filter(slug__in=('new', 'genre-0')).exists()
+
+    def test_08_permissions_and_methods(self, admin_client, user_client):
+        create_catalogue(0)
+        response = post(user_client, TITLES_BULK_URL, build_titles(1))
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.patch(
+            '/api/v1/categories/bulk/', [{'slug': 'films'}],
+            format='json')
+        assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
+        response = post(admin_client, TITLES_BULK_URL, {'name': 'Не список'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert Category.objects.count() == 1
+
+    @pytest.mark.parametrize('atomic', (False, True))
+    def test_09_concurrent_duplicate_reported_per_item(
+            self, admin_client, monkeypatch, atomic):
+        create_catalogue(0)
+        perform_bulk_create = GenreViewSet.perform_bulk_create
+
+        def create_concurrently(view, rows):
+            # Параллельный запрос записывает слаг после проверки пакета.
+            Genre.objects.create(name='Параллельный', slug='taken')
+            return perform_bulk_create(view, rows)
+
+        monkeypatch.setattr(
+            GenreViewSet, 'perform_bulk_create', create_concurrently)
+        params = {'atomic': 'true'} if atomic else {}
+        response = post(admin_client, GENRES_BULK_URL, [
+            {'name': 'Новый', 'slug': 'new'},
+            {'name': 'Занятый', 'slug': 'taken'},
+        ], **params)
+        results = response.json()
+        assert results[1] == {
+            'status': HTTPStatus.CONFLICT,
+            'errors': {'non_field_errors': [CONFLICT_MESSAGE]},
+        }, (
+            'Проверьте, что конфликт слага с параллельным запросом '
+            'возвращается в результате объекта, а не ошибкой 500.'
+        )
+        if atomic:
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+            assert results[0]['status'] == HTTPStatus.FAILED_DEPENDENCY
+            assert not Genre.objects.filter(slug='new').exists()
+        else:
+            assert response.status_code == HTTPStatus.MULTI_STATUS
+            assert results[0] == {
+                'status': HTTPStatus.CREATED,
+                'data': {'name': 'Новый', 'slug': 'new'},
+            }
+            assert Genre.objects.get(slug='taken').name == 'Параллельный'
+
+    @pytest.mark.parametrize('url, build', (
+        (TITLES_BULK_URL, build_titles),
+        (GENRES_BULK_URL, lambda size: [
+            {'name': f'Жанр {index}', 'slug': f'bulk-{index}'}
+            for index in range(size)]),
+        ('/api/v1/categories/bulk/', lambda size: [
+            {'name': f'Категория {index}', 'slug': f'bulk-{index}'}
+            for index in range(size)]),
+    ))
+    def test_10_query_count_does_not_grow(self, admin_client, url, build):
+        create_catalogue(0)
+        counts = []
+        # Первый запрос загружает пользователя и версию каталога.
+        for size in (1, 2, 20):
+            items = build(size)
+            for item in items:
+                item['name'] += f' ({size})'
+                if 'slug' in item:
+                    item['slug'] += f'-{size}'
+            with CaptureQueriesContext(connection) as context:
+                response = post(admin_client, url, items)
+            assert response.status_code == HTTPStatus.CREATED
+            assert all(
+                result['data']['name'] == item['name']
+                for result, item in zip(response.json(), items))
+            counts.append(len(context.captured_queries))
+        assert counts[1] == counts[2], (
+            'Проверьте, что объекты пакета вставляются через bulk_create, '
+            'а не по одному.'
+        )
@@ -0,0 +1,104 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Title
+from tests.utils import create_catalogue
+
+TITLES_URL = '/api/v1/titles/'
+# Произведение: год, рейтинг, число отзывов.
+STATS = (
+    (2000, 7.0, 3),
+    (2001, None, 0),
+    (2002, 9.5, 1),
+    (2003, 7.0, 5),
+)
+
+
+def get_names(client, **params):
+    response = client.get(TITLES_URL, params)
+    assert response.status_code == HTTPStatus.OK
+    return [title['name'] for title in response.json()['results']]
+
+
+@pytest.fixture
+def catalogue():
+    create_catalogue(len(STATS))
+    for title, (_, rating, review_count) in zip(
+            Title.objects.order_by('year'), STATS):
+        Title.objects.filter(pk=title.pk).update(
+            rating=rating, review_count=review_count)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26TitleOrdering:
+
+    def test_01_ordering(self, client, catalogue):
+        assert get_names(client, ordering='-rating') == [
+            'Произведение 2', 'Произведение 3', 'Произведение 0',
+            'Произведение 1',
+        ], (
+            'Проверьте, что `ordering=-rating` сортирует по убыванию '
+            'рейтинга, при равном рейтинге — по убыванию id, а '
+            'произведения без рейтинга идут последними.'
+        )
+        assert get_names(client, ordering='rating') == [
+            'Произведение 1', 'Произведение 0', 'Произведение 3',
+            'Произведение 2',
+        ], (
+            'Проверьте, что по возрастанию рейтинга произведения без '
+            'рейтинга идут первыми.'
+        )
+        assert get_names(client, ordering='review_count') == [
+            'Произведение 1', 'Произведение 2', 'Произведение 0',
+            'Произведение 3',
+        ]
+        assert get_names(client, ordering='year') == [
+            f'Произведение {index}' for index in range(4)]
+        assert get_names(client, ordering='-name') == [
+            f'Произведение {index}' for index in reversed(range(4))]
+
+    def test_02_ranges(self, client, catalogue):
+        assert get_names(client, year_min=2001, year_max=2002) == [
+            'Произведение 2', 'Произведение 1']
+        assert get_names(client, rating_min=7, rating_max=9) == [
+            'Произведение 3', 'Произведение 0'], (
+            'Проверьте, что фильтр по рейтингу включает границы и '
+            'не возвращает произведения без рейтинга.'
+        )
+        assert get_names(
+            client, rating_min=7.5, ordering='rating') == ['Произведение 2']
+
+    def test_03_ordering_with_search(self, client, catalogue):
+        assert get_names(
+            client, search='произведение', ordering='year') == [
+            f'Произведение {index}' for index in range(4)], (
+            'Проверьте, что явная сортировка важнее ранга поиска.'
+        )
+
+    @pytest.mark.parametrize('params', (
+        {'ordering': 'description'},
+        {'ordering': 'rating,year'},
+        {'year_min': 'давно'},
+    ))
+    def test_04_invalid_params(self, client, catalogue, params):
+        response = client.get(TITLES_URL, params)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @pytest.mark.parametrize('ordering', ('year', '-year'))
+    def test_05_year_ties_by_name(self, client, catalogue, ordering):
+        Title.objects.update(year=2000)
+        assert get_names(client, ordering=ordering) == [
+            f'Произведение {index}' for index in range(4)], (
+            'Проверьте, что произведения одного года идут по названию по '
+            'алфавиту в обоих направлениях сортировки.'
+        )
+
+    def test_06_ordering_rejected_in_cursor_mode(self, client, catalogue):
+        response = client.get(
+            TITLES_URL, {'pagination': 'cursor', 'ordering': 'rating'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что `ordering` в курсорном режиме отклоняется, а '
+            'не пропускается молча.'
+        )
+        assert 'ordering' in response.json()
@@ -0,0 +1,94 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from benchmarks.scenarios import SCENARIOS, BenchmarkContext, BenchmarkRunner
+from reviews.models import Genre, Title
+from reviews.synthetic import generate_dataset
+from tests.utils import create_catalogue
+
+TITLES_URL = '/api/v1/titles/'
+
+
+def get_titles(client, **params):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(TITLES_URL, params)
+    assert response.status_code == HTTPStatus.OK
+    return response.json(), [query['sql'] for query in context.captured_queries]
+
+
+@pytest.fixture
+def catalogue():
+    # Произведение 0: жанры 0, 1, 2; 1: жанры 0, 1; 2: жанр 2; 3: без жанров.
+    create_catalogue(4)
+    genres = list(Genre.objects.order_by('slug'))
+    titles = list(Title.objects.order_by('year'))
+    titles[1].genre.set(genres[:2])
+    titles[2].genre.set(genres[2:])
+    titles[3].genre.clear()
+
+
+def get_names(data):
+    return sorted(title['name'] for title in data['results'])
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27GenreFilter:
+
+    def test_01_any(self, client, catalogue):
+        data, queries = get_titles(client, genre='genre-0,genre-2')
+        assert data['count'] == 3
+        assert get_names(data) == [
+            'Произведение 0', 'Произведение 1', 'Произведение 2'], (
+            'Проверьте, что `genre=a,b` возвращает произведения с любым из '
+            'жанров, каждое по одному разу.'
+        )
+        page_queries = [
+            sql for sql in queries if 'FROM "reviews_title"' in sql]
+        assert all(
+            'EXISTS' in sql and 'DISTINCT' not in sql
+            and 'JOIN "reviews_genretitle"' not in sql.split('EXISTS')[0]
+            for sql in page_queries
+        ), (
+            'Проверьте, что жанры проверяются подзапросом EXISTS без '
+            'соединения и DISTINCT.'
+        )
+
+    def test_02_all(self, client, catalogue):
+        data, _ = get_titles(
+            client, genre='genre-0,genre-1', genre_mode='all')
+        assert get_names(data) == ['Произведение 0', 'Произведение 1']
+        data, _ = get_titles(
+            client, genre='genre-1,genre-2', genre_mode='all')
+        assert get_names(data) == ['Произведение 0'], (
+            'Проверьте, что с `genre_mode=all` нужны все перечисленные '
+            'жанры.'
+        )
+
+    def test_03_single_genre_and_blank(self, client, catalogue):
+        data, _ = get_titles(client, genre='genre-2')
+        assert get_names(data) == ['Произведение 0', 'Произведение 2']
+        data, _ = get_titles(client, genre=',', genre_mode='all')
+        assert data['count'] == 4
+        data, _ = get_titles(client, genre='missing,genre-2')
+        assert data['count'] == 2
+
+    def test_04_invalid_mode(self, client, catalogue):
+        response = client.get(
+            TITLES_URL, {'genre': 'genre-0', 'genre_mode': 'some'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_05_benchmark_many_genres_per_title(self):
+        generate_dataset(titles=30, genres=12, genres_per_title=6)
+        context = BenchmarkContext()
+        assert len(context.title_genres.split(',')) == 6
+        scenarios = [
+            scenario for scenario in SCENARIOS
+            if scenario.name.startswith('titles-list-genres')
+        ]
+        results = BenchmarkRunner(repeat=2, warmup=0).run(scenarios)
+        assert set(results) == {
+            'titles-list-genres-any', 'titles-list-genres-all'}
+        assert all(result['queries'] <= 3 for result in results.values())
@@ -0,0 +1,105 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Genre, GenreTitle, Title
+from tests.test_14_csv_loader import write_csv_files
+from tests.utils import create_catalogue
+
+BEFORE_UNIQUE = ('reviews', '0008_title_ordering_indexes')
+UNIQUE = ('reviews', '0009_genretitle_unique')
+
+
+def get_links(title):
+    return dict(GenreTitle.objects.filter(title=title).values_list(
+        'genre__slug', 'pk'))
+
+
+def migrate(target):
+    executor = MigrationExecutor(connection)
+    executor.loader.build_graph()
+    executor.migrate([target])
+    return executor.loader.project_state([target]).apps
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28GenreLinks:
+
+    def test_01_duplicates_rejected(self):
+        create_catalogue(1)
+        link = GenreTitle.objects.first()
+        with pytest.raises(IntegrityError), transaction.atomic():
+            GenreTitle.objects.create(title=link.title, genre=link.genre)
+
+    def test_02_title_update_changes_only_difference(self, admin_client):
+        create_catalogue(1)
+        title = Title.objects.get()
+        links = get_links(title)
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.patch(
+                f'/api/v1/titles/{title.pk}/',
+                {'genre': ['genre-1', 'genre-2', 'genre-2']},
+                format='json',
+            )
+        assert response.status_code == HTTPStatus.OK
+        assert [genre['slug'] for genre in response.json()['genre']] == [
+            'genre-1', 'genre-2']
+        assert get_links(title) == {
+            'genre-1': links['genre-1'], 'genre-2': links['genre-2']}, (
+            'Проверьте, что оставшиеся жанры произведения не '
+            'перезаписываются.'
+        )
+        assert not any(
+            query['sql'].startswith('INSERT')
+            and '"reviews_genretitle"' in query['sql']
+            for query in context.captured_queries
+        )
+
+        response = admin_client.patch(
+            f'/api/v1/titles/{title.pk}/',
+            {'genre': ['genre-0', 'genre-1', 'genre-2']},
+            format='json',
+        )
+        assert response.status_code == HTTPStatus.OK
+        new_links = get_links(title)
+        assert set(new_links) == {'genre-0', 'genre-1', 'genre-2'}
+        assert new_links['genre-1'] == links['genre-1']
+
+    def test_03_title_create(self, admin_client):
+        create_catalogue(0)
+        response = admin_client.post(
+            '/api/v1/titles/',
+            {'name': 'Новое', 'year': 2000, 'category': 'films',
+             'genre': ['genre-0', 'genre-0', 'genre-1']},
+            format='json',
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert GenreTitle.objects.count() == 2
+
+    def test_04_loader_skips_duplicate_links(self, tmp_path):
+        write_csv_files(tmp_path)
+        (tmp_path / 'genre_title.csv').write_text(
+            'id,title_id,genre_id\n1,1,1\n2,2,1\n3,2,2\n4,2,1\n',
+            encoding='utf-8')
+        call_command('load_csv', path=tmp_path)
+        assert GenreTitle.objects.filter(title_id=2).count() == 2
+
+    def test_05_migration_removes_duplicates(self):
+        create_catalogue(1)
+        title = Title.objects.get()
+        genre = Genre.objects.get(slug='genre-0')
+        kept = GenreTitle.objects.get(title=title, genre=genre).pk
+        try:
+            old_apps = migrate(BEFORE_UNIQUE)
+            OldGenreTitle = old_apps.get_model('reviews', 'GenreTitle')
+            OldGenreTitle.objects.create(title_id=title.pk, genre_id=genre.pk)
+            OldGenreTitle.objects.create(title_id=title.pk, genre_id=genre.pk)
+        finally:
+            migrate(UNIQUE)
+        assert GenreTitle.objects.filter(title=title).count() == 3
+        assert GenreTitle.objects.filter(
+            title=title, genre=genre).get().pk == kept
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+from tests.utils import create_catalogue
+
+FACETS_URL = '/api/v1/titles/facets/'
+
+
+def get_facets(client, **params):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(FACETS_URL, params)
+    assert response.status_code == HTTPStatus.OK
+    return response.json(), len(context.captured_queries)
+
+
+@pytest.fixture
+def catalogue():
+    # Произведения 0-3 с жанрами 0-2 в категории films, 2001 год у двух.
+    create_catalogue(4)
+    books = Category.objects.create(name='Книга', slug='books')
+    titles = list(Title.objects.order_by('year'))
+    titles[1].genre.set(Genre.objects.filter(slug='genre-0'))
+    Title.objects.filter(pk=titles[2].pk).update(category=books, year=2001)
+    Title.objects.filter(pk=titles[3].pk).update(category=None)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29Facets:
+
+    def test_01_counts(self, client, catalogue):
+        data, queries = get_facets(client)
+        assert data == {
+            'count': 4,
+            'genre': [
+                {'slug': 'genre-0', 'name': 'Жанр 0', 'count': 4},
+                {'slug': 'genre-1', 'name': 'Жанр 1', 'count': 3},
+                {'slug': 'genre-2', 'name': 'Жанр 2', 'count': 3},
+            ],
+            'category': [
+                {'slug': 'films', 'name': 'Фильм', 'count': 2},
+                {'slug': 'books', 'name': 'Книга', 'count': 1},
+            ],
+            'year': [
+                {'year': 2003, 'count': 1},
+                {'year': 2001, 'count': 2},
+                {'year': 2000, 'count': 1},
+            ],
+        }
+        assert queries == 3, (
+            'Проверьте, что фасеты считаются одним запросом с группировкой '
+            'на жанры, категории и годы.'
+        )
+
+    def test_02_follow_filters(self, client, catalogue):
+        data, _ = get_facets(
+            client, genre='genre-1', year_min=2001, ordering='-rating')
+        assert data['count'] == 2
+        assert {row['slug']: row['count'] for row in data['genre']} == {
+            'genre-0': 2, 'genre-1': 2, 'genre-2': 2}
+        assert data['category'] == [
+            {'slug': 'books', 'name': 'Книга', 'count': 1}]
+        list_count = client.get(
+            '/api/v1/titles/', {'genre': 'genre-1', 'year_min': 2001},
+        ).json()['count']
+        assert data['count'] == list_count, (
+            'Проверьте, что фасеты считаются по тем же фильтрам, что и '
+            'список произведений.'
+        )
+
+    def test_03_cached_until_catalogue_changes(self, client, catalogue):
+        get_facets(client)
+        data, queries = get_facets(client)
+        assert queries == 0, 'Проверьте, что ответ фасетов кэшируется.'
+        Title.objects.create(name='Новое', year=2003)
+        data, queries = get_facets(client)
+        assert data['count'] == 5
+        assert data['year'][0] == {'year': 2003, 'count': 2}
+
+    def test_04_invalid_filter(self, client, catalogue):
+        response = client.get(FACETS_URL, {'genre_mode': 'some'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,51 @@
+import re
+from pathlib import Path
+
+import yaml
+from django.conf import settings
+
+from api.urls import router_v1
+
+SCHEMA_PATH = Path(settings.BASE_DIR) / 'static' / 'redoc.yaml'
+
+
+def load_schema():
+    with open(SCHEMA_PATH, encoding='utf-8') as file:
+        return yaml.safe_load(file)
+
+
+def get_list_paths():
+    """Пути списков и действий над списком из роутера, как в схеме."""
+    paths = set()
+    for prefix, viewset, _ in router_v1.registry:
+        prefix = re.sub(r'\(\?P<(\w+)>[^)]*\)', r'{\1}', prefix)
+        paths.add(f'/{prefix}/')
+        paths.update(
+            f'/{prefix}/{action.url_path}/'
+            for action in viewset.get_extra_actions() if not action.detail
+        )
+    return paths
+
+
+def get_parameters(operation):
+    return {
+        parameter.get('name') or parameter['$ref'].rsplit('/', 1)[-1]
+        for parameter in operation.get('parameters', ())
+    }
+
+
+class Test30ApiSchema:
+
+    def test_01_every_list_route_documented(self):
+        assert get_list_paths() - set(load_schema()['paths']) == set(), (
+            'Проверьте, что все маршруты API описаны в `redoc.yaml`.'
+        )
+
+    def test_02_read_parameters_documented(self):
+        paths = load_schema()['paths']
+        assert {'Search', 'Fields', 'Omit', 'Pagination', 'Cursor'} <= (
+            get_parameters(paths['/titles/']['get']))
+        for path in ('/titles/{title_id}/reviews/',
+                     '/titles/{title_id}/reviews/{review_id}/comments/'):
+            assert {'Fields', 'Omit', 'Pagination', 'Cursor'} <= (
+                get_parameters(paths[path]['get'])), path